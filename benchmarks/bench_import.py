@@ -0,0 +1,94 @@
+"""
+Benchmark for import time and runner startup latency
+
+Each measurement is the median wall time of `--repeat` fresh interpreters, less
+that of an interpreter which does nothing:
+
+- local imports: `import remoref`, and the first access to the engine
+- runner: executing one runner of a staged Process through its generated
+  repository, as each remote runner interpreter does
+
+Usage:
+    python benchmarks/bench_import.py --repeat 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from remoref.engine.process import ProcessHandler
+
+from common import localhost_url, scratch
+
+statements = {
+    "import_remoref_s": "import remoref",
+    "import_process_s": "from remoref import Process",
+    "import_summary_s": "import remoref.engine.summary",
+}
+
+
+def function(a: int) -> int:
+    return a
+
+
+def interpreter(args: List[str], repeat: int, cwd: str = ".") -> float:
+    """
+    Returns the median wall time of running `python <args>` in a fresh process
+    """
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=cwd, check=True)
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings)
+
+
+def bench_import(repeat: int) -> Dict[str, Any]:
+    baseline = interpreter(["-c", "pass"], repeat)
+    result: Dict[str, Any] = {
+        "bench": "import",
+        "repeat": repeat,
+        "interpreter_s": baseline,
+    }
+    for name, statement in statements.items():
+        result[name] = interpreter(["-c", statement], repeat) - baseline
+
+    with scratch() as root:
+        ps = ProcessHandler(
+            function,
+            url=localhost_url(),
+            verbose=0,
+            local_dir=os.path.join(root, "local"),
+            remote_dir=os.path.join(root, "remote"),
+        )
+        ps.prepare(a=1)
+        ps.stage()
+
+        runner = ps.runners[0]
+        args = [
+            ps.files.repo.name,
+            runner.short_uuid,
+            ps.name,
+            runner.name,
+            ps.function.name,
+        ]
+        result["runner_s"] = interpreter(args, repeat, cwd=ps.local_dir) - baseline
+
+    return result
+
+
+def main(repeat: int) -> List[Dict[str, Any]]:
+    return [bench_import(repeat)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(main(args.repeat), indent=2))
@@ -0,0 +1,70 @@
+"""
+Benchmark for local execution, via the master script or the process pool
+
+Runs a Process of N trivial runners on localhost, end to end (stage, transfer,
+run, wait and fetch), once through bash and once with `local_pool=True`.
+
+Usage:
+    python benchmarks/bench_localpool.py --n 20
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from typing import Any, Dict
+
+from remoref.engine.process import ProcessHandler
+
+from common import localhost_url
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+def bench_run(n: int, local_pool: bool) -> float:
+    root = tempfile.mkdtemp()
+    try:
+        ps = ProcessHandler(
+            square,
+            name=f"bench_{local_pool}",
+            url=localhost_url(),
+            local_dir=f"{root}/local",
+            remote_dir=f"{root}/remote",
+            local_pool=local_pool,
+        )
+        for i in range(n):
+            ps.prepare(x=i)
+
+        t0 = time.perf_counter()
+        ps.run()
+        ps.wait(0.01, 60)
+        ps.fetch_results()
+        dt = time.perf_counter() - t0
+
+        assert ps.results == [i * i for i in range(n)]
+        return dt
+    finally:
+        shutil.rmtree(root)
+
+
+def bench_localpool(n: int) -> Dict[str, Any]:
+    bash = bench_run(n, local_pool=False)
+    pool = bench_run(n, local_pool=True)
+    return {
+        "bench": "local_execution",
+        "n": n,
+        "bash_s": bash,
+        "pool_s": pool,
+        "speedup": bash / pool,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=20)
+    args = parser.parse_args()
+
+    print(json.dumps(bench_localpool(args.n), indent=2))
@@ -0,0 +1,112 @@
+"""
+Benchmark for manifest parsing and the cost of a poll
+
+For manifests of N runners (each having logged its states and some output):
+
+- parse: summarising the whole manifest, and applying that summary to a Process
+- poll: `read_remote_manifest` through the localhost stand-in, for the first
+  (full) read, an incremental read after every runner completes, and an idle
+  read which finds nothing new
+
+Usage:
+    python benchmarks/bench_manifest.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+from remoref.engine.process import ProcessHandler
+from remoref.engine.repo import generate_log_str
+from remoref.engine.summary import summarise
+
+from common import localhost_url, scratch, timed
+
+
+def function(a: int) -> int:
+    return a
+
+
+def create(root: str, n: int) -> ProcessHandler:
+    ps = ProcessHandler(
+        function,
+        url=localhost_url(),
+        verbose=0,
+        local_dir=os.path.join(root, "local"),
+        remote_dir=os.path.join(root, "remote"),
+    )
+    ps.prepare_many({"a": range(n)})
+    return ps
+
+
+def write_manifest(path: str, uuids: List[str], states: List[str]) -> None:
+    stamp = "2024-01-01 00:00:00.000000"
+    with open(path, "a") as o:
+        for uuid in uuids:
+            for state in states:
+                o.write(generate_log_str(stamp, uuid, state) + "\n")
+            if states[-1] == "running":
+                for line in range(3):
+                    output = f"output line {line} of runner {uuid}"
+                    o.write(generate_log_str(stamp, uuid, output, "stdout") + "\n")
+
+
+def bench_parse(n: int) -> Dict[str, Any]:
+    with scratch() as root:
+        ps = create(root, n)
+        uuids = [uuid[:8] for uuid in ps.runners.uuids()]
+        path = os.path.join(root, "manifest.txt")
+        write_manifest(path, uuids, ["submitted", "running"])
+        write_manifest(path, uuids, ["completed"])
+
+        size = os.path.getsize(path)
+        summarise_s, summary = timed(summarise, path)
+        apply_s, _ = timed(ps.apply_summary, summary)
+
+        assert ps.state_counts == {"COMPLETED": n}
+        return {
+            "bench": "manifest_parse",
+            "n": n,
+            "manifest_bytes": size,
+            "summarise_s": summarise_s,
+            "summarise_mb_per_s": size / summarise_s / 1e6,
+            "apply_s": apply_s,
+            "apply_per_runner_us": apply_s / n * 1e6,
+        }
+
+
+def bench_poll(n: int) -> Dict[str, Any]:
+    with scratch() as root:
+        ps = create(root, n)
+        ps.transfer()
+        uuids = [uuid[:8] for uuid in ps.runners.uuids()]
+        manifest = ps.files.manifest.remote
+        write_manifest(manifest, uuids, ["submitted", "running"])
+
+        first_s, _ = timed(ps.read_remote_manifest)
+        write_manifest(manifest, uuids, ["completed"])
+        incremental_s, _ = timed(ps.read_remote_manifest)
+        idle_s, _ = timed(ps.read_remote_manifest)
+
+        assert ps.state_counts == {"COMPLETED": n}
+        return {
+            "bench": "manifest_poll",
+            "n": n,
+            "manifest_bytes": ps.manifest_size,
+            "first_s": first_s,
+            "incremental_s": incremental_s,
+            "idle_s": idle_s,
+        }
+
+
+def main(sizes: List[int]) -> List[Dict[str, Any]]:
+    return [bench(n) for bench in (bench_parse, bench_poll) for n in sizes]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(json.dumps(main(args.sizes), indent=2))
@@ -0,0 +1,83 @@
+"""
+Benchmark for ProcessHandler.prepare scaling
+
+Prepares N runners one call at a time, and then in bulk via prepare_many,
+reporting the per-runner cost. With O(1) registration the per-runner time
+should stay flat as N grows.
+
+Usage:
+    python benchmarks/bench_prepare.py --sizes 1000 10000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from remoref.engine.process import ProcessHandler
+
+
+def function(a: int, b: int) -> int:
+    return a + b
+
+
+def bench_prepare(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+
+    t0 = time.perf_counter()
+    for i in range(n):
+        ps.prepare(a=i, b=n)
+    dt = time.perf_counter() - t0
+
+    assert len(ps.runners) == n
+
+    return {
+        "bench": "prepare",
+        "mode": "prepare",
+        "n": n,
+        "time": dt,
+        "per_runner_us": dt / n * 1e6,
+    }
+
+
+def bench_prepare_many(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+
+    t0 = time.perf_counter()
+    ps.prepare_many({"a": range(n), "b": [n] * n})
+    dt = time.perf_counter() - t0
+
+    assert len(ps.runners) == n
+
+    return {
+        "bench": "prepare",
+        "mode": "prepare_many",
+        "n": n,
+        "time": dt,
+        "per_runner_us": dt / n * 1e6,
+    }
+
+
+def main(sizes: List[int]) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    for bench in (bench_prepare, bench_prepare_many):
+        cache = [bench(n) for n in sizes]
+
+        base = cache[0]["per_runner_us"]
+        for result in cache:
+            result["scaling"] = result["per_runner_us"] / base
+
+        results += cache
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    print(json.dumps(main(args.sizes), indent=2))
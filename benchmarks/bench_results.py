@@ -0,0 +1,93 @@
+"""
+Benchmark for fetching and decoding results
+
+Writes a result file for each of N completed runners on the localhost stand-in,
+then times `fetch_results`, split into the transfer ("fetch_results" phase) and
+the decode ("read_local_files" phase), for several result payloads.
+
+Results are always stored as JSON. For reference, the decode time of each
+payload is also given for pickle, the fastest stdlib alternative.
+
+Usage:
+    python benchmarks/bench_results.py --n 100
+"""
+
+import argparse
+import json
+import os
+import pickle
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from remoref.engine.process import ProcessHandler
+from remoref.engine.runnerstates import State
+
+from common import localhost_url, scratch, timed
+
+payloads: Dict[str, Callable[[], Any]] = {
+    "scalar": lambda: 42,
+    "list": lambda: [i * 0.5 for i in range(10000)],
+    "nested": lambda: {f"k{i}": {"values": list(range(10))} for i in range(1000)},
+    "text": lambda: "x" * 1000000,
+}
+
+# (dumps, loads) of each serializer compared for decoding
+serializers: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+    "json": (json.dumps, json.loads),
+    "pickle": (pickle.dumps, pickle.loads),
+}
+
+
+def function(a: int) -> int:
+    return a
+
+
+def bench_fetch(n: int, payload: str) -> Dict[str, Any]:
+    data = payloads[payload]()
+    with scratch() as root:
+        ps = ProcessHandler(
+            function,
+            url=localhost_url(),
+            verbose=0,
+            local_dir=os.path.join(root, "local"),
+            remote_dir=os.path.join(root, "remote"),
+        )
+        ps.prepare_many({"a": range(n)})
+        ps.transfer()
+
+        for runner in ps.runners:
+            with open(runner.files.result.remote, "w+") as o:
+                json.dump(data, o)
+            runner.state = State("COMPLETED", time.time())
+        size = os.path.getsize(ps.runners[0].files.result.remote)
+
+        dt, _ = timed(ps.fetch_results)
+        assert ps.runners[-1].result == data
+
+        result: Dict[str, Any] = {
+            "bench": "fetch_results",
+            "payload": payload,
+            "n": n,
+            "result_bytes": size,
+            "time_s": dt,
+            "transfer_s": ps.profile.total("fetch_results"),
+            "decode_s": ps.profile.total("read_local_files"),
+        }
+
+    for name, (dumps, loads) in serializers.items():
+        encoded = dumps(data)
+        decode_s, _ = timed(lambda: [loads(encoded) for _ in range(n)])
+        result[f"{name}_decode_s"] = decode_s
+    return result
+
+
+def main(n: int) -> List[Dict[str, Any]]:
+    return [bench_fetch(n, payload) for payload in payloads]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100)
+    args = parser.parse_args()
+
+    print(json.dumps(main(args.n), indent=2))
@@ -0,0 +1,155 @@
+"""
+Benchmark for the per-runner memory footprint, State comparison throughput
+and Process-wide state queries
+
+Memory is measured with tracemalloc while holding N materialized runners,
+comparison throughput by evaluating `runner.state >= <state>` in a loop.
+State queries are timed against the equivalent loop over the runners.
+Exec args resolution is measured by the time and allocations of reading the
+exec args used during staging for every runner.
+
+Usage:
+    python benchmarks/bench_runner.py --n 10000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict
+
+from remoref.engine import runnerstates
+from remoref.engine.process import ProcessHandler
+from remoref.engine.runnerstates import State
+
+
+def function(a: int) -> int:
+    return a
+
+
+def bench_memory(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+    ps.prepare_many({"a": range(n)})
+
+    tracemalloc.start()
+    t0 = tracemalloc.take_snapshot()
+    runners = [r for r in ps.runners]
+    # files are created on first access, include them
+    for runner in runners:
+        runner.files
+    t1 = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(s.size_diff for s in t1.compare_to(t0, "filename"))
+
+    return {"bench": "runner_memory", "n": n, "bytes_per_runner": size / n}
+
+
+def bench_comparison(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+    ps.prepare_many({"a": range(n)})
+    runners = list(ps.runners)
+
+    t0 = time.perf_counter()
+    for runner in runners:
+        runner.state >= State("RUNNING")
+    dt_new = time.perf_counter() - t0
+
+    output = {
+        "bench": "state_comparison",
+        "n": n,
+        "allocating_per_s": n / dt_new,
+    }
+
+    running = getattr(runnerstates, "RUNNING", None)
+    if running is not None:
+        t0 = time.perf_counter()
+        for runner in runners:
+            runner.state >= running
+        output["interned_per_s"] = n / (time.perf_counter() - t0)
+
+    return output
+
+
+def bench_queries(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+    ps.prepare_many({"a": range(n)})
+
+    registry = ps.runners
+    for idx in range(n):
+        registry.set_state(idx, State("RUNNING", 100))
+        final = "FAILED" if idx % 100 == 0 else "COMPLETED"
+        registry.set_state(idx, State(final, 100 + idx % 60))
+
+    def timed(func) -> float:
+        t0 = time.perf_counter()
+        func()
+        return time.perf_counter() - t0
+
+    output: Dict[str, Any] = {"bench": "state_queries", "n": n}
+
+    output["loop_counts_s"] = timed(lambda: Counter(r.state.state for r in registry))
+    output["loop_failed_s"] = timed(lambda: [r for r in registry if r.state.failed])
+    output["table_counts_s"] = timed(ps.runners.state_counts)
+    output["table_failed_s"] = timed(lambda: ps.runners.where("FAILED"))
+    output["table_all_finished_s"] = timed(
+        lambda: ps.runners.all_at_least("COMPLETED")
+    )
+    output["table_percentiles_s"] = timed(lambda: ps.runtime_percentiles(50, 95))
+
+    return output
+
+
+def bench_exec_args(n: int) -> Dict[str, Any]:
+    ps = ProcessHandler(function, verbose=0)
+    ps.prepare_many({"a": range(n)})
+    runners = list(ps.runners)
+
+    def access():
+        for runner in runners:
+            runner.local_dir
+            runner.remote_dir
+            runner.skip
+            runner.exec_args.get("force", False)
+            runner.exec_args.get("asynchronous", True)
+            runner.exec_args.get("avoid_nodes", False)
+
+    timings = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        access()
+        timings.append(time.perf_counter() - t0)
+    dt = min(timings)
+
+    tracemalloc.start()
+    access()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "bench": "exec_args",
+        "n": n,
+        "time_per_runner_us": dt / n * 1e6,
+        "peak_alloc_bytes": peak,
+    }
+
+
+def main(n: int):
+    return [
+        bench_memory(n),
+        bench_comparison(n),
+        bench_queries(n),
+        bench_exec_args(n),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=10000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    print(json.dumps(main(args.n), indent=2))
@@ -0,0 +1,62 @@
+"""
+Benchmark for ProcessHandler.stage scaling
+
+Prepares N runners and stages them, reporting the total and per-runner time,
+and the time of a second stage (which should find nothing to do). The stage
+sub-phases recorded by the Process profile are reported alongside.
+
+Usage:
+    python benchmarks/bench_stage.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, List
+
+from remoref.engine.process import ProcessHandler
+
+from common import localhost_url, scratch, timed
+
+
+def function(a: int) -> int:
+    return a
+
+
+def bench_stage(n: int) -> Dict[str, Any]:
+    with scratch() as root:
+        ps = ProcessHandler(
+            function,
+            url=localhost_url(),
+            verbose=0,
+            local_dir=os.path.join(root, "local"),
+            remote_dir=os.path.join(root, "remote"),
+        )
+        ps.prepare_many({"a": range(n)})
+
+        dt, _ = timed(ps.stage)
+        restage, _ = timed(ps.stage)
+
+        result: Dict[str, Any] = {
+            "bench": "stage",
+            "n": n,
+            "time_s": dt,
+            "per_runner_us": dt / n * 1e6,
+            "restage_s": restage,
+        }
+        for phase, timing in ps.profile.to_dict().items():
+            if phase.startswith("stage."):
+                result[f"{phase}_s"] = timing["total"]
+        return result
+
+
+def main(sizes: List[int]) -> List[Dict[str, Any]]:
+    return [bench_stage(n) for n in sizes]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(json.dumps(main(args.sizes), indent=2))
@@ -0,0 +1,62 @@
+"""
+Benchmark for the polling payload of the remote status summariser
+
+Writes a manifest for N runners which have each logged their states and some
+output, then compares the bytes returned by `cat` (the full manifest) with the
+summary returned for a poll that follows `--new` fresh state records.
+
+Usage:
+    python benchmarks/bench_summary.py --n 100000 --new 100
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from remoref.engine.repo import generate_log_str
+from remoref.engine.summary import summarise
+
+
+def bench_summary(n: int, new: int) -> Dict[str, Any]:
+    path = os.path.join(tempfile.mkdtemp(), "manifest.txt")
+    stamp = "2024-01-01 00:00:00"
+
+    with open(path, "w") as o:
+        for i in range(n):
+            uuid = f"{i:08x}"
+            for state in ("submitted", "running"):
+                o.write(generate_log_str(stamp, uuid, state) + "\n")
+            for line in range(5):
+                output = f"output line {line} of runner {i}"
+                o.write(generate_log_str(stamp, uuid, output, "stdout") + "\n")
+
+    cursor = summarise(path)["cursor"]
+
+    with open(path, "a") as o:
+        for i in range(new):
+            o.write(generate_log_str(stamp, f"{i:08x}", "completed") + "\n")
+
+    t0 = time.perf_counter()
+    summary = json.dumps(summarise(path, cursor))
+    dt = time.perf_counter() - t0
+
+    return {
+        "bench": "summary_payload",
+        "n": n,
+        "new_records": new,
+        "manifest_bytes": os.path.getsize(path),
+        "summary_bytes": len(summary),
+        "summary_time_s": dt,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--new", type=int, default=100)
+    args = parser.parse_args()
+
+    print(json.dumps(bench_summary(args.n, args.new), indent=2))
@@ -0,0 +1,72 @@
+"""
+Shared helpers for the benchmarks
+
+Benchmarks run offline against `localhost_url()`, a localhost URL which moves
+files with `cp` rather than rsync, so neither ssh nor rsync is required. Each
+benchmark returns a list of flat records (dicts of numbers and strings), with a
+"bench" key naming the measurement, which `run.py` collects into one document.
+"""
+
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from remotemanager.connection.url import URL
+from remotemanager.transport.cp import cp
+
+import remoref
+
+
+class LocalhostURL(URL):
+    """
+    Localhost URL which transfers files with cp
+    """
+
+    def _get_default_transport(self) -> cp:  # type: ignore
+        return cp(url=self, verbose=self.verbose)
+
+
+def localhost_url() -> URL:
+    """
+    Returns the offline stand-in for a remote connection
+    """
+    return LocalhostURL(python=sys.executable, verbose=0)
+
+
+@contextmanager
+def scratch() -> Iterator[str]:
+    """
+    Temporary directory that is removed afterwards
+    """
+    root = tempfile.mkdtemp(prefix="remoref_bench_")
+    try:
+        yield root
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[float, Any]:
+    """
+    Returns the wall time of `fn(*args, **kwargs)` and its return value
+    """
+    t0 = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return time.perf_counter() - t0, value
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describes the version and machine that results were taken on
+    """
+    return {
+        "remoref": remoref.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
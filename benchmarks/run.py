@@ -0,0 +1,132 @@
+"""
+Runs the benchmark suite, writing the results as a single JSON document
+
+Every benchmark runs offline on this machine (see `common.localhost_url`). The
+document holds the environment the results were taken on and a list of flat
+records, each with a "bench" key. Passing a previous document with --compare
+prints the ratio of each timing against it, so that regressions can be tracked
+between versions.
+
+Usage:
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick --only stage manifest
+    python benchmarks/run.py --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Callable, Dict, List, Tuple
+
+import bench_import
+import bench_localpool
+import bench_manifest
+import bench_prepare
+import bench_results
+import bench_runner
+import bench_stage
+import bench_summary
+from common import environment
+
+# name: (benchmark, full arguments, --quick arguments)
+suite: Dict[str, Tuple[Callable[..., Any], Dict[str, Any], Dict[str, Any]]] = {
+    "prepare": (
+        bench_prepare.main,
+        {"sizes": [1000, 10000, 100000]},
+        {"sizes": [1000, 10000]},
+    ),
+    "stage": (
+        bench_stage.main,
+        {"sizes": [1000, 10000, 100000]},
+        {"sizes": [100, 1000]},
+    ),
+    "manifest": (
+        bench_manifest.main,
+        {"sizes": [1000, 10000, 100000]},
+        {"sizes": [100, 1000]},
+    ),
+    "summary": (
+        bench_summary.bench_summary,
+        {"n": 100000, "new": 100},
+        {"n": 10000, "new": 100},
+    ),
+    "results": (bench_results.main, {"n": 100}, {"n": 10}),
+    "runner": (bench_runner.main, {"n": 10000}, {"n": 1000}),
+    "localpool": (bench_localpool.bench_localpool, {"n": 20}, {"n": 5}),
+    "import": (bench_import.main, {"repeat": 20}, {"repeat": 5}),
+}
+
+# record fields which identify a measurement, rather than being one
+keys = ("bench", "mode", "payload", "n", "new_records", "repeat")
+
+
+def run(names: List[str], quick: bool = False) -> Dict[str, Any]:
+    results: List[Dict[str, Any]] = []
+    cwd = os.getcwd()
+    for name in names:
+        bench, full, reduced = suite[name]
+        root = tempfile.mkdtemp(prefix="remoref_bench_")
+        os.chdir(root)
+        try:
+            output = bench(**(reduced if quick else full))
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(root, ignore_errors=True)
+        if isinstance(output, dict):
+            output = [output]
+        for record in output:
+            record.setdefault("bench", name)
+            print(json.dumps(record), file=sys.stderr)
+        results += output
+
+    return {"environment": environment(), "quick": quick, "results": results}
+
+
+def identify(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    return tuple(record.get(key, None) for key in keys)
+
+
+def compare(document: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Returns a line per timing present in both documents, with its ratio to the
+    baseline (above 1 is slower)
+    """
+    previous = {identify(record): record for record in baseline["results"]}
+    lines = []
+    for record in document["results"]:
+        old = previous.get(identify(record), None)
+        if old is None:
+            continue
+        label = " ".join(f"{k}={v}" for k, v in zip(keys, identify(record)) if v)
+        for field, value in record.items():
+            if not field.endswith(("_s", "_us")) or not old.get(field, 0):
+                continue
+            lines.append(f"{label} {field}: {value / old[field]:.2f}x")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=list(suite), default=list(suite))
+    parser.add_argument("--quick", action="store_true", help="run at reduced sizes")
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline results to compare against")
+    args = parser.parse_args()
+
+    document = run(args.only, quick=args.quick)
+
+    content = json.dumps(document, indent=2)
+    if args.output is not None:
+        with open(args.output, "w+") as o:
+            o.write(content)
+    else:
+        print(content)
+
+    if args.compare is not None:
+        with open(args.compare, "r") as o:
+            baseline = json.load(o)
+        for line in compare(document, baseline):
+            print(line, file=sys.stderr)
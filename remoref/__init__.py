@@ -1,11 +1,41 @@
+import importlib
 import os
-from remoref.engine.process import Process
+from typing import TYPE_CHECKING, Any, List
 
+if TYPE_CHECKING:
+    from remoref.engine.metrics import MetricsExporter
+    from remoref.engine.poller import Poller
+    from remoref.engine.process import Process
+    from remoref.engine.retry import RetryPolicy
 
-__all__ = ["Process"]
+
+__all__ = ["Process", "Poller", "MetricsExporter", "RetryPolicy"]
 
 __version__ = "0.0.1"
 
+# public names, and the modules they are imported from on first access. The
+# engine pulls in most of remotemanager, which tooling that only needs (for
+# example) the version should not pay for
+_lazy = {
+    "Process": "remoref.engine.process",
+    "Poller": "remoref.engine.poller",
+    "MetricsExporter": "remoref.engine.metrics",
+    "RetryPolicy": "remoref.engine.retry",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _lazy.get(name, None)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 def get_package_root() -> str:
     """returns the abspath to the package root directory"""
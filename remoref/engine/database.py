@@ -0,0 +1,236 @@
+"""
+Optional SQLite persistence for Process and Runner state
+
+Allows a new session to reattach to a Process without re-preparing every
+runner, and exposes the state history to plain SQL queries.
+"""
+
+import atexit
+import json
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Union
+
+from remoref.engine.runnerstates import State
+
+# TYPE_CHECKING is false at runtime, so does not cause a circular dependency
+if TYPE_CHECKING:
+    from remoref.engine.runner import Runner
+
+
+schema = """
+CREATE TABLE IF NOT EXISTS runners (
+    process TEXT NOT NULL,
+    process_uuid TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    call_args TEXT NOT NULL,
+    exec_args TEXT NOT NULL,
+    result TEXT,
+    attempt INTEGER NOT NULL DEFAULT 1,
+    jobs TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (process, process_uuid, uuid)
+);
+CREATE TABLE IF NOT EXISTS states (
+    process TEXT NOT NULL,
+    process_uuid TEXT NOT NULL,
+    uuid TEXT NOT NULL,
+    state TEXT NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS states_uuid ON states (process, process_uuid, uuid);
+CREATE VIEW IF NOT EXISTS latest AS
+    SELECT process, process_uuid, uuid, state, MAX(rowid) AS row, timestamp
+    FROM states GROUP BY process, process_uuid, uuid;
+"""
+
+
+def _stored_exec_args(runner: "Runner") -> Dict[Any, Any]:
+    """
+    Runner level exec args, without the extra files (which are not restorable)
+    """
+    exec_args = runner._exec_args  # type: ignore
+    if "extra_files_send" in exec_args or "extra_files_recv" in exec_args:
+        return {
+            k: v
+            for k, v in exec_args.items()
+            if k not in ("extra_files_send", "extra_files_recv")
+        }
+    return exec_args
+
+
+class Database:
+    """
+    SQLite backed store for runners belonging to one or more Processes
+
+    Rows are keyed by the Process name and uuid, so a single file can hold
+    several Processes. Writes are batched and only committed on `commit()`,
+    or when the connection is closed (at exit, if not before)
+
+    Args:
+        path:
+            path to the database file, ":memory:" is also accepted
+        process:
+            name of the owning Process
+        process_uuid:
+            uuid of the owning Process
+    """
+
+    def __init__(self, path: str, process: str, process_uuid: str) -> None:
+        self.path = path
+        self.process = process
+        self.process_uuid = process_uuid
+
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(schema)
+        self._conn.commit()
+        self._closed = False
+
+        atexit.register(self.close)
+
+    def __repr__(self) -> str:
+        return f"Database({self.path})"
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.process, self.process_uuid)
+
+    def _runner_row(self, runner: "Runner") -> Tuple[Any, ...]:
+        return (
+            *self.key,
+            runner.uuid,
+            runner.idx,
+            json.dumps(runner.call_args),
+            json.dumps(_stored_exec_args(runner), default=str),
+            # as `runner.files.result.local`, without creating the runner's files
+            os.path.join(runner.local_dir, f"{runner.name}-result.json"),
+            runner.attempt,
+            json.dumps(runner.jobs),
+        )
+
+    def add_runner(self, runner: "Runner") -> None:
+        """
+        Store a newly created runner
+        """
+        self.add_runners([runner])
+
+    def add_runners(self, runners: Iterable["Runner"]) -> None:
+        """
+        Store many newly created runners in a single statement
+        """
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO runners VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (self._runner_row(runner) for runner in runners),
+        )
+
+    def add_state(self, uuid: str, state: State) -> None:
+        """
+        Append a state to the history of item `uuid`
+        """
+        self._conn.execute(
+            "INSERT INTO states VALUES (?, ?, ?, ?, ?)",
+            (*self.key, uuid, state.state, state.timestamp),
+        )
+
+    def update_runner(self, uuid: str, attempt: int, jobs: List[str]) -> None:
+        """
+        Store the attempt number and job ids of runner `uuid`
+        """
+        self._conn.execute(
+            "UPDATE runners SET attempt = ?, jobs = ? "
+            "WHERE process = ? AND process_uuid = ? AND uuid = ?",
+            (attempt, json.dumps(jobs), *self.key, uuid),
+        )
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Commit any pending writes and release the connection
+        """
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._conn.commit()
+        self._conn.close()
+
+    def runners(self) -> List[Tuple[str, int, Dict[Any, Any], Dict[Any, Any]]]:
+        """
+        Returns the stored (uuid, idx, call_args, exec_args) of each runner by idx
+        """
+        rows = self._conn.execute(
+            "SELECT uuid, idx, call_args, exec_args FROM runners "
+            "WHERE process = ? AND process_uuid = ? ORDER BY idx",
+            self.key,
+        )
+        return [(u, i, json.loads(c), json.loads(e)) for u, i, c, e in rows]
+
+    def submissions(self) -> Dict[str, Tuple[int, List[str]]]:
+        """
+        Returns the stored (attempt, jobs) of each retried or submitted runner
+        """
+        rows = self._conn.execute(
+            "SELECT uuid, attempt, jobs FROM runners "
+            "WHERE process = ? AND process_uuid = ? AND (attempt > 1 OR jobs != '[]')",
+            self.key,
+        )
+        return {uuid: (attempt, json.loads(jobs)) for uuid, attempt, jobs in rows}
+
+    def latest_states(self) -> Dict[str, State]:
+        """
+        Returns the most recent State of every stored item, by uuid
+        """
+        rows = self._conn.execute(
+            "SELECT uuid, state, timestamp FROM latest "
+            "WHERE process = ? AND process_uuid = ?",
+            self.key,
+        )
+        return {uuid: State(state, ts) for uuid, state, ts in rows}
+
+    def latest_stamps(self, state: str) -> Dict[str, float]:
+        """
+        Returns the time each stored item last entered `state`, by uuid
+        """
+        rows = self._conn.execute(
+            "SELECT uuid, MAX(timestamp) FROM states "
+            "WHERE process = ? AND process_uuid = ? AND state = ? GROUP BY uuid",
+            (*self.key, state),
+        )
+        return dict(rows.fetchall())
+
+    def history(self, uuid: str) -> List[State]:
+        """
+        Returns the full state history for item `uuid`
+        """
+        rows = self._conn.execute(
+            "SELECT state, timestamp FROM states "
+            "WHERE process = ? AND process_uuid = ? AND uuid = ? ORDER BY rowid",
+            (*self.key, uuid),
+        )
+        return [State(state, ts) for state, ts in rows]
+
+    def state_counts(self) -> Dict[str, int]:
+        """
+        Returns the number of runners currently in each state
+        """
+        rows = self._conn.execute(
+            "SELECT COALESCE(latest.state, 'CREATED'), COUNT(*) FROM runners "
+            "LEFT JOIN latest ON latest.process = runners.process "
+            "AND latest.process_uuid = runners.process_uuid "
+            "AND latest.uuid = runners.uuid "
+            "WHERE runners.process = ? AND runners.process_uuid = ? "
+            "GROUP BY 1",
+            self.key,
+        )
+        return dict(rows.fetchall())
+
+    def query(
+        self, sql: str, params: Union[Tuple[Any, ...], Dict[str, Any]] = ()
+    ) -> List[Tuple[Any, ...]]:
+        """
+        Run an arbitrary SQL query against the store
+        """
+        self.commit()
+        return self._conn.execute(sql, params).fetchall()
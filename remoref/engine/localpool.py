@@ -0,0 +1,237 @@
+"""
+Local execution backend, running runners in a process pool rather than via bash
+
+Used when a Process runs on localhost and both directories share a filesystem.
+Files are hard linked rather than copied, and each runner is executed by the
+repository's own `Controller.submit`, so the manifest, result files and states
+are identical to those produced by the master script.
+"""
+
+import atexit
+import importlib.util
+import io
+import os
+import py_compile
+import shutil
+import signal
+import sys
+from types import ModuleType
+from typing import Any, Dict, Iterable, Tuple, Union
+
+from remotemanager.storage.trackedfile import TrackedFile
+
+
+# repositories loaded by this (worker) process, by path, with their mtime
+_repositories: Dict[str, Tuple[int, ModuleType]] = {}
+# sent to a worker to cancel the runner it is executing, see `cancel_handler`
+cancel_signal = signal.SIGUSR1
+# cancel marker of the runner this worker is executing, if any
+_cancel_marker: Union[str, None] = None
+
+
+def same_filesystem(*paths: str) -> bool:
+    """
+    True if all paths (or their closest existing parents) share a device
+    """
+    devices = set()
+    for path in paths:
+        path = os.path.abspath(path)
+        while not os.path.exists(path):
+            path = os.path.dirname(path)
+        devices.add(os.stat(path).st_dev)
+    return len(devices) == 1
+
+
+def link(source: str, target: str) -> None:
+    """
+    Hard link source to target, replacing target. Copies if linking fails
+    """
+    if os.path.abspath(source) == os.path.abspath(target):
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+    if os.path.exists(target):
+        if os.path.samefile(source, target):
+            return
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def link_files(files: Iterable[TrackedFile], pull: bool = False) -> int:
+    """
+    Link the local copy of each file to its remote path (or back, if `pull`)
+
+    Returns the number of files linked
+    """
+    count = 0
+    for file in files:
+        source, target = file.local, file.remote
+        if pull:
+            source, target = target, source
+        if not os.path.exists(source):
+            continue
+        link(source, target)
+        count += 1
+    return count
+
+
+def compile_repository(path: str) -> None:
+    """
+    Write the bytecode of the repository at `path`, so that workers need not
+
+    The bytecode is validated against the source hash, rather than its mtime,
+    as a restaged repository may be rewritten within the same second
+    """
+    py_compile.compile(
+        path, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH
+    )
+
+
+def load_repository(path: str) -> ModuleType:
+    """
+    Import the repository at `path`, reusing it until the file is rewritten
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _repositories.get(path, None)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    name = f"remoref_repository_{abs(hash(path))}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load repository {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Controller.submit looks the function up by module name
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    _repositories[path] = (mtime, module)
+    return module
+
+
+class ManifestStream(io.TextIOBase):
+    """
+    Text stream which logs each line written to it as a manifest record
+
+    Equivalent to the `enable_redirect` function of the master script
+    """
+
+    def __init__(self, manifest, mode: str) -> None:  # type: ignore
+        self.manifest = manifest
+        self.mode = mode
+        self._partial = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self.manifest.log(line, mode=self.mode)
+        return len(text)
+
+    def flush(self) -> None:
+        if self._partial:
+            self.manifest.log(self._partial, mode=self.mode)
+            self._partial = ""
+
+
+class RunnerCancelled(BaseException):
+    """
+    Raised within a pool worker to stop a cancelled runner
+
+    Not an Exception, so that it is not logged as a failure of the function
+    """
+
+
+def cancel_marker(runner_name: str) -> str:
+    """
+    Name of the file which marks a runner as cancelled
+    """
+    return f"{runner_name}-cancel"
+
+
+def cancel_handler(signum: int, frame: Any) -> None:
+    """
+    Stops the runner this worker is executing, if it has been cancelled
+
+    The worker may have moved on to another runner by the time the signal
+    arrives, so the signal alone is not enough
+    """
+    if _cancel_marker is not None and os.path.exists(_cancel_marker):
+        raise RunnerCancelled()
+
+
+def run_runner(
+    remote_dir: str,
+    repository: str,
+    process_name: str,
+    runner_name: str,
+    function_name: str,
+    uuid: str,
+    attempt: int = 1,
+    speculative: bool = False,
+    copy: bool = False,
+    timeout: Union[float, None] = None,
+) -> bool:
+    """
+    Execute a single runner within a pool worker
+
+    A losing speculative copy runs to completion and discards its outcome, as
+    exiting early would take down the worker. For the same reason, a runner
+    past its timeout is only stopped by the alarm of `Controller.set_alarm`
+
+    Returns True if the function completed
+    """
+    global _cancel_marker
+
+    os.chdir(remote_dir)
+    marker = os.path.abspath(cancel_marker(runner_name))
+    if os.path.exists(marker):
+        return False  # cancelled while queued
+    repo = load_repository(os.path.abspath(repository))
+
+    controller = repo.Controller(
+        uuid=uuid,
+        runner_name=runner_name,
+        process_name=process_name,
+        speculative=speculative,
+        copy=copy,
+        timeout=timeout,
+    )
+    manifest = controller.manifest
+    # records are written as they are made, no flush thread is needed
+    manifest.flush_interval = 0
+    if not copy:
+        if attempt > 1:
+            manifest.log(str(attempt), mode="attempt")
+        manifest.log("submitted")
+    manifest.log(str(os.getpid()), mode="job")
+
+    signal.signal(cancel_signal, cancel_handler)
+    _cancel_marker = marker
+
+    stdout, stderr = sys.stdout, sys.stderr
+    sys.stdout = ManifestStream(manifest, "stdout")
+    sys.stderr = ManifestStream(manifest, "stderr")
+    try:
+        controller.submit(function_name, uuid)
+        return True
+    except Exception:
+        return False  # the traceback has already been logged to the manifest
+    except RunnerCancelled:
+        # Controller.submit has already cleaned up, and the cancellation is
+        # logged by the canceller, so only the outcome is left to report
+        return False
+    finally:
+        _cancel_marker = None
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = stdout, stderr
+
+        writer = manifest.writer
+        writer.close()
+        atexit.unregister(writer.close)
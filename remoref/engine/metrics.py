@@ -0,0 +1,278 @@
+"""
+Metrics of running Processes, in the Prometheus text exposition format
+
+The values are read from the state table, profile and transfer counters that
+each Process already keeps, so exporting adds no cost to the lifecycle itself.
+They can be written to a file (for the node exporter textfile collector) or
+served over HTTP from a background thread.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple, Union
+
+from remoref.engine.runnerstates import state_names
+
+# TYPE_CHECKING is false at runtime, so does not cause a circular dependency
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+    from remoref.engine.process import ProcessHandler
+
+
+content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def file_sizes(paths: Iterable[str]) -> int:
+    """
+    Returns the total size of the files at `paths`, skipping any that are missing
+    """
+    total = 0
+    for path in paths:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsExporter:
+    """
+    Publishes per-Process metrics in the Prometheus text format
+
+    For each Process:
+
+    - remoref_runners: number of runners in each state
+    - remoref_phase_seconds_total, remoref_phase_calls_total and
+      remoref_phase_seconds_max: lifecycle phase timings (see `Profile`), where
+      the "read_remote_manifest" phase is the polling latency and "run" the
+      submission time
+    - remoref_transferred_bytes_total: bytes sent and received
+    - remoref_manifest_bytes: size of the remote manifest
+    - remoref_fetch_bytes_per_second: received bytes over fetch_results time
+
+    Args:
+        processes:
+            Processes to export, more can be added with `add()`
+        path:
+            file to (atomically) rewrite every `interval` seconds once started
+        port:
+            serve the metrics over HTTP on this port once started, 0 picks a
+            free port (see `address`)
+        host:
+            interface to serve on
+        interval:
+            time between file writes
+    """
+
+    def __init__(
+        self,
+        processes: Optional[Iterable["ProcessHandler"]] = None,
+        path: Optional[str] = None,
+        port: Optional[int] = None,
+        host: str = "127.0.0.1",
+        interval: Union[int, float] = 15,
+    ) -> None:
+        self._processes: List["ProcessHandler"] = []
+        if processes is not None:
+            for process in processes:
+                self.add(process)
+
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+
+        self._server: Union["ThreadingHTTPServer", None] = None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+    def __repr__(self) -> str:
+        return f"MetricsExporter({len(self._processes)} processes)"
+
+    def __enter__(self) -> "MetricsExporter":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def add(self, process: "ProcessHandler") -> None:
+        """
+        Export a Process, ignoring it if already present
+        """
+        if not any(p is process for p in self._processes):
+            self._processes.append(process)
+
+    def remove(self, process: "ProcessHandler") -> None:
+        """
+        Stop exporting a Process
+        """
+        self._processes = [p for p in self._processes if p is not process]
+
+    @property
+    def address(self) -> Union[Tuple[str, int], None]:
+        """
+        (host, port) the metrics are served on, None if not serving
+        """
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def render(self) -> str:
+        """
+        Returns the current metrics of all Processes
+        """
+        families = {
+            "remoref_runners": ("gauge", "Number of runners in each state", []),
+            "remoref_phase_seconds_total": (
+                "counter",
+                "Total time spent in each lifecycle phase",
+                [],
+            ),
+            "remoref_phase_calls_total": (
+                "counter",
+                "Number of times each lifecycle phase has run",
+                [],
+            ),
+            "remoref_phase_seconds_max": (
+                "gauge",
+                "Longest single duration of each lifecycle phase",
+                [],
+            ),
+            "remoref_transferred_bytes_total": (
+                "counter",
+                "Bytes transferred to and from the remote",
+                [],
+            ),
+            "remoref_manifest_bytes": (
+                "gauge",
+                "Size of the remote manifest as of the last read",
+                [],
+            ),
+            "remoref_fetch_bytes_per_second": (
+                "gauge",
+                "Result bytes received per second spent in fetch_results",
+                [],
+            ),
+        }
+
+        def sample(name: str, labels: str, value: Union[int, float]) -> None:
+            families[name][2].append(f"{name}{{{labels}}} {value}")
+
+        for process in list(self._processes):
+            label = f'process="{_escape(process.name)}"'
+
+            counts = process.state_counts
+            for state in state_names:
+                labels = f'{label},state="{state}"'
+                sample("remoref_runners", labels, counts.get(state, 0))
+
+            for phase, timing in process.profile.to_dict().items():
+                labels = f'{label},phase="{phase}"'
+                sample("remoref_phase_seconds_total", labels, timing["total"])
+                sample("remoref_phase_calls_total", labels, timing["count"])
+                sample("remoref_phase_seconds_max", labels, timing["max"])
+
+            for direction, size in process.transferred.items():
+                labels = f'{label},direction="{direction}"'
+                sample("remoref_transferred_bytes_total", labels, size)
+
+            sample("remoref_manifest_bytes", label, process.manifest_size)
+
+            fetching = process.profile.total("fetch_results")
+            received = process.transferred["received"]
+            sample(
+                "remoref_fetch_bytes_per_second",
+                label,
+                received / fetching if fetching > 0 else 0.0,
+            )
+
+        lines = []
+        for name, (kind, description, samples) in families.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines += samples
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Optional[str] = None) -> str:
+        """
+        Atomically write the current metrics to `path` (default `self.path`)
+
+        Returns the path written to
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to write metrics to")
+        tmp = f"{path}.tmp"
+        with open(tmp, "w+") as o:
+            o.write(self.render())
+        os.replace(tmp, path)
+        return path
+
+    def start(self) -> None:
+        """
+        Begin serving (if `port` is set) and writing (if `path` is set) metrics
+        """
+        self._stop.clear()
+        if self.port is not None and self._server is None:
+            from http.server import ThreadingHTTPServer
+
+            address = (self.host, self.port)
+            self._server = ThreadingHTTPServer(address, self._handler())
+            self._server.daemon_threads = True
+            self._spawn(self._server.serve_forever)
+        if self.path is not None:
+            self.write()
+            self._spawn(self._write_loop)
+
+    def stop(self) -> None:
+        """
+        Stop serving and writing, the file is written a final time
+        """
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._threads = []
+        if self.path is not None:
+            self.write()
+
+    def _spawn(self, target: Any) -> None:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _write_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def _handler(self) -> type:
+        from http.server import BaseHTTPRequestHandler
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -1,5 +1,6 @@
 import time
-from typing import Any, Dict, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Tuple, Union
 
 from remoref.engine.runnerstates import State
 
@@ -9,20 +10,55 @@ class ExecMixin:
     This mixin class handles execution args like directories and environment variables
 
     Also makes common args available and provides defaults for them
+
+    The combined exec args are cached, and only rebuilt when either layer is
+    replaced. Each rebuild increments `exec_version`, so anything derived from
+    them can check for staleness cheaply.
     """
 
+    __slots__ = ()
+
     _exec_args: Dict[Any, Any] = {}
     _temp_exec_args: Dict[Any, Any] = {}
+    # (exec_args, temp_exec_args, combined) of the last resolution
+    _exec_cache: Union[Tuple[Any, ...], None] = None
+    _exec_version: int = 0
     _stdout: Union[str, None] = None
     _stderr: Union[str, None] = None
 
     _state: State = State("CREATED", time.time())
 
     @property
-    def exec_args(self) -> Dict[Any, Any]:
-        cache = self._exec_args.copy()
-        cache.update(self._temp_exec_args)
-        return cache
+    def exec_args(self) -> Mapping[Any, Any]:
+        """
+        Read-only view of the exec args, temporary args taking precedence
+        """
+        return self._merge_exec_args()
+
+    def _merge_exec_args(self) -> Mapping[Any, Any]:
+        """
+        Returns the combined exec args, rebuilt if either source was replaced
+        """
+        cache = self._exec_cache
+        if (
+            cache is None
+            or cache[0] is not self._exec_args
+            or cache[1] is not self._temp_exec_args
+        ):
+            merged = self._exec_args.copy()
+            merged.update(self._temp_exec_args)
+            cache = (self._exec_args, self._temp_exec_args, MappingProxyType(merged))
+            self._exec_cache = cache
+            self._exec_version += 1
+        return cache[2]
+
+    @property
+    def exec_version(self) -> int:
+        """
+        Incremented whenever the combined exec args change
+        """
+        self._merge_exec_args()
+        return self._exec_version
 
     @property
     def local_dir(self) -> str:
@@ -60,4 +96,13 @@ class ExecMixin:
     def state(self, value: State):
         if not isinstance(value, State):  # type: ignore
             raise ValueError(f"Expected a RunnerState, got {value}")
+        previous = self._state
+        if previous.state == value.state and value.timestamp <= previous.timestamp:
+            return  # a repeated (or replayed) record of the current state
         self._state = value
+        self._state_changed(value)
+
+    def _state_changed(self, state: State) -> None:
+        """
+        Hook called whenever a new state is set, override to track history
+        """
@@ -81,6 +81,8 @@ class FileHandlerBaseClass:
 
 
 class ExtraFilesMixin:
+    __slots__ = ()
+
     local_dir = NotImplemented
     remote_dir = NotImplemented
 
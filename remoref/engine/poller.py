@@ -0,0 +1,181 @@
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from remotemanager.connection.url import URL
+from remoref.engine.process import ProcessHandler
+from remoref.engine.runnerstates import COMPLETED
+from remoref.engine.watcher import watch_until_finished
+
+
+class Poller:
+    """
+    Polls many Processes, with a single remote command per connection
+
+    Processes are grouped by the connection they use (the ssh command and
+    python interpreter), and each group is summarised by one call to the remote
+    summary helper. The number of remote calls per poll is then the number of
+    distinct connections, rather than the number of Processes.
+
+    Processes whose helper can not be run as part of a group (for example
+    before it has been transferred) are polled individually.
+
+    Args:
+        processes:
+            Processes to track, more can be added with `add()`
+    """
+
+    def __init__(self, processes: Optional[Iterable[ProcessHandler]] = None) -> None:
+        self._processes: List[ProcessHandler] = []
+        if processes is not None:
+            for process in processes:
+                self.add(process)
+
+    def __repr__(self) -> str:
+        return f"Poller({len(self._processes)} processes)"
+
+    def __len__(self) -> int:
+        return len(self._processes)
+
+    @property
+    def processes(self) -> List[ProcessHandler]:
+        return self._processes
+
+    def add(self, process: ProcessHandler) -> None:
+        """
+        Track a Process, ignoring it if already present
+        """
+        if not any(p is process for p in self._processes):
+            self._processes.append(process)
+
+    def remove(self, process: ProcessHandler) -> None:
+        """
+        Stop tracking a Process
+        """
+        self._processes = [p for p in self._processes if p is not process]
+
+    @staticmethod
+    def connection(url: URL) -> Tuple[str, str]:
+        """
+        Key that identifies a connection, Processes with equal keys are grouped
+        """
+        return (url.ssh, url.python)
+
+    @property
+    def groups(self) -> Dict[Tuple[str, str], List[ProcessHandler]]:
+        """
+        Returns the tracked Processes, grouped by connection
+        """
+        groups: Dict[Tuple[str, str], List[ProcessHandler]] = {}
+        for process in self._processes:
+            groups.setdefault(self.connection(process.url), []).append(process)
+        return groups
+
+    def poll(self) -> int:
+        """
+        Update the states of all tracked Processes
+
+        Errors raised by a Process (such as a SubmissionError) are raised once
+        every Process has been updated.
+
+        Returns:
+            int: number of remote commands issued
+        """
+        calls = 0
+        errors: List[Exception] = []
+        for processes in self.groups.values():
+            calls += self._poll_group(processes, errors)
+
+        if len(errors) > 0:
+            raise errors[0]
+        return calls
+
+    def _poll_group(
+        self, processes: List[ProcessHandler], errors: List[Exception]
+    ) -> int:
+        url = processes[0].url
+        helper = processes[0].files.summary.remote
+
+        args: List[str] = []
+        for process in processes:
+            args += process.summary_args()
+
+        cmd = url.cmd(f"{url.python} {helper} " + " ".join(args), raise_errors=False)
+        calls = 1
+
+        summaries: List[Union[Dict[str, Any], None]] = []
+        for line in str(cmd.stdout).split("\n"):
+            try:
+                summaries.append(json.loads(line))
+            except ValueError:
+                continue
+
+        if len(summaries) != len(processes):
+            # the shared helper could not be run, poll each Process separately
+            for process in processes:
+                calls += 1
+                self._dispatch(process, None, errors)
+            return calls
+
+        for process, summary in zip(processes, summaries):
+            self._dispatch(process, summary, errors)
+        return calls
+
+    @staticmethod
+    def _dispatch(
+        process: ProcessHandler,
+        summary: Union[Dict[str, Any], None],
+        errors: List[Exception],
+    ) -> None:
+        try:
+            if summary is None:
+                process.read_remote_manifest()
+            else:
+                process.apply_summary(summary)
+            process._check_finished()
+        except Exception as ex:
+            errors.append(ex)
+
+    @property
+    def all_finished(self) -> bool:
+        """
+        Poll, and return True if every runner of every Process has finished
+        """
+        self.poll()
+        return all(p.runners.all_at_least(COMPLETED) for p in self._processes)
+
+    def retry_pending(self) -> bool:
+        """
+        Resubmit the runners due a retry, True if any Process has retries to finish
+        """
+        # every Process is given the chance to resubmit, so no short circuit
+        pending = [process.retry_pending() for process in self._processes]
+        return any(pending)
+
+    def wait(
+        self, interval: Union[int, float] = 1, timeout: int = 10, watch: bool = False
+    ) -> None:
+        """
+        Poll every `interval` seconds until all Processes have finished
+
+        With `watch`, changes are instead streamed from the remote by one
+        long-lived command per connection, see `ManifestWatcher`. Processes
+        with a retry policy are always polled, see `ProcessHandler.wait`
+        """
+        retry = any(p.retry is not None for p in self._processes)
+        if watch and not retry and watch_until_finished(self._processes, timeout):
+            return
+
+        dt = 0.0
+        while dt < timeout:
+            dt += interval
+
+            finished = self.all_finished
+            if not self.retry_pending() and finished:
+                return
+            for process in self._processes:
+                process.speculate_stragglers()
+
+            time.sleep(interval)
+
+        raise RuntimeError("Wait Timed out")
@@ -1,6 +1,24 @@
+import atexit
+import json
+import os
 import re
+import statistics
 import time
-from typing import Any, Callable, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 import warnings
 
 from remotemanager.connection.cmd import CMD
@@ -8,42 +26,72 @@ from remotemanager.connection.url import URL
 from remotemanager.connection.validate_error import validate_error
 from remoref.engine.mixins.execmixin import ExecMixin
 from remoref.engine.mixins.filehandler import ExtraFilesMixin, FileHandlerBaseClass
-from remoref.engine.repo import Manifest
-from remoref.engine.runnerstates import State, valid_states
-from remoref.engine.runner import Runner
+from remoref.engine.profile import Profile
+from remoref.engine.registry import RunnerRegistry
+from remoref.engine.repo import Manifest, generate_log_str
+from remoref.engine.retry import RetryPolicy
+from remoref.engine.runnerstates import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    RUNNING,
+    SUBMITTED,
+    State,
+    valid_states,
+)
+from remoref.engine.runner import Runner, cancel_command, copy_suffix
 from remotemanager.storage.function import Function
 from remotemanager.storage.trackedfile import TrackedFile
-from remotemanager.utils.uuid import UUIDMixin
+from remotemanager.utils.uuid import UUIDMixin, generate_uuid
 from remotemanager.utils.verbosity import VerboseMixin, Verbosity
 from remoref.engine.exceptions import RunnerFailedError, SubmissionError
 
+# imported when first used, as they are only needed by some Processes
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    from remoref.engine.database import Database
+
 
 class ProcessFileHandler(FileHandlerBaseClass):
     """
     Extends the filehandler to contain Process related files
     """
 
-    __slots__ = ["master", "repo", "manifest"]
+    __slots__ = ["master", "repo", "launcher", "summary", "manifest", "speculate"]
 
     def __init__(
         self,
         master: TrackedFile,
         repo: TrackedFile,
+        launcher: TrackedFile,
+        summary: TrackedFile,
         manifest: TrackedFile,
+        speculate: TrackedFile,
     ):
         super().__init__()
 
         self.master = master
         self.repo = repo
+        self.launcher = launcher
+        self.summary = summary
         self.manifest = manifest
+        self.speculate = speculate
 
         self._files = {
             "master": True,
             "repo": True,
+            "launcher": True,
+            "summary": True,
             "manifest": None,
+            "speculate": None,
         }
 
 
+# finished runners needed before their median runtime is used to find stragglers
+speculation_samples = 3
+
+
 class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
     """
     Process is the main class used to tie Runners together
@@ -68,6 +116,9 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         verbose: Union[Verbosity, int, bool, None] = None,
         extra_files_send: Optional[List[Union[str, TrackedFile]]] = None,
         extra_files_recv: Optional[List[Union[str, TrackedFile]]] = None,
+        database: Optional[str] = None,
+        retry: Optional[RetryPolicy] = None,
+        speculate: Optional[float] = None,
         **exec_args: Any,
     ) -> None:
         self._verbose = self.validate_verbose(verbose)
@@ -82,12 +133,15 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         }
 
         self._exec_args.update(exec_args)
+        # runner level exec args resolved against the current exec_version
+        self._resolved: Dict[Tuple[int, int], Tuple[Any, ...]] = {}
+        self._resolved_version = -1
 
         if name is None:
             name = f"Process-{self.function.name}"
         self._name = name
 
-        self._runners: Dict[str, Runner] = {}
+        self._runners = RunnerRegistry(self)
 
         self._files = ProcessFileHandler(
             master=TrackedFile(
@@ -96,9 +150,18 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
             repo=TrackedFile(
                 self.local_dir, self.remote_dir, f"{self.name}-repository.py"
             ),
+            launcher=TrackedFile(
+                self.local_dir, self.remote_dir, f"{self.name}-launcher.py"
+            ),
+            summary=TrackedFile(
+                self.local_dir, self.remote_dir, f"{self.name}-summary.py"
+            ),
             manifest=TrackedFile(
                 self.local_dir, self.remote_dir, f"{self.name}-manifest.txt"
             ),
+            speculate=TrackedFile(
+                self.local_dir, self.remote_dir, f"{self.name}-speculate.sh"
+            ),
         )
 
         if extra_files_send is not None:
@@ -111,6 +174,36 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         self._url = url
 
         self.run_cmd: Union[CMD, None] = None
+        # position of the last manifest read, see `summary.py`
+        self._manifest_cursor: Union[str, None] = None
+        # True if the last staged submission appends to the manifest in use,
+        # rather than recreating it, see `Runner.stage`
+        self._append_manifest = False
+        # local process pool backend, see `local_pool`
+        self._local_pool: Union[bool, None] = None
+        self._pool: Union["ProcessPoolExecutor", None] = None
+        self._futures: List["Future[bool]"] = []
+        # timings of the lifecycle phases, see `profile`
+        self._profile = Profile()
+        # bytes moved by transfer and fetch_results, see `transferred`
+        self._transferred = {"sent": 0, "received": 0}
+        # resubmission of failed runners, see `retry_failed`
+        self.retry = retry
+        if speculate is not None and speculate < 1:
+            raise ValueError(f"speculate must be at least 1, got {speculate}")
+        # re-execution of runners slower than this multiple of the median
+        # runtime, see `speculate_stragglers`
+        self.speculate = speculate
+        self._speculated: Set[int] = set()
+
+        self._database: Union["Database", None] = None
+        if database is not None:
+            from remoref.engine.database import Database
+
+            self._database = Database(
+                database, process=self.name, process_uuid=self.uuid
+            )
+            self._restore()
 
     def __repr__(self) -> str:
         # return a string representation of this Process instance
@@ -154,32 +247,263 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         return self._files
 
     @property
-    def runners(self) -> List[Runner]:
+    def database(self) -> Union["Database", None]:
+        """
+        Returns the attached state Database, if any
         """
-        Returns the list of runners associated with this process
+        return self._database
+
+    def _restore(self) -> None:
+        """
+        Recreate the runners, their latest states, start times, attempts and job
+        ids from the database
+        """
+        if self._database is None:
+            return
+
+        for uuid, _, call_args, exec_args in self._database.runners():
+            self._runners.add(uuid, call_args, exec_args)
+
+        for uuid, state in self._database.latest_states().items():
+            if uuid == self.uuid:
+                self._state = state
+                continue
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                self._runners.set_state(idx, state)
+
+        # when each runner was last submitted and started, for its timings and
+        # to tell a stale result from a fresh one, see `read_local_files`
+        submitted = self._database.latest_stamps("SUBMITTED")
+        started = self._database.latest_stamps("RUNNING")
+        for uuid in submitted.keys() | started.keys():
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                self._runners.restore_stamps(
+                    idx, submitted.get(uuid, -1), started.get(uuid, -1)
+                )
+
+        for uuid, (attempt, jobs) in self._database.submissions().items():
+            idx = self._runners.find(uuid)
+            if idx is None:
+                continue
+            self._runners.set_attempt(idx, attempt)
+            for job in jobs:
+                self._runners.add_job(idx, job)
+
+    def record_state(self, uuid: str, state: State) -> None:
+        """
+        Store a state change of the item `uuid` in the database
+        """
+        if self._database is not None:
+            self._database.add_state(uuid, state)
+
+    def record_submission(self, runner: Runner) -> None:
+        """
+        Store the attempt number and job ids of `runner` in the database
+        """
+        if self._database is not None:
+            self._database.update_runner(runner.uuid, runner.attempt, runner.jobs)
+
+    def _state_changed(self, state: State) -> None:
+        self.record_state(self.uuid, state)
+
+    def commit(self) -> None:
+        """
+        Commit any pending database writes
+        """
+        if self._database is not None:
+            self._database.commit()
+
+    def close(self) -> None:
+        """
+        Close the database and shut down the local process pool
+
+        Runners still queued in the pool are dropped, and those running are
+        waited on. The database is otherwise closed at exit, and the pool with
+        the interpreter. Also called when leaving a `with` block
         """
-        return list(self._runners.values())
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._database is not None:
+            self._database.close()
+
+    def __enter__(self) -> "ProcessHandler":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    @property
+    def runners(self) -> RunnerRegistry:
+        """
+        Returns the runners associated with this process
+
+        This is a read-only view, ordered by idx
+        """
+        return self._runners
+
+    def get_runner(self, uuid: str) -> Union[Runner, None]:
+        """
+        Returns the runner with the given uuid or short_uuid, if it exists
+        """
+        return self._runners.get(uuid)
+
+    def resolve_exec_args(
+        self, runner_args: Dict[Any, Any], temp_args: Dict[Any, Any]
+    ) -> Mapping[Any, Any]:
+        """
+        Layer runner exec args (and their temporary args) over those of the Process
+
+        Results are cached by the identity of the layers, which are shared by
+        runners that were prepared together, and dropped when the Process
+        exec args change. The returned mapping must not be modified.
+        """
+        key = (id(runner_args), id(temp_args))
+        entry = self._resolved.get(key, None)
+        cache = self._exec_cache
+        if (
+            entry is not None
+            and cache is not None
+            and self._resolved_version == self._exec_version
+            and cache[0] is self._exec_args
+            and cache[1] is self._temp_exec_args
+        ):
+            return entry[2]
+
+        version = self.exec_version
+        if version != self._resolved_version:
+            self._resolved = {}
+            self._resolved_version = version
+
+        entry = self._resolved.get(key, None)
+        if entry is None:
+            merged = dict(self.exec_args)
+            merged.update(runner_args)
+            merged.update(temp_args)
+            for runner_only in ("extra_files_send", "extra_files_recv"):
+                merged.pop(runner_only, None)
+            # the layers are held to keep their ids from being reused
+            entry = (runner_args, temp_args, MappingProxyType(merged))
+            self._resolved[key] = entry
+        return entry[2]
 
     @property
     def states(self) -> List[State]:
         """
         Returns the list of states associated with this process
         """
-        return [r.state for r in self.runners]
+        return [self._runners.get_state(i) for i in range(len(self._runners))]
+
+    @property
+    def state_counts(self) -> Dict[str, int]:
+        """
+        Returns the number of runners in each state
+        """
+        return self._runners.state_counts()
+
+    @property
+    def failed(self) -> List[Runner]:
+        """
+        Returns the runners which are currently FAILED
+        """
+        return [self._runners[idx] for idx in self._runners.where(FAILED)]
+
+    @property
+    def cancelled(self) -> List[Runner]:
+        """
+        Returns the runners which are currently CANCELLED
+        """
+        return [self._runners[idx] for idx in self._runners.where(CANCELLED)]
+
+    def runtime_percentiles(
+        self, *percentiles: Union[int, float]
+    ) -> Dict[Union[int, float], Union[float, None]]:
+        """
+        Returns percentiles (0-100) of the runtime of the finished runners
+
+        Defaults to the median, 95th percentile and maximum
+        """
+        if len(percentiles) == 0:
+            percentiles = (50, 95, 100)
+        return self._runners.runtime_percentiles(*percentiles)
+
+    def usage_summary(
+        self, *percentiles: Union[int, float]
+    ) -> Dict[str, Dict[Union[int, float], Union[float, None]]]:
+        """
+        Returns percentiles (0-100) of the resource usage of the finished runners
+
+        Covers the peak memory ("maxrss", bytes), the CPU time ("cpu", user plus
+        system) and the wall time ("wall"). Defaults to the median, 95th
+        percentile and maximum
+        """
+        if len(percentiles) == 0:
+            percentiles = (50, 95, 100)
+        return {
+            field: self._runners.usage_percentiles(field, *percentiles)
+            for field in ("maxrss", "cpu", "wall")
+        }
+
+    def timing_percentiles(
+        self, *percentiles: Union[int, float]
+    ) -> Dict[str, Dict[Union[int, float], Union[float, None]]]:
+        """
+        Returns percentiles (0-100) of the queue wait, execution time and
+        turnaround of the runners
+
+        Queue wait runs from SUBMITTED to RUNNING, execution from RUNNING to
+        COMPLETED/FAILED, and turnaround covers both. Defaults to the median,
+        95th percentile and maximum
+        """
+        if len(percentiles) == 0:
+            percentiles = (50, 95, 100)
+        return self._runners.timing_percentiles(*percentiles)
+
+    def timeline(
+        self, interval: Union[int, float] = 60, percentile: Union[int, float] = 50
+    ) -> List[Dict[str, Union[float, int, None]]]:
+        """
+        Returns the queue wait, execution time and turnaround over time
+
+        Runners are binned by submission time into `interval` second bins, see
+        `RunnerRegistry.timeline`
+        """
+        return self._runners.timeline(interval, percentile)
+
+    @property
+    def profile(self) -> Profile:
+        """
+        Timings of the lifecycle phases of this Process, see `Profile`
+        """
+        return self._profile
+
+    @property
+    def transferred(self) -> Dict[str, int]:
+        """
+        Total bytes sent to (by `transfer`) and received from (by
+        `fetch_results`) the remote
+        """
+        return self._transferred
+
+    @property
+    def manifest_size(self) -> int:
+        """
+        Size in bytes of the remote manifest, as of the last read
+        """
+        if self._manifest_cursor is None:
+            return 0
+        return int(self._manifest_cursor.split(":")[1])
 
     def add_runner(self, call_args: Dict[Any, Any], exec_args: Dict[Any, Any]) -> bool:
         """
         Adds a new runner to the process with the given arguments
         """
-        runner = Runner(
-            idx=len(self.runners),
-            parent=self,
-            call_arguments=call_args,
-            exec_arguments=exec_args,
-        )
-
-        if runner.uuid not in self._runners:
-            self._runners[runner.uuid] = runner
+        idx = self._runners.next_idx
+        if self._runners.add(generate_uuid(call_args), call_args, exec_args):
+            if self._database is not None:
+                self._database.add_runner(self._runners[idx])
 
             return True
         return False
@@ -200,14 +524,96 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         verbose.print(f"created runner with exec args: {kwargs}", 3)
 
         self.add_runner(call_args=call_args, exec_args=kwargs)
+        self.commit()
+
+    def prepare_many(
+        self,
+        args: Union[Iterable[Dict[Any, Any]], Dict[Any, Sequence[Any]]],
+        verbose: Union[Verbosity, int, bool, None] = None,
+        **exec_args: Any,
+    ) -> int:
+        """
+        Prepares many runners in a single pass
+
+        Each entry is treated as the kwargs of a `prepare` call: function
+        arguments become call args, anything else becomes a runner exec arg.
+        Runners whose call args are already present are skipped.
+
+        Args:
+            args:
+                Either an iterable (or generator) of kwargs dicts, one per runner,
+                or a dict of equal-length columns such as {"a": [1, 2], "b": [3, 4]}
+            verbose:
+                local verbosity override
+            exec_args:
+                exec args to be applied to every runner in this batch
+
+        Returns:
+            int: number of runners added
+        """
+        verbose = self.validate_verbose(verbose)
+
+        if isinstance(args, dict):
+            args = self._iter_columns(args)
+
+        orig_args = self.function.orig_args
+        # rows sharing the same set of keys share the same split
+        splits: Dict[Tuple[Any, ...], List[Any]] = {}
+
+        start = self._runners.next_idx
+        duplicates = 0
+        for row in args:
+            keys = tuple(row)
+            extra = splits.get(keys, None)
+            if extra is None:
+                extra = [k for k in keys if k not in orig_args]
+                splits[keys] = extra
+
+            call_args = {arg: row.get(arg, None) for arg in orig_args}
+
+            if len(extra) == 0:
+                # runners without their own exec args share the batch dict
+                runner_exec = exec_args
+            else:
+                runner_exec = exec_args.copy()
+                runner_exec.update({k: row[k] for k in extra})
+
+            if not self._runners.add(generate_uuid(call_args), call_args, runner_exec):
+                duplicates += 1
+
+        added = self._runners.next_idx - start
+
+        if self._database is not None:
+            for chunk in self._runners.chunks(start=start):
+                self._database.add_runners(chunk)
+        self.commit()
+
+        verbose.print(f"Prepared {added} runners ({duplicates} duplicates skipped)", 2)
+
+        return added
+
+    @staticmethod
+    def _iter_columns(
+        columns: Dict[Any, Sequence[Any]],
+    ) -> Iterable[Dict[Any, Any]]:
+        """
+        Converts a dict of equal-length columns into an iterable of rows
+        """
+        lengths = {k: len(v) for k, v in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Columns must be of equal length, got {lengths}")
+
+        keys = list(columns)
+        return (dict(zip(keys, values)) for values in zip(*columns.values()))
 
     def stage(self, verbose: Union[Verbosity, None] = None, **exec_args: Any) -> bool:
-        time.sleep(1)
         self._temp_exec_args = exec_args
 
         self.state = State("STAGED", time.time())
 
-        return self.runners[0].stage(verbose=verbose)
+        staged = self.runners[0].stage(verbose=verbose)
+        self.commit()
+        return staged
 
     def transfer(
         self, verbose: Union[Verbosity, None] = None, **exec_args: Any
@@ -216,7 +622,9 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
 
         self.state = State("TRANSFERRED", time.time())
 
-        return self.runners[0].transfer(verbose=verbose)
+        transferred = self.runners[0].transfer(verbose=verbose)
+        self.commit()
+        return transferred
 
     def run(self, verbose: Union[Verbosity, None] = None, **exec_args: Any) -> bool:
         """
@@ -228,9 +636,11 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         self._temp_exec_args = exec_args
 
         success = self.runners[0].run(verbose=verbose)
-        # a successful master execution should echo the short uuid of the Process
+        self.commit()
+        # the master echoes the short uuid of the Process once submission is done
         if success and self.run_cmd is not None:
-            self.run_cmd.communicate(ignore_errors=True)
+            with self._profile.phase("run.acknowledge"):
+                self.run_cmd.communicate(ignore_errors=True)
 
             if validate_error(self.run_cmd.stderr, self.url.error_ignore_patterns):
                 raise SubmissionError(
@@ -256,47 +666,317 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         self.prepare(verbose=verbose, **runner_args)
         self.run(verbose=verbose)
 
-        time.sleep(1)
         self.wait(interval=interval, timeout=timeout)
         self.fetch_results()
 
         return self.results
 
-    def read_remote_manifest(self):
-        cmd = self.url.cmd(
-            f"cd {self.remote_dir} && cat {self.files.manifest.name}",
-            raise_errors=False,
-        )
+    @property
+    def local_pool(self) -> bool:
+        """
+        True if runners are executed by the local process pool backend
 
-        if cmd.stderr is not None and "No such file or directory" in cmd.stderr:
-            # no file yet
+        Enabled by the `local_pool` exec arg, and only used when the url is
+        local and local_dir and remote_dir share a filesystem
+        """
+        if not self.exec_args.get("local_pool", False):
+            return False
+        if self._local_pool is None:
+            from remoref.engine import localpool
+
+            self._local_pool = self.url.is_local and localpool.same_filesystem(
+                self.local_dir, self.remote_dir
+            )
+        return self._local_pool
+
+    @property
+    def pool(self) -> "ProcessPoolExecutor":
+        """
+        Process pool used by the `local_pool` backend, sized by `local_workers`
+        """
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.exec_args.get("local_workers", None)
+            )
+        return self._pool
+
+    def submit_local(self, asynchronous: bool = True) -> List["Future[bool]"]:
+        """
+        Submit all runners awaiting execution to the local process pool
+
+        Mirrors the master script: the manifest is recreated (unless runners of
+        an earlier submission are still running), and runners which are not
+        asynchronous are waited on before submitting the next.
+        If `asynchronous` is False, all runners are waited on before returning
+        """
+        from remoref.engine import localpool
+
+        path = self.files.manifest.remote
+        if os.path.exists(path) and not self._append_manifest:
+            os.remove(path)
+        manifest = Manifest(path, uuid=self.short_uuid, flush_interval=0)
+        manifest.log("submitted")
+        writer = manifest.writer
+        writer.close()  # type: ignore
+        atexit.unregister(writer.close)  # type: ignore
+        localpool.compile_repository(self.files.repo.remote)
+
+        speculative = self.speculate is not None
+        futures: List["Future[bool]"] = []
+        for runner in self.runners:
+            if runner.state >= RUNNING:
+                continue
+            if speculative and os.path.exists(runner.files.claim.remote):
+                os.remove(runner.files.claim.remote)
+            marker = os.path.join(self.remote_dir, localpool.cancel_marker(runner.name))
+            if os.path.exists(marker):
+                os.remove(marker)
+            future = self.pool.submit(
+                localpool.run_runner,
+                # workers are reused, so their working directory can not be relied on
+                os.path.abspath(self.remote_dir),
+                self.files.repo.name,
+                self.name,
+                runner.name,
+                self.function.name,
+                runner.short_uuid,
+                runner.attempt,
+                speculative,
+                False,
+                runner.exec_args.get("runner_timeout", None),
+            )
+            futures.append(future)
+            if not runner.exec_args.get("asynchronous", True):
+                future.result()
+        if not asynchronous:
+            for future in futures:
+                future.result()
+        self._futures = [f for f in self._futures if not f.done()] + futures
+        return futures
+
+    def read_remote_manifest(
+        self, output: Optional[Sequence[Union[Runner, "ProcessHandler"]]] = None
+    ) -> None:
+        """
+        Update the states from the remote manifest
+
+        Only the records written since the last read are transferred, as a
+        compact summary. The output of the runners is fetched when first
+        accessed, or with `output`.
+        """
+        from remoref.engine.summary import parse_uuids, summarise
+
+        if self.local_pool:
+            # the manifest is on this filesystem, summarise it directly
+            manifest, cursor, uuids = self.summary_args(output)
+            with self._profile.phase("read_remote_manifest"):
+                summary = summarise(manifest, cursor, parse_uuids(uuids))
+            self.apply_summary(summary, output)
             return
 
-        for item in self.runners + [self]:
-            manifest = Manifest(content=cmd.stdout, uuid=item.short_uuid)
+        args = self.summary_args(output, remote_paths=False)
+        with self._profile.phase("read_remote_manifest"):
+            cmd = self.url.cmd(
+                f"cd {self.remote_dir} && {self.url.python} {self.files.summary.name} "
+                + " ".join(args),
+                raise_errors=False,
+            )
+
+            if cmd.stderr is not None and "No such file or directory" in cmd.stderr:
+                # no file yet
+                return
+
+            try:
+                summary = json.loads(cmd.stdout)
+            except (TypeError, ValueError):
+                # the helper could not run, fall back to reading the whole manifest
+                # (which includes the output of the Process at no extra cost)
+                uuids = set(parse_uuids(args[2]) + [self.short_uuid])
+                summary = self._summarise_manifest(list(uuids))
+
+        self.apply_summary(summary, output)
+
+    def summary_args(
+        self,
+        output: Optional[Sequence[Union[Runner, "ProcessHandler"]]] = None,
+        remote_paths: bool = True,
+        watch: bool = False,
+    ) -> List[str]:
+        """
+        Returns the summary.py arguments (manifest, cursor, uuids) for this Process
+
+        Args:
+            output:
+                items to request the full output for. That of the Process is
+                only requested by the first read (or when watching, which only
+                includes output that has changed), as full output from a later
+                cursor means reading the whole manifest, see `apply_summary`
+            remote_paths:
+                give the manifest path from the remote landing dir, rather than
+                the remote_dir
+            watch:
+                arguments for the `--watch` mode of the helper
+        """
+        output_uuids: List[str] = []
+        if watch or self._manifest_cursor is None:
+            output_uuids.append(self.short_uuid)
+        if output is not None:
+            output_uuids += [item.short_uuid for item in output]
+
+        manifest = self.files.manifest
+        return [
+            manifest.remote if remote_paths else manifest.name,
+            self._manifest_cursor or "-",
+            ",".join(output_uuids) or "-",
+        ]
+
+    def apply_summary(
+        self,
+        summary: Union[Dict[str, Any], None],
+        output: Optional[Sequence[Union[Runner, "ProcessHandler"]]] = None,
+    ) -> None:
+        """
+        Update the states and output from a manifest summary, see `summary.py`
+        """
+        with self._profile.phase("apply_summary"):
+            failed = self._apply_summary(summary, output)
+        if failed is None:
+            return
+
+        if self.short_uuid in summary["output"]:  # type: ignore
+            if self.short_uuid not in summary.get("stdout", {}):  # type: ignore
+                # the Process has new output, which is only now read in full
+                self.read_remote_manifest(output=[self])
+
+        if failed:
+            if output is None:
+                # a failed runner needs its stderr for the result
+                self.read_remote_manifest(output=failed)
+            for runner in failed:
+                runner._result = RunnerFailedError(runner.stderr)  # type: ignore
 
-            for ts, state in manifest.states:
+        if self.state.failed:
+            raise SubmissionError(self.stderr)
+
+    def _apply_summary(
+        self,
+        summary: Union[Dict[str, Any], None],
+        output: Optional[Sequence[Union[Runner, "ProcessHandler"]]] = None,
+    ) -> Union[List[Runner], None]:
+        """
+        Apply a summary, returning the runners that failed (None if it was empty)
+        """
+        if summary is None or (summary["cursor"] is None and not summary["states"]):
+            # no manifest yet
+            return None
+        if summary["cursor"] is not None:
+            self._manifest_cursor = summary["cursor"]
+
+        parser = Manifest(content="")
+        failed: List[Runner] = []
+        for uuid, records in summary["states"].items():
+            item = self if uuid == self.short_uuid else self.get_runner(uuid)
+            if item is None:
+                continue
+
+            for timestring, state in records:
+                state = state.upper()
                 if state not in valid_states:
-                    warnings.warn(
-                        f"Unknown state '{state}' for runner {item.short_uuid}"
-                    )
+                    warnings.warn(f"Unknown state '{state}' for runner {uuid}")
                     continue
+                if isinstance(item, Runner) and item.state.cancelled:
+                    # a cancelled job may still report its end, until run again
+                    break
 
-                item.state = State(state, ts)
+                item.state = State(state, parser.to_timestamp(timestring))
+
+            if isinstance(item, Runner) and item.state.failed:
+                failed.append(item)
+
+        for uuid in summary["output"]:
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                self._runners.mark_output(idx)
+
+        for uuid, usage in summary.get("usage", {}).items():
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                self._runners.set_usage(idx, usage)
+
+        for uuid, jobs in summary.get("jobs", {}).items():
+            if uuid.endswith(copy_suffix):
+                uuid = uuid[: -len(copy_suffix)]
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                for job in jobs:
+                    self._runners.add_job(idx, job)
+                self.record_submission(self._runners[idx])
+
+        for uuid, attempt in summary.get("attempts", {}).items():
+            idx = self._runners.find(uuid)
+            if idx is not None:
+                self._runners.set_attempt(idx, attempt)
+                self.record_submission(self._runners[idx])
+
+        for uuid in summary.get("stdout", {}):
+            item = self if uuid == self.short_uuid else self.get_runner(uuid)
+            if item is None:
+                continue
+            item.stdout = summary["stdout"][uuid]
+            item.stderr = summary["stderr"][uuid]
 
-            if item.state.failed:
-                if isinstance(item, Runner):
-                    item._result = RunnerFailedError(manifest.stderr)  # type: ignore
-                else:
-                    raise SubmissionError(manifest.stderr)
+        self.commit()
+        return failed
+
+    def _summarise_manifest(self, output: List[str]) -> Union[Dict[str, Any], None]:
+        """
+        Summarise the full remote manifest locally, None if it does not exist
+        """
+        from remoref.engine.summary import new_summary, summarise_records
+
+        cmd = self.url.cmd(
+            f"cd {self.remote_dir} && cat {self.files.manifest.name}",
+            raise_errors=False,
+        )
+
+        if cmd.stderr is not None and "No such file or directory" in cmd.stderr:
+            return None
 
-            item.stdout = manifest.stdout
-            item.stderr = manifest.stderr
+        self._manifest_cursor = None
+        records = [line.strip() for line in str(cmd.stdout).split("\n")]
+        return summarise_records(
+            new_summary(output), [line for line in records if line], output
+        )
+
+    def fetch_output(self, runners: Sequence[Runner]) -> None:
+        """
+        Retrieve the stdout and stderr of `runners` from the remote manifest
+        """
+        self.read_remote_manifest(output=runners)
 
     @property
     def is_finished(self) -> List[bool]:
+        self._update_finished()
+        return self._runners.finished()
+
+    @property
+    def all_finished(self):
+        self._update_finished()
+        return self._runners.all_at_least(COMPLETED)
+
+    def _update_finished(self) -> None:
+        """
+        Read the remote state, checking for submission errors
+        """
         self.read_remote_manifest()
+        self._check_finished()
 
+    def _check_finished(self) -> None:
+        """
+        Check the current state for submission errors and completion
+        """
         # Check for submission errors
         if self.files.master.content is not None:
             # This checks for errors with the actual submitter
@@ -311,54 +991,280 @@ class ProcessHandler(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
                 if re.match(match, self.stderr) is not None:
                     raise SubmissionError(f"Encountered an error during submisson. Is the submitter '{self.url.submitter}' correct?")
 
-        states = [r.is_finished for r in self.runners]
-
-        if all(states):
+        if self._runners.all_at_least(COMPLETED):
             self.state = State("COMPLETED", time.time())
 
-        return states
-
-    @property
-    def all_finished(self):
-        return all(self.is_finished)
+    def wait(
+        self, interval: Union[int, float] = 1, timeout: int = 10, watch: bool = False
+    ) -> None:
+        """
+        Wait for all runners to finish, checking every `interval` seconds
+
+        Args:
+            interval:
+                time between checks of the remote manifest
+            timeout:
+                raise a RuntimeError if not finished after this many seconds
+            watch:
+                rather than polling, stream changes to the manifest from the
+                remote as they happen. Falls back to polling if this fails.
+                Stragglers are only speculated on, and failed runners only
+                retried, while polling
+        """
+        if not self._runners.any_at_least(RUNNING):
+            return
 
-    def wait(self, interval: Union[int, float] = 1, timeout: int = 10) -> None:
-        has_run = False
-        for runner in self.runners:
-            if runner.state >= State("RUNNING"):
-                has_run = True
-                break
+        from remoref.engine.watcher import watch_until_finished
 
-        if not has_run:
+        # with a retry policy, poll, so that failed runners are resubmitted as
+        # soon as they are due rather than once all runners have finished
+        if watch and self.retry is None and watch_until_finished([self], timeout):
             return
 
         dt = 0
         while dt < timeout:
             dt += interval
 
-            if self.all_finished:
+            finished = self.all_finished
+            if not self.retry_pending() and finished:
                 return
+            self.speculate_stragglers()
 
             time.sleep(interval)
 
         raise RuntimeError("Wait Timed out")
 
+    def retryable(self) -> List[Runner]:
+        """
+        Failed runners which the retry policy will resubmit
+        """
+        policy = self.retry
+        if policy is None or not self._runners.any_at_least(FAILED):
+            return []
+        return [
+            runner
+            for runner in self.runners
+            if runner.state.failed
+            and policy.should_retry(runner.attempt, runner.stderr)
+        ]
+
+    def retry_failed(self, verbose: Union[Verbosity, None] = None) -> List[Runner]:
+        """
+        Resubmit the retryable runners whose backoff has passed
+
+        Only these runners are restaged and transferred, and a single master
+        script submits them all. Their attempt number is increased and recorded
+        in the manifest, which is appended to if other runners are still active.
+
+        Returns:
+            the runners resubmitted
+        """
+        policy = self.retry
+        if policy is None:
+            return []
+        now = time.time()
+        due = [
+            runner
+            for runner in self.retryable()
+            if now >= runner.state.timestamp + policy.delay(runner.attempt)
+        ]
+        if len(due) == 0:
+            return []
+
+        verbose = self.validate_verbose(verbose)
+        verbose.print(f"Retrying {len(due)}/{len(self.runners)} Runners", level=1)
+        for runner in due:
+            self._speculated.discard(runner.idx)
+            self._runners.set_attempt(runner.idx, runner.attempt + 1)
+            self.record_submission(runner)
+            runner.state = State("CREATED", now)
+            runner._result = None
+            runner.stdout = None  # type: ignore
+            runner.stderr = None  # type: ignore
+
+        self.run(verbose=verbose)
+        return due
+
+    def cancel(
+        self,
+        runners: Optional[Sequence[Runner]] = None,
+        verbose: Union[Verbosity, None] = None,
+    ) -> List[Runner]:
+        """
+        Stop `runners` (all by default), whether queued or running
+
+        Submitted runners are stopped by a single remote call, which kills (or
+        cancels with the scheduler) their recorded jobs, and writes their
+        CANCELLED state to the manifest. Runners which were never run are only
+        marked CANCELLED, so that `run` skips them unless forced. Finished
+        runners are left as they are.
+
+        Returns:
+            the runners cancelled
+        """
+        verbose = self.validate_verbose(verbose)
+        if runners is None:
+            runners = list(self.runners)
+        if any(runner.state >= SUBMITTED for runner in runners):
+            # pick up the job ids of the latest submission
+            self.read_remote_manifest()
+        runners = [runner for runner in runners if not runner.is_finished]
+        if len(runners) == 0:
+            return []
+
+        parser = Manifest(content="")
+        stamp = parser.now()
+        submitted = [runner for runner in runners if runner.state >= SUBMITTED]
+        if len(submitted) > 0:
+            records = [
+                generate_log_str(time=stamp, uuid=runner.short_uuid, string="cancelled")
+                for runner in submitted
+            ]
+            jobs = [job for runner in submitted for job in runner.jobs]
+            with self._profile.phase("cancel"):
+                if self.local_pool:
+                    self._cancel_local(submitted, records, jobs)
+                else:
+                    self._cancel_remote(records, jobs)
+
+        verbose.print(f"Cancelled {len(runners)}/{len(self.runners)} Runners", level=1)
+        state = State("CANCELLED", parser.to_timestamp(stamp))
+        for runner in runners:
+            runner.state = state
+        self.commit()
+        return runners
+
+    def _cancel_remote(self, records: List[str], jobs: List[str]) -> None:
+        """
+        Cancel `jobs` and append `records` to the manifest, in one remote call
+        """
+        commands = []
+        if len(jobs) > 0:
+            commands.append(cancel_command(self.url.submitter, jobs))
+        manifest = self.files.manifest.name
+        commands += [f'echo "{record}" >> {manifest}' for record in records]
+
+        self.url.cmd(
+            f"cd {self.remote_dir} && {{ {'; '.join(commands)}; }}", raise_errors=False
+        )
+
+    def _cancel_local(
+        self, runners: List[Runner], records: List[str], jobs: List[str]
+    ) -> None:
+        """
+        Cancel runners in the local pool
+
+        Queued runners skip their cancel marker, and running runners are
+        signalled to stop. The worker survives, to run the next runner
+        """
+        from remoref.engine import localpool
+
+        for runner in runners:
+            marker = os.path.join(self.remote_dir, localpool.cancel_marker(runner.name))
+            open(marker, "w").close()
+
+        with open(self.files.manifest.remote, "a") as o:
+            o.write("".join(f"{record}\n" for record in records))
+
+        for job in jobs:
+            try:
+                os.kill(int(job), localpool.cancel_signal)
+            except (ProcessLookupError, ValueError):
+                continue
+
+    def stragglers(self) -> List[Runner]:
+        """
+        Runners which have been running for over `speculate` times the median
+        runtime of those that have finished
+
+        Nothing is a straggler until `speculation_samples` runners have finished
+        """
+        if self.speculate is None:
+            return []
+        runtimes = self._runners.runtimes()
+        if len(runtimes) < speculation_samples:
+            return []
+
+        limit = self.speculate * statistics.median(runtimes)
+        return [self.runners[i] for i in self._runners.overrunning(limit, time.time())]
+
+    def speculate_stragglers(
+        self, verbose: Union[Verbosity, None] = None
+    ) -> List[Runner]:
+        """
+        Submit a copy of each straggler which does not already have one
+
+        Both copies run the same call, the first to finish records the outcome
+        of the runner and the other exits as soon as it notices. Losing copies
+        in the local pool run to completion, but discard their outcome
+
+        Returns:
+            the runners copied
+        """
+        stragglers = [r for r in self.stragglers() if r.idx not in self._speculated]
+        if len(stragglers) == 0:
+            return []
+
+        if self.local_pool:
+            from remoref.engine import localpool
+
+            for runner in stragglers:
+                future = self.pool.submit(
+                    localpool.run_runner,
+                    os.path.abspath(self.remote_dir),
+                    self.files.repo.name,
+                    self.name,
+                    runner.name,
+                    self.function.name,
+                    runner.short_uuid,
+                    runner.attempt,
+                    True,
+                    True,
+                    runner.exec_args.get("runner_timeout", None),
+                )
+                self._futures.append(future)
+        else:
+            self.runners[0].speculate(stragglers, verbose=verbose)
+
+        self._speculated.update(runner.idx for runner in stragglers)
+        return stragglers
+
+    def retry_pending(self) -> bool:
+        """
+        Resubmit any runners due a retry, returning True if any are yet to finish
+        """
+        if self.retry is None:
+            return False
+        return len(self.retry_failed()) > 0 or len(self.retryable()) > 0
+
     def fetch_results(self) -> bool:
+        from remoref.engine import localpool
+        from remoref.engine.metrics import file_sizes
+
+        files: List[TrackedFile] = []
         transfer = False
         for runner in self.runners:
             if not runner.is_finished:
                 continue
 
-            if not runner.state.failed:
+            if not runner.state.failed and not runner.state.cancelled:
                 for file in runner.files.files_to_recv:
-                    self.url.transport.queue_for_pull(file)
+                    files.append(file)
                 transfer = True
 
+        with self._profile.phase("fetch_results"):
+            if transfer and self.local_pool:
+                localpool.link_files(files, pull=True)
+            elif transfer:
+                for file in files:
+                    self.url.transport.queue_for_pull(file)
+                self.url.transport.transfer()
         if transfer:
-            self.url.transport.transfer()
+            self._transferred["received"] += file_sizes(f.local for f in files)
 
-        for runner in self.runners:
-            runner.read_local_files()
+        with self._profile.phase("read_local_files"):
+            for runner in self.runners:
+                runner.read_local_files()
 
         return transfer
 
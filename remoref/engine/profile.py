@@ -0,0 +1,125 @@
+import json
+import time
+from typing import Any, Dict, List, Optional, Union
+
+
+class Phase:
+    """
+    Context manager which adds its duration to a phase of a Profile
+    """
+
+    __slots__ = ["_totals", "_start"]
+
+    def __init__(self, totals: List[float]) -> None:
+        self._totals = totals
+        self._start = 0.0
+
+    def __enter__(self) -> "Phase":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        _record(self._totals, time.perf_counter() - self._start)
+
+
+def _record(totals: List[float], elapsed: float) -> None:
+    totals[0] += 1
+    totals[1] += elapsed
+    if elapsed > totals[2]:
+        totals[2] = elapsed
+
+
+class Profile:
+    """
+    Accumulated timings of the phases of a Process lifecycle
+
+    Each phase is named after the method it times, with sub-phases separated
+    by a dot. Timings are inclusive, so "run" includes the "transfer" (and
+    "stage") performed as part of it:
+
+    - stage: within which stage.template, stage.hash and stage.write time
+      script generation, hashing and file writes
+    - transfer: within which transfer.transport times the file transport
+    - run: within which run.transport launches the master (or submits to the
+      local pool), and run.acknowledge waits for the master to acknowledge
+    - read_remote_manifest: fetching a manifest summary from the remote
+    - apply_summary: parsing a summary into states and output
+    - fetch_results: transferring the result files
+    - read_local_files: loading the results
+
+    Transport phases (and read_remote_manifest, fetch_results) wait on the
+    connection, so comparing them with the rest separates time spent on ssh
+    from time spent on this machine. Only the count, total and maximum
+    duration of each phase is kept.
+    """
+
+    __slots__ = ["_phases"]
+
+    def __init__(self) -> None:
+        # name: [count, total, max]
+        self._phases: Dict[str, List[float]] = {}
+
+    def __repr__(self) -> str:
+        return f"Profile({len(self._phases)} phases)"
+
+    def __str__(self) -> str:
+        lines = [f"{'phase':<32}{'count':>8}{'total (s)':>12}{'max (s)':>12}"]
+        for name, (count, total, peak) in sorted(self._phases.items()):
+            lines.append(f"{name:<32}{int(count):>8}{total:>12.6f}{peak:>12.6f}")
+        return "\n".join(lines)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._phases
+
+    def _totals(self, name: str) -> List[float]:
+        totals = self._phases.get(name, None)
+        if totals is None:
+            totals = self._phases[name] = [0, 0.0, 0.0]
+        return totals
+
+    def phase(self, name: str) -> Phase:
+        """
+        Returns a context manager which times phase `name`
+        """
+        return Phase(self._totals(name))
+
+    def add(self, name: str, elapsed: float) -> None:
+        """
+        Add a measured duration to phase `name`
+        """
+        _record(self._totals(name), elapsed)
+
+    def total(self, name: str) -> float:
+        """
+        Returns the total time spent in phase `name`
+        """
+        return self._phases.get(name, [0, 0.0, 0.0])[1]
+
+    def reset(self) -> None:
+        self._phases = {}
+
+    def to_dict(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """
+        Returns the count, total, mean and max duration of each phase
+        """
+        output: Dict[str, Dict[str, Union[int, float]]] = {}
+        for name, (count, total, peak) in sorted(self._phases.items()):
+            output[name] = {
+                "count": int(count),
+                "total": total,
+                "mean": total / count if count else 0.0,
+                "max": peak,
+            }
+        return output
+
+    def to_json(self, path: Optional[str] = None, **kwargs: Any) -> str:
+        """
+        Export the profile as JSON, writing it to `path` if given
+
+        Extra kwargs are passed to `json.dumps`
+        """
+        content = json.dumps(self.to_dict(), **kwargs)
+        if path is not None:
+            with open(path, "w+") as o:
+                o.write(content)
+        return content
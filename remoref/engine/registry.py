@@ -0,0 +1,672 @@
+import weakref
+from array import array
+from collections import Counter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    KeysView,
+    List,
+    MutableSequence,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    overload,
+)
+
+from remoref.engine.mixins.execmixin import ExecMixin
+from remotemanager.storage.trackedfile import TrackedFile
+from remoref.engine.runner import Runner
+from remoref.engine.runnerstates import State, state_codes, state_names
+
+# TYPE_CHECKING is false at runtime, so does not cause a circular dependency
+if TYPE_CHECKING:
+    from remoref.engine.process import ProcessHandler
+
+
+class Column:
+    """
+    Append-only storage for a single call argument
+
+    Values are packed into an `array` while they are all exact ints (or
+    floats), falling back to a plain list on the first value that cannot be
+    packed.
+    """
+
+    __slots__ = ["_data"]
+
+    def __init__(self) -> None:
+        self._data: Union[MutableSequence[Any], None] = None
+
+    def __len__(self) -> int:
+        return 0 if self._data is None else len(self._data)
+
+    def __getitem__(self, idx: int) -> Any:
+        return self._data[idx]  # type: ignore
+
+    def append(self, value: Any) -> None:
+        data = self._data
+        if data is None:
+            if type(value) is int:
+                data = array("q")
+            elif type(value) is float:
+                data = array("d")
+            else:
+                data = []
+            self._data = data
+
+        if isinstance(data, array):
+            packable = {"q": int, "d": float}[data.typecode]
+            if type(value) is packable:
+                try:
+                    data.append(value)
+                    return
+                except OverflowError:
+                    pass
+            data = self._data = data.tolist()
+
+        data.append(value)
+
+
+class RunnerRegistry(Sequence[Runner]):
+    """
+    Indexed store for the Runners of a Process
+
+    Runners are stored as compact records: call args are held in per-argument
+    columns, exec args are shared between runners that were prepared together,
+    and the mutable runtime data (state, output and result) in flat lists.
+
+    Runner objects are views onto these records, created on demand when
+    accessed. They are not retained by the registry, so iterating over a large
+    sweep streams through the runners rather than holding all of them.
+
+    Lookup is O(1) by idx, uuid and short_uuid. The registry is handed out
+    directly as a read-only view, so iterating or taking the length never copies.
+
+    States are held as a columnar table of integer codes and timestamps, so
+    Process-wide queries (counts, failures, runtimes) run over flat arrays
+    without creating a Runner or State per record. Every state change is also
+    appended to a flat history log, from which the queue wait, execution time
+    and turnaround of each runner are derived.
+    """
+
+    __slots__ = [
+        "_parent",
+        "_uuids",
+        "_uuid_list",
+        "_short_uuids",
+        "_call_keys",
+        "_columns",
+        "_irregular",
+        "_exec_ids",
+        "_exec_table",
+        "_codes",
+        "_stamps",
+        "_started",
+        "_submitted",
+        "_history_idx",
+        "_history_codes",
+        "_history_stamps",
+        "_attempts",
+        "_jobs",
+        "_extras",
+        "_results",
+        "_usage",
+        "_stdout",
+        "_stderr",
+        "_output_pending",
+        "_cache",
+    ]
+
+    def __init__(self, parent: "ProcessHandler") -> None:
+        self._parent = parent
+
+        self._uuids: Dict[str, int] = {}
+        self._uuid_list: List[str] = []
+        self._short_uuids: Union[Dict[str, int], None] = None
+
+        self._call_keys: Union[Tuple[Any, ...], None] = None
+        self._columns: List[Column] = []
+        # records whose call args do not match the column layout
+        self._irregular: Dict[int, Dict[Any, Any]] = {}
+
+        self._exec_ids = array("L")
+        self._exec_table: List[Dict[Any, Any]] = [{}]
+
+        # state table, see `runnerstates.state_codes`
+        self._codes = array("b")
+        self._stamps = array("d")
+        # time each runner entered RUNNING, -1 if it has not
+        self._started = array("d")
+        # time each runner entered SUBMITTED, -1 if it has not
+        self._submitted = array("d")
+        # every state change, as parallel (idx, code, timestamp) columns
+        self._history_idx = array("L")
+        self._history_codes = array("b")
+        self._history_stamps = array("d")
+        # attempt number of each runner, incremented when it is retried
+        self._attempts = array("H")
+        # scheduler job ids (or PIDs) of each submitted runner, see `add_job`
+        self._jobs: Dict[int, List[str]] = {}
+        # extra files added to individual runners (send, recv), see `add_extra`
+        self._extras: Dict[int, Tuple[List[TrackedFile], List[TrackedFile]]] = {}
+        self._results: List[Any] = []
+        # resource usage, `len(usage_fields)` values per runner, -1 if not recorded
+        self._usage = array("d")
+        self._stdout: List[Union[str, None]] = []
+        self._stderr: List[Union[str, None]] = []
+        # runners with output on the remote that has not yet been fetched
+        self._output_pending: Set[int] = set()
+
+        self._cache: "weakref.WeakValueDictionary[int, Runner]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def __repr__(self) -> str:
+        return f"RunnerRegistry({len(self)} runners)"
+
+    def __len__(self) -> int:
+        return len(self._uuid_list)
+
+    @overload
+    def __getitem__(self, idx: int) -> Runner: ...
+
+    @overload
+    def __getitem__(self, idx: slice) -> List[Runner]: ...
+
+    def __getitem__(self, idx: Union[int, slice]) -> Union[Runner, List[Runner]]:
+        if isinstance(idx, slice):
+            return [self._materialize(i) for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("runner index out of range")
+        return self._materialize(idx)
+
+    def __iter__(self) -> Iterator[Runner]:
+        for idx in range(len(self)):
+            yield self._materialize(idx)
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, str):
+            return item in self._uuids
+        return getattr(item, "uuid", None) in self._uuids
+
+    @property
+    def next_idx(self) -> int:
+        """
+        The idx that the next added Runner will take
+        """
+        return len(self)
+
+    def add(
+        self, uuid: str, call_args: Dict[Any, Any], exec_args: Dict[Any, Any]
+    ) -> bool:
+        """
+        Register a runner record, returning False if its uuid is already present
+
+        exec_args may be shared between records and must not be modified after
+        being added. Consecutive records passing the same dict store it once.
+        """
+        if uuid in self._uuids:
+            return False
+
+        idx = len(self)
+        self._uuids[uuid] = idx
+        self._uuid_list.append(uuid)
+        if self._short_uuids is not None:
+            # in the event of a short_uuid collision, the first runner keeps the key
+            self._short_uuids.setdefault(uuid[:8], idx)
+
+        keys = tuple(call_args)
+        if self._call_keys is None:
+            self._call_keys = keys
+            self._columns = [Column() for _ in keys]
+        if keys == self._call_keys:
+            for column, value in zip(self._columns, call_args.values()):
+                column.append(value)
+        else:
+            for column in self._columns:
+                column.append(None)
+            self._irregular[idx] = call_args
+
+        if len(exec_args) == 0:
+            self._exec_ids.append(0)
+        else:
+            if exec_args is not self._exec_table[-1]:
+                self._exec_table.append(exec_args)
+            self._exec_ids.append(len(self._exec_table) - 1)
+
+        self._codes.append(0)
+        self._stamps.append(ExecMixin._state.timestamp)
+        self._started.append(-1)
+        self._submitted.append(-1)
+        self._attempts.append(1)
+        self._results.append(None)
+        self._usage.extend(_no_usage)
+        self._stdout.append(None)
+        self._stderr.append(None)
+
+        return True
+
+    def find(self, uuid: str) -> Union[int, None]:
+        """
+        Returns the idx of the runner with uuid or short_uuid, None if not present
+        """
+        idx = self._uuids.get(uuid, None)
+        if idx is not None:
+            return idx
+
+        if self._short_uuids is None:
+            self._short_uuids = {}
+            for i, u in enumerate(self._uuid_list):
+                self._short_uuids.setdefault(u[:8], i)
+        return self._short_uuids.get(uuid, None)
+
+    def get(self, uuid: str) -> Union[Runner, None]:
+        """
+        Find a Runner by uuid or short_uuid, returning None if not present
+        """
+        idx = self.find(uuid)
+        if idx is None:
+            return None
+        return self._materialize(idx)
+
+    def uuids(self) -> KeysView[str]:
+        """
+        Returns a view of the uuids of all runners, in idx order
+        """
+        return self._uuids.keys()
+
+    def call_args(self, idx: int) -> Dict[Any, Any]:
+        """
+        Rebuild the call args of runner `idx` from the stored columns
+        """
+        irregular = self._irregular.get(idx, None)
+        if irregular is not None:
+            return irregular
+        if self._call_keys is None:
+            return {}
+        return {k: c[idx] for k, c in zip(self._call_keys, self._columns)}
+
+    def exec_args(self, idx: int) -> Dict[Any, Any]:
+        """
+        Returns the (shared) runner level exec args for runner `idx`
+        """
+        return self._exec_table[self._exec_ids[idx]]
+
+    def _materialize(self, idx: int) -> Runner:
+        runner = self._cache.get(idx, None)
+        if runner is not None:
+            return runner
+
+        runner = Runner(
+            idx=idx,
+            parent=self._parent,
+            uuid=self._uuid_list[idx],
+            exec_arguments=self.exec_args(idx),
+        )
+        self._cache[idx] = runner
+        return runner
+
+    def chunks(self, size: int = 1024, start: int = 0) -> Iterator[List[Runner]]:
+        """
+        Stream the runners from idx `start` onwards in lists of at most `size`
+        """
+        for i in range(start, len(self), size):
+            yield self[i : i + size]
+
+    @property
+    def materialized(self) -> int:
+        """
+        Number of Runner objects currently alive
+        """
+        return len(self._cache)
+
+    # vectorised queries over the state table
+
+    def state_counts(self) -> Dict[str, int]:
+        """
+        Returns the number of runners in each state, omitting empty states
+        """
+        return {state_names[c]: n for c, n in sorted(Counter(self._codes).items())}
+
+    def where(self, state: Union[str, State]) -> List[int]:
+        """
+        Returns the idx of every runner currently in `state`
+        """
+        code = _code(state)
+        table = self._codes.tobytes()
+        target = array("b", [code]).tobytes()
+
+        found = []
+        idx = table.find(target)
+        while idx != -1:
+            found.append(idx)
+            idx = table.find(target, idx + 1)
+        return found
+
+    def finished(self) -> List[bool]:
+        """
+        Returns a list of whether each runner has finished, by idx
+        """
+        return [code >= _completed for code in self._codes]
+
+    def all_at_least(self, state: Union[str, State]) -> bool:
+        """
+        True if every runner has reached `state` (vacuously True if empty)
+        """
+        return len(self) == 0 or min(self._codes) >= _code(state)
+
+    def any_at_least(self, state: Union[str, State]) -> bool:
+        """
+        True if any runner has reached `state`
+        """
+        return len(self) > 0 and max(self._codes) >= _code(state)
+
+    def runtimes(self) -> List[float]:
+        """
+        Returns the RUNNING to COMPLETED/FAILED duration of each finished runner
+
+        Runners which were never seen RUNNING, or were cancelled, are omitted
+        """
+        return [
+            end - start
+            for code, start, end in zip(self._codes, self._started, self._stamps)
+            if _completed <= code < _cancelled and start >= 0
+        ]
+
+    def overrunning(self, limit: float, now: float) -> List[int]:
+        """
+        Returns the idx of runners which have been RUNNING for over `limit` seconds
+        """
+        return [
+            idx
+            for idx, (code, start) in enumerate(zip(self._codes, self._started))
+            if code == _running and now - start > limit
+        ]
+
+    def runtime_percentiles(
+        self, *percentiles: Union[int, float]
+    ) -> Dict[Union[int, float], Union[float, None]]:
+        """
+        Returns the requested percentiles (0-100) of the finished runtimes
+
+        Percentiles are linearly interpolated, None if nothing has finished
+        """
+        times = sorted(self.runtimes())
+        return {q: _percentile(times, q) for q in percentiles}
+
+    def timings(self) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        Returns the (submission time, duration) pairs of each timing metric
+
+        - queue_wait: SUBMITTED to RUNNING
+        - execution: RUNNING to COMPLETED/FAILED
+        - turnaround: SUBMITTED to COMPLETED/FAILED
+
+        A runner is omitted from a metric if it has not reached either end, or
+        was cancelled. The times used are those of the latest entry into each
+        state, so a rerun runner contributes its most recent attempt
+        """
+        output: Dict[str, List[Tuple[float, float]]] = {
+            name: [] for name in timing_metrics
+        }
+        queue_wait, execution, turnaround = output.values()
+        for code, submitted, started, end in zip(
+            self._codes, self._submitted, self._started, self._stamps
+        ):
+            if code == _cancelled:
+                continue
+            finished = code >= _completed
+            if submitted >= 0:
+                if started >= submitted:
+                    queue_wait.append((submitted, started - submitted))
+                if finished:
+                    turnaround.append((submitted, end - submitted))
+            if finished and started >= 0:
+                execution.append((submitted, end - started))
+        return output
+
+    def timing_percentiles(
+        self, *percentiles: Union[int, float]
+    ) -> Dict[str, Dict[Union[int, float], Union[float, None]]]:
+        """
+        Returns the requested percentiles (0-100) of each metric of `timings`
+        """
+        output = {}
+        for name, pairs in self.timings().items():
+            values = sorted(duration for _, duration in pairs)
+            output[name] = {q: _percentile(values, q) for q in percentiles}
+        return output
+
+    def timeline(
+        self, interval: Union[int, float], percentile: Union[int, float] = 50
+    ) -> List[Dict[str, Union[float, int, None]]]:
+        """
+        Returns the `timings` metrics binned by submission time
+
+        Each bin covers `interval` seconds from the first submission, and holds
+        its start time, the number of runners submitted within it, and the
+        given percentile of each metric over those runners (None if empty)
+        """
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval}")
+        timings = self.timings()
+        submitted = [t for t in self._submitted if t >= 0]
+        if len(submitted) == 0:
+            return []
+        first = min(submitted)
+        nbins = int((max(submitted) - first) // interval) + 1
+
+        def binned(pairs: List[Tuple[float, float]]) -> List[List[float]]:
+            bins: List[List[float]] = [[] for _ in range(nbins)]
+            for start, value in pairs:
+                if start >= 0:
+                    bins[int((start - first) // interval)].append(value)
+            return bins
+
+        counts = [0] * nbins
+        for start in submitted:
+            counts[int((start - first) // interval)] += 1
+        metrics = {name: binned(pairs) for name, pairs in timings.items()}
+
+        output: List[Dict[str, Union[float, int, None]]] = []
+        for i in range(nbins):
+            row: Dict[str, Union[float, int, None]] = {
+                "start": first + i * interval,
+                "submitted": counts[i],
+            }
+            for name, bins in metrics.items():
+                row[name] = _percentile(sorted(bins[i]), percentile)
+            output.append(row)
+        return output
+
+    def usage(self, field: str) -> List[float]:
+        """
+        Returns the recorded value of a `usage_fields` field for each runner
+
+        "cpu" may also be given, the sum of "utime" and "stime". Runners without
+        a record are omitted
+        """
+        stride = len(usage_fields)
+        if field == "cpu":
+            utime = self._usage[_utime::stride]
+            stime = self._usage[_stime::stride]
+            return [u + s for u, s in zip(utime, stime) if u >= 0 and s >= 0]
+
+        values = self._usage[usage_fields.index(field) :: stride]
+        return [value for value in values if value >= 0]
+
+    def usage_percentiles(
+        self, field: str, *percentiles: Union[int, float]
+    ) -> Dict[Union[int, float], Union[float, None]]:
+        """
+        Returns the requested percentiles (0-100) of a usage field, see `usage`
+        """
+        values = sorted(self.usage(field))
+        return {q: _percentile(values, q) for q in percentiles}
+
+    # storage for the mutable runner data, accessed by the Runner views
+
+    def get_state(self, idx: int) -> State:
+        return State(state_names[self._codes[idx]], self._stamps[idx])
+
+    def set_state(self, idx: int, state: State) -> None:
+        code = state.code
+        stamp = state.timestamp
+        if code == self._codes[idx] and stamp <= self._stamps[idx]:
+            return  # a repeated (or replayed) record of the current state
+        self._history_idx.append(idx)
+        self._history_codes.append(code)
+        self._history_stamps.append(stamp)
+        self._codes[idx] = code
+        self._stamps[idx] = stamp
+        if code == _running:
+            self._started[idx] = stamp
+        elif code == _submitted:
+            self._submitted[idx] = stamp
+
+    def history(self, idx: int) -> List[State]:
+        """
+        Returns every state runner `idx` has passed through, in order
+        """
+        target = array("L", [idx]).tobytes()
+        table = self._history_idx.tobytes()
+        size = self._history_idx.itemsize
+
+        output = []
+        pos = table.find(target)
+        while pos != -1:
+            if pos % size == 0:
+                i = pos // size
+                output.append(
+                    State(
+                        state_names[self._history_codes[i]], self._history_stamps[i]
+                    )
+                )
+            pos = table.find(target, pos + 1)
+        return output
+
+    def get_started(self, idx: int) -> float:
+        return self._started[idx]
+
+    def restore_stamps(self, idx: int, submitted: float, started: float) -> None:
+        """
+        Set the times runner `idx` last entered SUBMITTED and RUNNING, which
+        are otherwise only recorded by `set_state`
+        """
+        self._submitted[idx] = submitted
+        self._started[idx] = started
+
+    def get_attempt(self, idx: int) -> int:
+        return self._attempts[idx]
+
+    def set_attempt(self, idx: int, attempt: int) -> None:
+        self._attempts[idx] = attempt
+
+    def get_jobs(self, idx: int) -> List[str]:
+        return self._jobs.get(idx, [])
+
+    def add_job(self, idx: int, job: str) -> None:
+        """
+        Record a job id of runner `idx`, a runner has more than one if copied
+        """
+        jobs = self._jobs.setdefault(idx, [])
+        if job not in jobs:
+            jobs.append(job)
+
+    def clear_jobs(self, idx: int) -> None:
+        self._jobs.pop(idx, None)
+
+    def get_extras(self, idx: int) -> Tuple[List[TrackedFile], List[TrackedFile]]:
+        return self._extras.get(idx, ([], []))
+
+    def add_extra(self, idx: int, file: TrackedFile, send: bool) -> None:
+        """
+        Record an extra file added to runner `idx`, so that it outlives the view
+        """
+        extra_send, extra_recv = self._extras.setdefault(idx, ([], []))
+        if send:
+            extra_send.append(file)
+        else:
+            extra_recv.append(file)
+
+    def get_result(self, idx: int) -> Any:
+        return self._results[idx]
+
+    def set_result(self, idx: int, result: Any) -> None:
+        self._results[idx] = result
+
+    def get_usage(self, idx: int) -> Union[Dict[str, float], None]:
+        start = idx * len(usage_fields)
+        values = self._usage[start : start + len(usage_fields)]
+        if values[0] < 0:
+            return None
+        return {k: v for k, v in zip(usage_fields, values) if v >= 0}
+
+    def set_usage(self, idx: int, usage: Dict[str, float]) -> None:
+        start = idx * len(usage_fields)
+        for offset, field in enumerate(usage_fields):
+            self._usage[start + offset] = float(usage.get(field, -1))
+
+    def get_stdout(self, idx: int) -> Union[str, None]:
+        return self._stdout[idx]
+
+    def set_stdout(self, idx: int, stdout: Union[str, None]) -> None:
+        self._output_pending.discard(idx)
+        self._stdout[idx] = stdout
+
+    def get_stderr(self, idx: int) -> Union[str, None]:
+        return self._stderr[idx]
+
+    def set_stderr(self, idx: int, stderr: Union[str, None]) -> None:
+        self._output_pending.discard(idx)
+        self._stderr[idx] = stderr
+
+    def mark_output(self, idx: int) -> None:
+        """
+        Flag runner `idx` as having new output available on the remote
+        """
+        self._output_pending.add(idx)
+
+    def output_pending(self, idx: int) -> bool:
+        return idx in self._output_pending
+
+
+_submitted = state_codes["SUBMITTED"]
+_running = state_codes["RUNNING"]
+_completed = state_codes["COMPLETED"]
+_cancelled = state_codes["CANCELLED"]
+
+# metrics returned by `RunnerRegistry.timings`
+timing_metrics = ("queue_wait", "execution", "turnaround")
+
+# fields of the resource usage recorded by `repo.Usage`
+usage_fields = ("wall", "utime", "stime", "maxrss")
+_no_usage = array("d", [-1.0] * len(usage_fields))
+_utime = usage_fields.index("utime")
+_stime = usage_fields.index("stime")
+
+
+def _code(state: Union[str, State]) -> int:
+    if isinstance(state, State):
+        return state.code
+    return state_codes[state.upper()]
+
+
+def _percentile(values: List[float], q: Union[int, float]) -> Union[float, None]:
+    """
+    Linearly interpolated percentile `q` of the sorted list `values`
+    """
+    if not 0 <= q <= 100:
+        raise ValueError(f"percentile must be within [0, 100], got {q}")
+    if len(values) == 0:
+        return None
+
+    pos = (len(values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (pos - lower)
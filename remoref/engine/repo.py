@@ -2,15 +2,35 @@
 This repository is the master file that handles runtime on the remote machine.
 
 It should stand by itself and have minimal dependencies to maximise transferability.
+Every runner interpreter imports it, so modules which are only needed off the
+submission path (such as `datetime` for parsing, `traceback` for failures) are
+imported where they are used.
 """
 
-import datetime
+import atexit
 import json
+import os
 import sys
-from typing import Dict, Iterable, List, Tuple, Union
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple, Union
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore
 
-date_format = "%Y-%m-%d %H:%M:%S"
+if TYPE_CHECKING:
+    import datetime
+
+
+# timestamps are written to the microsecond, older manifests to the second
+seconds_format = "%Y-%m-%d %H:%M:%S"
+date_format = f"{seconds_format}.%f"
+# the equivalent format for the `date` command
+bash_date_format = f"{seconds_format}.%6N"
+# kinds of manifest record, see `Manifest.log`
+log_modes = ("state", "stdout", "stderr", "usage", "attempt", "job")
 
 
 def generate_log_str(
@@ -25,14 +45,133 @@ def generate_log_str(
     if time is not None:
         timestr = time
     else:
-        timestr = f"$(date -u +'{date_format}')"
+        timestr = f"$(date -u +'{bash_date_format}')"
+
+    # leading whitespace is kept, as it is for output redirected by bash
+    return f"{timestr} [{uuid}] [{mode}] {string.rstrip()}"
+
+
+class ManifestWriter:
+    """
+    Buffered append-only writer for the manifest
+
+    The file handle is held open in O_APPEND mode and records are grouped in
+    memory. Each flush issues a single `os.write` of whole lines, so concurrent
+    writers appending to the same manifest can never tear a record.
+
+    The buffer is flushed when requested (state transitions), once `interval`
+    seconds have elapsed, when it grows past `max_buffer` bytes, and at exit.
+
+    Args:
+        path:
+            path to the manifest file
+        interval:
+            maximum time in seconds a record may sit in the buffer
+        max_buffer:
+            buffer size in bytes which triggers a flush
+    """
+
+    def __init__(self, path: str, interval: float = 1.0, max_buffer: int = 65536):
+        self.path = path
+        self.interval = interval
+        self.max_buffer = max_buffer
+
+        self._fd: Union[int, None] = None
+        self._buffer: List[str] = []
+        self._size = 0
+        self._last_flush = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Union[threading.Thread, None] = None
+
+        atexit.register(self.close)
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of records waiting in the buffer
+        """
+        return len(self._buffer)
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _start_timer(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.wait(self.interval):
+            self.flush()
+
+    def write(self, record: str, flush: bool = False) -> None:
+        """
+        Add a record to the buffer, flushing if required
+
+        Args:
+            record:
+                line to write, a newline is appended if missing
+            flush:
+                force a flush after adding this record
+        """
+        if not record.endswith("\n"):
+            record += "\n"
+
+        with self._lock:
+            self._buffer.append(record)
+            self._size += len(record)
+
+            due = time.monotonic() - self._last_flush >= self.interval
+            if flush or due or self._size >= self.max_buffer:
+                self._flush()
+            else:
+                self._start_timer()
 
-    return f"{timestr} [{uuid}] [{mode}] {string.strip()}"
+    def flush(self) -> None:
+        """
+        Write any buffered records to the manifest
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if len(self._buffer) == 0:
+            return
+
+        data = "".join(self._buffer).encode("utf8")
+        self._buffer = []
+        self._size = 0
+
+        fd = self._open()
+        # a single write on an O_APPEND handle is placed atomically at the end
+        # of the file. Only retry if the OS reports a short write
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+
+    def close(self) -> None:
+        """
+        Flush and release the file handle
+        """
+        self._closed.set()
+        with self._lock:
+            self._flush()
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
 
 
 class Manifest:
     """
     Handler for manifest related activities
+
+    Logging is buffered through a ManifestWriter, see `flush_interval`
     """
 
     def __init__(
@@ -40,6 +179,7 @@ class Manifest:
         manifest_path: Union[str, None] = None,
         content: Union[str, None] = None,
         uuid: Union[str, None] = None,
+        flush_interval: float = 1.0,
     ):
         if manifest_path is None and content is None:
             raise ValueError("Either manifest_path or content must be provided")
@@ -49,6 +189,9 @@ class Manifest:
 
         self.uuid = uuid or "FFFFFFFF"
 
+        self.flush_interval = flush_interval
+        self._writer: Union[ManifestWriter, None] = None
+
     @property
     def content(self) -> str:
         if self._content is not None:
@@ -63,45 +206,77 @@ class Manifest:
             "Content read error, either manifest_path is missing or content is mangled"
         )
 
-    def dtnow(self) -> datetime.datetime:
+    def dtnow(self) -> "datetime.datetime":
         """
         Get the current UTC time in datetime format
         """
+        import datetime
+
         return datetime.datetime.now(datetime.timezone.utc)
 
     def now(self) -> str:
         """
         Get the current UTC time in the correct string format
         """
-        return datetime.datetime.strftime(self.dtnow(), date_format)
+        # equivalent to formatting dtnow() with date_format, without datetime
+        stamp = time.time()
+        seconds = int(stamp)
+        micro = int((stamp - seconds) * 1e6)
+        return f"{time.strftime(seconds_format, time.gmtime(seconds))}.{micro:06d}"
 
-    def to_timestamp(self, timestring: str) -> int:
+    def to_timestamp(self, timestring: str) -> float:
         """
         Convert a time string to timestamp
+
+        Time strings without a fractional part (from older manifests, or a
+        `date` without %N support) are read to the second
         """
-        dt = datetime.datetime.strptime(timestring, date_format)
+        import datetime
+
+        timestring, _, fraction = timestring.partition(".")
+        dt = datetime.datetime.strptime(timestring, seconds_format)
         if dt.tzinfo is None:
             dt = dt.replace(tzinfo=datetime.timezone.utc)
 
-        return int(dt.timestamp())
+        timestamp = dt.timestamp()
+        if fraction.isdigit():
+            timestamp += int(fraction) / 10 ** len(fraction)
+        return timestamp
+
+    @property
+    def writer(self) -> Union[ManifestWriter, None]:
+        """
+        Lazily created buffered writer, None if there is no manifest_path
+        """
+        if self._writer is None and self.manifest_path is not None:
+            self._writer = ManifestWriter(
+                self.manifest_path, interval=self.flush_interval
+            )
+        return self._writer
 
     def log(self, string: str, mode: str = "state"):
         """
         Log a state to the manifest
+
+        State records are flushed immediately, output records are buffered
         """
-        if self.manifest_path is None:
+        if self.writer is None:
             return  # can't log to a file if no manifest path is set
 
-        if mode not in ["state", "stdout", "stderr"]:
-            raise ValueError("Invalid mode. Must be 'state', 'stdout', or 'stderr'")
+        if mode not in log_modes:
+            raise ValueError(f"Invalid mode. Must be one of {log_modes}")
 
-        with open(self.manifest_path, "a+") as o:
-            o.write(
-                generate_log_str(
-                    time=self.now(), uuid=self.uuid, string=string, mode=mode
-                )
-                + "\n"
-            )
+        self.writer.write(
+            generate_log_str(time=self.now(), uuid=self.uuid, string=string, mode=mode),
+            flush=mode == "state",
+        )
+
+    def flush(self) -> None:
+        """
+        Flush any buffered records to the manifest
+        """
+        if self._writer is not None:
+            self._writer.flush()
 
     @property
     def data(self) -> Dict[str, List[str]]:
@@ -117,15 +292,16 @@ class Manifest:
         Returns:
             List[str]: list of log entries
         """
-        log: Dict[str, List[str]] = {"state": [], "stdout": [], "stderr": []}
+        log: Dict[str, List[str]] = {mode: [] for mode in log_modes}
+        tag = f"[{self.uuid}] ["
         for line in self.content.split("\n"):
-            if f"[{self.uuid}]" in line:
-                if "stdout" in line:
-                    log["stdout"].append(line.strip())
-                elif "stderr" in line:
-                    log["stderr"].append(line.strip())
-                else:
-                    log["state"].append(line.strip())
+            # "<time> [<uuid>] [<mode>] <text>", classified by the mode token
+            _, sep, rest = line.partition(tag)
+            if not sep:
+                continue
+            mode = rest.partition("]")[0]
+            if mode in log:
+                log[mode].append(line.strip())
         return log
 
     @property
@@ -139,10 +315,10 @@ class Manifest:
         return output
 
     @property
-    def states(self) -> Iterable[Tuple[int, str]]:
+    def states(self) -> Iterable[Tuple[float, str]]:
         data = self.data["state"]
 
-        times: List[int] = []
+        times: List[float] = []
         states: List[str] = []
         for line in data:
             ts, state = line.split("[state]")
@@ -169,6 +345,68 @@ class Manifest:
         return "\n".join(cache)
 
 
+class Usage:
+    """
+    Measures the wall time and resources used until `stop()` is called
+
+    CPU times are the deltas for this process and its children. `maxrss` is the
+    peak resident set size (in bytes) of either, which for a reused process
+    (such as a pool worker) may predate the measurement. Only the wall time is
+    available where the `resource` module is not.
+    """
+
+    def __init__(self):
+        self._wall = time.perf_counter()
+        self._start = self.rusage()
+        self._usage: Union[Dict[str, float], None] = None
+
+    @staticmethod
+    def rusage() -> Union[List["resource.struct_rusage"], None]:
+        if resource is None:
+            return None
+        return [
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+        ]
+
+    def stop(self) -> Dict[str, float]:
+        """
+        End the measurement, further calls return the same usage
+        """
+        if self._usage is not None:
+            return self._usage
+
+        usage = {"wall": time.perf_counter() - self._wall}
+        end = self.rusage()
+        if self._start is not None and end is not None:
+            pairs = list(zip(self._start, end))
+            usage["utime"] = sum(e.ru_utime - s.ru_utime for s, e in pairs)
+            usage["stime"] = sum(e.ru_stime - s.ru_stime for s, e in pairs)
+            # linux reports kilobytes, macOS bytes
+            scale = 1 if sys.platform == "darwin" else 1024
+            usage["maxrss"] = max(e.ru_maxrss for e in end) * scale
+
+        self._usage = usage
+        return usage
+
+    @property
+    def record(self) -> str:
+        """
+        The usage as a manifest record
+        """
+        return json.dumps(self.stop(), separators=(",", ":"))
+
+
+class RunnerTimeoutError(Exception):
+    """
+    Raised within the function once it exceeds its `runner_timeout`
+    """
+
+
+# seconds after a timeout that a function which ignores it is stopped forcibly
+timeout_grace = 5
+
+
 class Controller:
     """
     Main runtime controller
@@ -179,10 +417,23 @@ class Controller:
         uuid: str,
         runner_name: Union[str, None] = None,
         process_name: Union[str, None] = None,
+        speculative: bool = False,
+        copy: bool = False,
+        timeout: Union[float, None] = None,
     ):
         self.uuid = uuid
         self.process_name = process_name
         self.runner_name = runner_name
+        # a speculative runner may race a copy of itself, and only the first to
+        # finish records its outcome, see `claim`
+        self.speculative = speculative or copy
+        self.copy = copy
+        self._claiming = False
+        # wall time limit of the function in seconds, see `set_alarm`
+        self.timeout = timeout
+        # the SIGALRM handler to restore, boxed as it may itself be None
+        self._alarm: Union[Tuple[Any], None] = None
+        self._done = False
 
         manifest_path = (
             f"{self.process_name}-manifest.txt" if process_name is not None else None
@@ -196,42 +447,195 @@ class Controller:
         """
         return f"{self.process_name}-data.py"
 
+    @property
+    def claim_path(self) -> str:
+        """
+        Path to the file created by the first copy of a runner to finish
+        """
+        return f"{self.runner_name}-claim"
+
+    def claim(self) -> bool:
+        """
+        Claim the outcome of this runner, False if another copy already has
+        """
+        if not self.speculative:
+            return True
+        self._claiming = True
+        try:
+            os.close(os.open(self.claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return False
+        return True
+
+    def watch_claim(self, interval: float = 0.5) -> None:
+        """
+        Exit as soon as another copy of this runner claims its outcome
+
+        The check runs in a daemon thread, so that a losing copy frees its slot
+        without waiting for the function to finish
+        """
+
+        def watch() -> None:
+            while not self._claiming:
+                # the claim is only ours if it was being made before it existed
+                if os.path.exists(self.claim_path) and not self._claiming:
+                    os._exit(0)
+                time.sleep(interval)
+
+        threading.Thread(target=watch, daemon=True).start()
+
+    @property
+    def timeout_message(self) -> str:
+        return f"runner exceeded its runner_timeout of {self.timeout:g} seconds"
+
+    def set_alarm(self) -> None:
+        """
+        Raise a RunnerTimeoutError within the function once `timeout` has passed
+
+        Signals are only delivered to the main thread, and not at all on Windows
+        """
+        if self.timeout is None:
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        import signal
+
+        if not hasattr(signal, "setitimer"):
+            return
+
+        def expire(signum: int, frame: Any) -> None:
+            raise RunnerTimeoutError(self.timeout_message)
+
+        self._alarm = (signal.signal(signal.SIGALRM, expire),)
+        signal.setitimer(signal.ITIMER_REAL, self.timeout)
+
+    def clear_alarm(self) -> None:
+        """
+        Disarm the alarm of `set_alarm`, once the function has returned
+        """
+        self._done = True
+        if self._alarm is None:
+            return
+        import signal
+
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._alarm[0])
+        self._alarm = None
+
+    def watch_timeout(self) -> None:
+        """
+        Fail the runner and exit, if the function is still running
+        `timeout_grace` seconds after its timeout
+
+        The alarm can not interrupt a function blocked outside the interpreter,
+        this frees the slot regardless
+        """
+        if self.timeout is None:
+            return
+        timeout = self.timeout
+
+        def watch() -> None:
+            time.sleep(timeout + timeout_grace)
+            if self._done:
+                return
+            if not self.claim():
+                os._exit(0)
+            self.manifest.log(
+                f"RunnerTimeoutError: {self.timeout_message}, and was stopped",
+                mode="stderr",
+            )
+            self.manifest.log("failed")
+            os._exit(1)
+
+        threading.Thread(target=watch, daemon=True).start()
+
     def submit(self, function_name: str, uuid: str):
         """
         Submit a job
         """
-        self.manifest.log("running")
+        if not self.copy:
+            self.manifest.log("running")
         fn = getattr(sys.modules[__name__], function_name)
         call_args = json.loads(runner_data.get(uuid, {}))  # type: ignore
 
+        # the final state is only logged once its outputs are in place, so that
+        # a poll which sees it can immediately collect the result or traceback
+        usage = Usage()
+        # the outcome may only be claimed once, a copy which has claimed it
+        # must still record a failure to write its result
+        claimed = False
+        self.set_alarm()
         try:
-            result = fn(**call_args)
+            try:
+                result = fn(**call_args)
+            finally:
+                # also reached when the runner is stopped by a BaseException,
+                # so that a reused (pool) process is left without the alarm
+                self.clear_alarm()
+                usage.stop()
+            if not self.claim():
+                return  # another copy finished first
+            claimed = True
+
+            resultfile = f"{self.runner_name}-result.json"
+            with open(f"{resultfile}.tmp", "w+") as o:
+                json.dump(result, o)
+            os.replace(f"{resultfile}.tmp", resultfile)
         except Exception as ex:
+            if not claimed and not self.claim():
+                return
+            import traceback
+
+            for line in traceback.format_exc().splitlines():
+                self.manifest.log(line, mode="stderr")
+            self.manifest.log(usage.record, mode="usage")
             self.manifest.log("failed")
             raise ex
-        else:
-            self.manifest.log("completed")
 
-        try:
-            with open(f"{self.runner_name}-result.json", "w+") as o:
-                json.dump(result, o)
-        except Exception as ex:
-            self.manifest.log("serialisation error")
-            raise ex
+        self.manifest.log(usage.record, mode="usage")
+        self.manifest.log("completed")
 
 
 runner_data = {}  # placeholder runner_data. To be added in submission
 
 
-if __name__ == "__main__":
+def launch(argv: List[str]) -> None:
+    """
+    Run a single runner, called with (uuid, process_name, runner_name,
+    function_name) by the launcher, or when this file is run as a script
+
+    A further "speculative" argument marks a runner which may be raced by a
+    copy of itself, and "copy" marks that copy. "timeout=<seconds>" limits the
+    wall time of the function
+    """
     try:
-        uuid = sys.argv[1]
-        process_name = sys.argv[2]
-        runner_name = sys.argv[3]
-        function_name = sys.argv[4]
-    except IndexError:
+        uuid, process_name, runner_name, function_name = argv[:4]
+    except ValueError:
         raise ValueError("Repo must be called with uuid and process_name")
 
-    c = Controller(uuid=uuid, runner_name=runner_name, process_name=process_name)
+    flags = argv[4:]
+    timeout = None
+    for flag in flags:
+        if flag.startswith("timeout="):
+            timeout = float(flag.partition("=")[2])
+
+    c = Controller(
+        uuid=uuid,
+        runner_name=runner_name,
+        process_name=process_name,
+        speculative="speculative" in flags,
+        copy="copy" in flags,
+        timeout=timeout,
+    )
+    if c.speculative:
+        c.watch_claim()
+    c.watch_timeout()
+
+    try:
+        c.submit(function_name, uuid)
+    except Exception:
+        sys.exit(1)  # the traceback has already been logged to the manifest
+
 
-    c.submit(function_name, uuid)
+if __name__ == "__main__":
+    launch(sys.argv[1:])
@@ -0,0 +1,77 @@
+import re
+from typing import Iterable, Optional, Pattern, Union
+
+
+class RetryPolicy:
+    """
+    Decides whether, and when, a failed runner is resubmitted
+
+    A runner which fails is retried until it has made `max_attempts` attempts,
+    waiting `backoff * factor ** (attempt - 1)` seconds (at most `max_backoff`)
+    after each failure. If `patterns` are given, only failures whose stderr
+    matches one of them (by `re.search`) are retried, so that transient errors
+    (such as a node failure) are retried and genuine errors are not.
+
+    Args:
+        max_attempts:
+            total number of attempts, including the first
+        backoff:
+            delay in seconds before the first retry
+        factor:
+            multiplier applied to the delay for each further retry
+        max_backoff:
+            upper limit on the delay, if any
+        patterns:
+            regular expressions of the stderr to retry on, all failures if None
+    """
+
+    __slots__ = ["max_attempts", "backoff", "factor", "max_backoff", "patterns"]
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff: Union[int, float] = 0,
+        factor: Union[int, float] = 2,
+        max_backoff: Optional[Union[int, float]] = None,
+        patterns: Optional[Iterable[Union[str, Pattern[str]]]] = None,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        if backoff < 0:
+            raise ValueError(f"backoff can not be negative, got {backoff}")
+
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.factor = factor
+        self.max_backoff = max_backoff
+        self.patterns = None
+        if patterns is not None:
+            self.patterns = [re.compile(pattern) for pattern in patterns]
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryPolicy(max_attempts={self.max_attempts}, backoff={self.backoff})"
+        )
+
+    def delay(self, attempt: int) -> float:
+        """
+        Returns the time to wait after attempt number `attempt` failed
+        """
+        delay = self.backoff * self.factor ** (attempt - 1)
+        if self.max_backoff is not None:
+            delay = min(delay, self.max_backoff)
+        return delay
+
+    def matches(self, stderr: Union[str, None]) -> bool:
+        """
+        True if a failure with `stderr` is one that should be retried
+        """
+        if self.patterns is None:
+            return True
+        return any(pattern.search(stderr or "") for pattern in self.patterns)
+
+    def should_retry(self, attempt: int, stderr: Union[str, None]) -> bool:
+        """
+        True if a runner which failed on attempt number `attempt` may be retried
+        """
+        return attempt < self.max_attempts and self.matches(stderr)
@@ -1,15 +1,32 @@
+import functools
 import json
 import os
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 from remoref.engine.mixins.execmixin import ExecMixin
 from remoref.engine.mixins.filehandler import ExtraFilesMixin, FileHandlerBaseClass
-from remoref.engine.runnerstates import State
+from remoref.engine.runnerstates import (
+    COMPLETED,
+    RUNNING,
+    STAGED,
+    TRANSFERRED,
+    State,
+)
 from remotemanager import Computer
 from remotemanager.storage.trackedfile import TrackedFile
-from remotemanager.utils.uuid import UUIDMixin
-from remotemanager.utils.verbosity import VerboseMixin, Verbosity
+from remotemanager.utils.verbosity import Verbosity
 
 import remoref.engine.repo as repo
 
@@ -18,59 +35,174 @@ if TYPE_CHECKING:
     from remoref.engine.process import ProcessHandler
 
 
+# shared default for runners without temporary exec args, never modified
+_empty: Dict[Any, Any] = {}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _profiled(phase: str) -> Callable[[F], F]:
+    """
+    Times a Runner method as `phase` of the profile of its Process
+    """
+
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(self: "Runner", *args: Any, **kwargs: Any) -> Any:
+            with self.parent.profile.phase(phase):
+                return method(self, *args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+# file mtimes are taken from a coarse kernel clock, which may trail time.time()
+mtime_resolution = 0.01
+# added to the short uuid of a runner to tag the submission of its copy
+copy_suffix = "-copy"
+# submitters which run the jobscript directly, rather than queueing it
+shells = {"bash", "sh", "zsh", "dash", "ksh"}
+# commands which cancel a queued job, by the submitter that queued it. The job
+# id is the first number in the output of each of these submitters, see
+# `generate_submit_fn`
+cancel_commands = {"sbatch": "scancel", "qsub": "qdel", "bsub": "bkill"}
+
+
 class RunnerFileHandler(FileHandlerBaseClass):
     """
     Extends the filehandler to contain Process related files
     """
 
+    __slots__ = ["jobscript", "result", "copy", "claim"]
+
+    # identical for every runner, so shared rather than rebuilt per instance
+    _runner_files: Dict[str, Union[None, bool]] = {
+        "jobscript": True,
+        "result": False,
+        "copy": None,
+        "claim": None,
+    }
+
     def __init__(
         self,
         jobscript: TrackedFile,
         result: TrackedFile,
+        copy: TrackedFile,
+        claim: TrackedFile,
     ):
         super().__init__()
 
         self.jobscript = jobscript
         self.result = result
+        # jobscript of a speculative copy, and the claim of the first to finish
+        self.copy = copy
+        self.claim = claim
+
+        self._files = self._runner_files
 
-        self._files = {"jobscript": True, "result": False}
 
+class Runner(ExecMixin, ExtraFilesMixin):
+    """
+    A single call of the Process function
+
+    Runners are views onto a record held by the parent's RunnerRegistry, which
+    creates them on demand. State, output and result are stored in the registry
+    so that a Runner can be dropped and recreated at any time.
+
+    Runners are slotted to keep them small, and so do not use the UUIDMixin and
+    VerboseMixin. Verbosity is deferred to the parent Process.
+    """
+
+    __slots__ = [
+        "_idx",
+        "_parent",
+        "_registry",
+        "_uuid",
+        "_files",
+        "_exec_args",
+        "_temp_exec_args",
+        "__weakref__",
+    ]
 
-class Runner(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
     def __init__(
         self,
         idx: int,
         parent: "ProcessHandler",
-        call_arguments: Dict[Any, Any],
+        uuid: str,
         exec_arguments: Dict[Any, Any],
     ):
         self._idx = idx
         self._parent = parent
+        self._registry = parent.runners
+        self._uuid = uuid
+        # files are only created when first needed
+        self._files: Union[RunnerFileHandler, None] = None
 
-        self._files = RunnerFileHandler(
-            jobscript=TrackedFile(
-                self.local_dir, self.remote_dir, f"{self.name}-jobscript.sh"
-            ),
-            result=TrackedFile(
-                self.local_dir, self.remote_dir, f"{self.name}-result.json"
-            ),
-        )
+        # may be shared with other runners, so is never modified
+        self._exec_args = exec_arguments
+        self._temp_exec_args: Dict[Any, Any] = _empty
 
-        for file in exec_arguments.pop("extra_files_send", []):
-            self.add_extra_send(file)
-        for file in exec_arguments.pop("extra_files_recv", []):
-            self.add_extra_recv(file)
+    def __repr__(self) -> str:
+        return self.name
 
-        self._remote_status: List[str] = []
-        self._result = None
+    @property
+    def uuid(self) -> str:
+        return self._uuid
 
-        self._call_args = call_arguments
-        self._exec_args = exec_arguments
+    @property
+    def short_uuid(self) -> str:
+        return self._uuid[:8]
 
-        self.generate_uuid(self.call_args)
+    @property
+    def verbose(self) -> Verbosity:
+        return self.parent.verbose
 
-    def __repr__(self) -> str:
-        return self.name
+    def validate_verbose(
+        self, verbose: Union[None, int, bool, Verbosity]
+    ) -> Verbosity:
+        return self.parent.validate_verbose(verbose)
+
+    # runtime data is stored on the registry, see RunnerRegistry
+    # output is only fetched from the remote when first accessed
+
+    @property
+    def _state(self) -> State:  # type: ignore
+        return self._registry.get_state(self._idx)
+
+    @_state.setter
+    def _state(self, state: State) -> None:  # type: ignore
+        self._registry.set_state(self._idx, state)
+
+    @property
+    def _result(self) -> Any:
+        return self._registry.get_result(self._idx)
+
+    @_result.setter
+    def _result(self, result: Any) -> None:
+        self._registry.set_result(self._idx, result)
+
+    @property
+    def _stdout(self) -> Union[str, None]:  # type: ignore
+        if self._registry.output_pending(self._idx):
+            self.parent.fetch_output([self])
+        return self._registry.get_stdout(self._idx)
+
+    @_stdout.setter
+    def _stdout(self, stdout: Union[str, None]) -> None:  # type: ignore
+        self._registry.set_stdout(self._idx, stdout)
+
+    @property
+    def _stderr(self) -> Union[str, None]:  # type: ignore
+        if self._registry.output_pending(self._idx):
+            self.parent.fetch_output([self])
+        return self._registry.get_stderr(self._idx)
+
+    @_stderr.setter
+    def _stderr(self, stderr: Union[str, None]) -> None:  # type: ignore
+        self._registry.set_stderr(self._idx, stderr)
+
+    def _state_changed(self, state: State) -> None:
+        self.parent.record_state(self.uuid, state)
 
     @property
     def idx(self) -> int:
@@ -90,21 +222,56 @@ class Runner(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
 
     @property
     def files(self) -> RunnerFileHandler:
+        if self._files is None:
+            self._files = RunnerFileHandler(
+                jobscript=TrackedFile(
+                    self.local_dir, self.remote_dir, f"{self.name}-jobscript.sh"
+                ),
+                result=TrackedFile(
+                    self.local_dir, self.remote_dir, f"{self.name}-result.json"
+                ),
+                copy=TrackedFile(
+                    self.local_dir, self.remote_dir, f"{self.name}-copy.sh"
+                ),
+                claim=TrackedFile(
+                    self.local_dir, self.remote_dir, f"{self.name}-claim"
+                ),
+            )
+
+            for file in self._exec_args.get("extra_files_send", ()):
+                super().add_extra_send(file)
+            for file in self._exec_args.get("extra_files_recv", ()):
+                super().add_extra_recv(file)
+
+            extra_send, extra_recv = self._registry.get_extras(self._idx)
+            self._files.extra_send += extra_send
+            self._files.extra_recv += extra_recv
         return self._files
 
+    def add_extra_send(self, file: Union[str, TrackedFile]) -> None:
+        super().add_extra_send(file)
+        self._registry.add_extra(self._idx, self.files.extra_send[-1], send=True)
+
+    def add_extra_recv(self, file: Union[str, TrackedFile]) -> None:
+        super().add_extra_recv(file)
+        self._registry.add_extra(self._idx, self.files.extra_recv[-1], send=False)
+
     @property
     def call_args(self) -> Dict[Any, Any]:
-        return self._call_args
+        """
+        Call args are not held by the Runner, they are rebuilt from the registry
+        """
+        return self._registry.call_args(self._idx)
 
     @property
-    def exec_args(self) -> Dict[Any, Any]:
+    def exec_args(self) -> Mapping[Any, Any]:
         """
-        Generates the exec args by combining the parent's exec args with the runner's own exec args
+        Combines the parent's exec args with the runner's own exec args
+
+        Resolution is cached by the parent, runners sharing the same exec args
+        also share the result.
         """
-        global_args = self.parent.exec_args.copy()
-        global_args.update(self._exec_args)
-        global_args.update(self._temp_exec_args)
-        return global_args
+        return self.parent.resolve_exec_args(self._exec_args, self._temp_exec_args)
 
     def runline(self, jobscript_hash: Optional[str] = None) -> str:
         """
@@ -121,12 +288,19 @@ class Runner(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
             runline.append("&")
         return " ".join(runline)
 
+    @property
+    def copy_uuid(self) -> str:
+        """
+        Manifest tag of the submission of a speculative copy of this runner
+        """
+        return f"{self.short_uuid}{copy_suffix}"
+
     @property
     def execline(self) -> str:
         """
         Returns the string necessary to execute this runner
         """
-        return f"{self.url.python} {self.parent.files.repo.name} {self.short_uuid} {self.parent.name} {self.name} {self.parent.function.name}"
+        return f"{self.url.python} {self.parent.files.launcher.name} {self.short_uuid} {self.parent.name} {self.name} {self.parent.function.name}"
 
     def assess_run(self, verbose: Union[Verbosity, None] = None) -> bool:
         """
@@ -142,17 +316,33 @@ class Runner(UUIDMixin, ExecMixin, ExtraFilesMixin, VerboseMixin):
         if not self.exec_args.get("skip", True):
             return True
         # already staged
-        if self.state >= State("STAGED"):
+        if self.state >= STAGED:
             return False
 
         return True
 
-    def generate_jobscript(self, runner: "Runner") -> str:
+    def generate_jobscript(self, runner: "Runner", copy: bool = False) -> str:
+        running = f"""\
+echo "$(date -u +'{repo.bash_date_format}') [{runner.short_uuid}] [state] running" >> "$sourcedir/{self.parent.files.manifest.name}"
+"""
+        execline = runner.execline
+        flags = []
+        if copy:
+            # the runner is already RUNNING, a copy only records its outcome
+            running = ""
+            flags.append("copy")
+        elif self.parent.speculate is not None:
+            execline = f"rm -f {runner.files.claim.name}\n{execline}"
+            flags.append("speculative")
+        timeout = runner.exec_args.get("runner_timeout", None)
+        if timeout is not None:
+            flags.append(f"timeout={timeout}")
+        execline = " ".join([execline] + flags)
+
         submit = f"""\
 export r_uuid='{runner.short_uuid}'
 enable_redirect
-echo "$(date -u +'{repo.date_format}') [{runner.short_uuid}] [state] running" >> "$sourcedir/{self.parent.files.manifest.name}"
-{runner.execline}
+{running}{execline}
 """
         if runner.exec_args.get("avoid_nodes", False):
             return submit
@@ -163,6 +353,7 @@ echo "$(date -u +'{repo.date_format}') [{runner.short_uuid}] [state] running" >>
 
         return submit
 
+    @_profiled("stage")
     def stage(self, verbose: Union[Verbosity, None] = None, **exec_args: Any) -> bool:
         """
         Perform staging
@@ -170,34 +361,17 @@ echo "$(date -u +'{repo.date_format}') [{runner.short_uuid}] [state] running" >>
         This Phase creates all necessary files and stages them within the local staging directory
         """
         verbose = self.validate_verbose(verbose)
+        profile = self.parent.profile
 
-        self._temp_exec_args = exec_args
+        self._temp_exec_args = exec_args or _empty
         # ensure the local staging dir exists
         if not os.path.exists(self.local_dir):
             os.makedirs(self.local_dir)
-        # generate and add the per-runner lines to the master script
-        master_prologue = [
-            "# Functions #",
-            generate_format_fn(manifest_filename=self.parent.files.manifest.name),
-            generate_submit_fn(
-                manifest_filename=self.parent.files.manifest.name,
-                submitter=self.parent.url.submitter,
-            ),
-            "\n# Setup #",
-            "export -f enable_redirect",
-            "export sourcedir=$PWD",
-            f"export r_uuid={self.parent.short_uuid}",
-            f"echo '{self.parent.short_uuid}'  # enables submission validation via run_cmd",
-            "enable_redirect",
-            f"rm -rf {self.parent.files.manifest.name}",
-            f'echo "{repo.generate_log_str(time=None, uuid=self.parent.short_uuid, string="submitted")}" > {self.parent.files.manifest.name}\n',
-            "# Execution #",
-        ]
         master_content: List[str] = []
         # collect baseline repo content
         repo_prologue: List[str] = []
         repo_epilogue: List[str] = []
-        with open(repo.__file__, "r") as o:
+        with profile.phase("stage.template"), open(repo.__file__, "r") as o:
             prologue = True
             for line in o.readlines():
                 if "# placeholder" in line:
@@ -218,45 +392,111 @@ echo "$(date -u +'{repo.date_format}') [{runner.short_uuid}] [state] running" >>
         staged = 0
         # create a cache for the runner data
         runner_data = ["runner_data = {"]
+        in_flight = False
         for runner in self.parent.runners:
             if not runner.assess_run():
+                if runner.state >= STAGED and not runner.state >= COMPLETED:
+                    in_flight = True
+                    # still queued from an earlier master, which may run it
+                    # from this repository
+                    dumped_args = json.dumps(runner.call_args)
+                    runner_data.append(f"\t'{runner.short_uuid}': '{dumped_args}',")
                 continue
 
-            runner.files.jobscript.write(self.generate_jobscript(runner))
-
-            master_content.append(
-                runner.runline(jobscript_hash=runner.files.jobscript.md5sum)
-            )
-
-            dumped_args = json.dumps(runner.call_args)
-            runner_data.append(f"\t'{runner.short_uuid}': '{dumped_args}',")
-
-            runner.state = State("STAGED")
+            with profile.phase("stage.template"):
+                jobscript = self.generate_jobscript(runner)
+            with profile.phase("stage.write"):
+                runner.files.jobscript.write(jobscript)
+            with profile.phase("stage.hash"):
+                jobscript_hash = runner.files.jobscript.md5sum
+
+            with profile.phase("stage.template"):
+                if runner.attempt > 1:
+                    attempt = repo.generate_log_str(
+                        time=None,
+                        uuid=runner.short_uuid,
+                        string=str(runner.attempt),
+                        mode="attempt",
+                    )
+                    master_content.append(
+                        f'echo "{attempt}" >> {self.parent.files.manifest.name}'
+                    )
+                master_content.append(runner.runline(jobscript_hash=jobscript_hash))
+
+                dumped_args = json.dumps(runner.call_args)
+                runner_data.append(f"\t'{runner.short_uuid}': '{dumped_args}',")
+
+            runner.state = STAGED
             staged += 1
 
         if staged == 0:
             return False
+        self.parent._append_manifest = in_flight
+
+        manifest = self.parent.files.manifest.name
+        submitted = repo.generate_log_str(
+            time=None, uuid=self.parent.short_uuid, string="submitted"
+        )
+        if in_flight:
+            # runners of an earlier master (such as those running alongside a
+            # retry) still write to the manifest, so it is appended to
+            setup = [f'echo "{submitted}" >> {manifest}']
+        else:
+            setup = [f"rm -rf {manifest}", f'echo "{submitted}" > {manifest}']
+        # generate and add the per-runner lines to the master script
+        master_prologue = [
+            "# Functions #",
+            generate_format_fn(manifest_filename=manifest),
+            generate_submit_fn(
+                manifest_filename=manifest,
+                submitter=self.parent.url.submitter,
+            ),
+            "\n# Setup #",
+            "export -f enable_redirect",
+            "export sourcedir=$PWD",
+            f"export r_uuid={self.parent.short_uuid}",
+            *setup,
+            "# acknowledge once the manifest is ready, validated via run_cmd",
+            f"echo '{self.parent.short_uuid}'",
+            "enable_redirect\n",
+            "# compile the repository once, rather than in every runner",
+            generate_compile_cmd(self.parent.url.python, self.parent.files.repo.name),
+            "\n# Execution #",
+        ]
 
         verbose.print(f"Staged {staged}/{len(self.parent.runners)} Runners", level=1)
 
         repo_content.append("\n".join(runner_data) + "\n}\n\n")
 
         # main file writing
-        self.parent.files.repo.write(
-            "".join(repo_prologue + repo_content + repo_epilogue)
-        )
+        with profile.phase("stage.write"):
+            self.parent.files.repo.write(
+                "".join(repo_prologue + repo_content + repo_epilogue)
+            )
+            self.parent.files.launcher.write(
+                generate_launcher(self.parent.files.repo.name)
+            )
+            from remoref.engine import summary
+
+            with open(summary.__file__, "r") as o:
+                self.parent.files.summary.write(o.read())
+
+        with profile.phase("stage.hash"):
+            repo_hash = self.parent.files.repo.md5sum
 
         master_prologue.insert(
             0,
             f"""# initial file check #
 repo_hash=$(md5sum {self.parent.files.repo.name} | awk '{{print $1}}')
-if [[ $repo_hash != "{self.parent.files.repo.md5sum}" ]]; then
+if [[ $repo_hash != "{repo_hash}" ]]; then
     echo >&2 'Hash mismatch for repo (file may be corrupt)'\n    exit 1\nfi\n""",
         )
-        self.parent.files.master.write("\n".join(master_prologue + master_content))
+        with profile.phase("stage.write"):
+            self.parent.files.master.write("\n".join(master_prologue + master_content))
 
         return True
 
+    @_profiled("transfer")
     def transfer(
         self, verbose: Union[Verbosity, None] = None, **exec_args: Any
     ) -> bool:
@@ -265,18 +505,22 @@ if [[ $repo_hash != "{self.parent.files.repo.md5sum}" ]]; then
 
         Transfers the content of the local staging dir to the remote directories as needed
         """
+        from remoref.engine import localpool
+        from remoref.engine.metrics import file_sizes
+
         verbose = self.validate_verbose(verbose)
 
         staged = self.stage(verbose=verbose, **exec_args)
 
+        files: List[TrackedFile] = []
         transferred = 0
         for runner in self.parent.runners:
             if not runner.exec_args.get("force", False):
-                if runner.state >= State("TRANSFERRED"):
+                if runner.state >= TRANSFERRED:
                     continue
 
             for file in runner.files.files_to_send:
-                runner.url.transport.queue_for_push(file)
+                files.append(file)
 
                 runner.state = State("TRANSFERRED", time.time())
 
@@ -290,13 +534,23 @@ if [[ $repo_hash != "{self.parent.files.repo.md5sum}" ]]; then
             level=1,
         )
 
-        for file in self.parent.files.files_to_send:
-            self.url.transport.queue_for_push(file)
+        files += self.parent.files.files_to_send
+        self.parent.transferred["sent"] += file_sizes(f.local for f in files)
 
-        self.url.transport.transfer()
+        with self.parent.profile.phase("transfer.transport"):
+            if self.parent.local_pool:
+                # same machine and filesystem, link rather than copy
+                localpool.link_files(files)
+                return True
+
+            for file in files:
+                self.url.transport.queue_for_push(file)
+
+            self.url.transport.transfer()
 
         return True
 
+    @_profiled("run")
     def run(self, verbose: Union[Verbosity, None] = None, **exec_args: Any) -> bool:
         """
         Performs the remote execution
@@ -309,44 +563,153 @@ if [[ $repo_hash != "{self.parent.files.repo.md5sum}" ]]; then
         transferred = self.transfer(verbose=verbose, **exec_args)
 
         asynchronous = False
-        run = 0
+        run: List["Runner"] = []
         for runner in self.parent.runners:
             if not runner.exec_args.get("force", False):
-                if runner.state >= State("RUNNING"):
+                if runner.state >= RUNNING:
                     continue
                 if runner.exec_args.get("asynchronous", True):
                     asynchronous = True
-                run += 1
+            if runner.jobs:
+                # the new submission records the job ids afresh
+                self._registry.clear_jobs(runner.idx)
+                self.parent.record_submission(runner)
+            run.append(runner)
 
-        if run == 0 and not transferred:
+        if len(run) == 0 and not transferred:
             return False
 
-        verbose.print(f"Running {run}/{len(self.parent.runners)} Runners", level=1)
-
-        self.parent.run_cmd = self.url.cmd(
-            f"cd {self.remote_dir} && {self.url.shell} {self.parent.files.master.name}",
-            asynchronous=asynchronous,
-        )
-
-        for runner in self.parent.runners:
+        verbose.print(f"Running {len(run)}/{len(self.parent.runners)} Runners", level=1)
+
+        if not self.parent._append_manifest:
+            # the master recreates the manifest, which may reuse the old inode
+            self.parent._manifest_cursor = None
+        with self.parent.profile.phase("run.transport"):
+            if self.parent.local_pool:
+                self.parent.submit_local(asynchronous=asynchronous)
+            else:
+                master = self.parent.files.master.name
+                self.parent.run_cmd = self.url.cmd(
+                    f"cd {self.remote_dir} && {self.url.shell} {master}",
+                    asynchronous=asynchronous,
+                )
+
+        # runners left out of the master would otherwise never leave RUNNING
+        for runner in run:
             runner.state = State("RUNNING", time.time())
+            # a result left from a previous run is stale, see read_local_files
+            if runner.files.result.exists_local:
+                os.remove(runner.files.result.local)
 
         return True
 
+    @_profiled("speculate")
+    def speculate(
+        self, runners: Sequence["Runner"], verbose: Union[Verbosity, None] = None
+    ) -> None:
+        """
+        Submit a copy of each of `runners`, using this runner as the master
+
+        The copies are submitted by a script of their own which, unlike the
+        master, leaves the manifest in place. Their submission is recorded under
+        `copy_uuid`, so that it does not reset the state of the runner
+        """
+        from remoref.engine.metrics import file_sizes
+
+        verbose = self.validate_verbose(verbose)
+        manifest = self.parent.files.manifest.name
+        content = [
+            generate_format_fn(manifest_filename=manifest),
+            generate_submit_fn(
+                manifest_filename=manifest, submitter=self.url.submitter
+            ),
+            "export -f enable_redirect",
+            "export sourcedir=$PWD",
+            f"export r_uuid={self.parent.short_uuid}",
+            "enable_redirect\n",
+        ]
+        files: List[TrackedFile] = []
+        for runner in runners:
+            jobscript = runner.files.copy
+            jobscript.write(self.generate_jobscript(runner, copy=True))
+            content.append(
+                f"submit_job_{self.url.submitter} {runner.copy_uuid} "
+                f"{jobscript.name} {jobscript.md5sum} &"
+            )
+            files.append(jobscript)
+
+        verbose.print(f"Speculating {len(runners)} Runners", level=1)
+
+        script = self.parent.files.speculate
+        script.write("\n".join(content))
+        files.append(script)
+        self.parent.transferred["sent"] += file_sizes(f.local for f in files)
+
+        for file in files:
+            self.url.transport.queue_for_push(file)
+        self.url.transport.transfer()
+
+        self.url.cmd(
+            f"cd {self.remote_dir} && {self.url.shell} {script.name}",
+            asynchronous=True,
+        )
+
     @property
     def is_finished(self) -> bool:
-        return self.state >= State("COMPLETED")
+        return self.state >= COMPLETED
 
     @property
     def result(self) -> Any:
         return self._result
 
+    @property
+    def usage(self) -> Union[Dict[str, float], None]:
+        """
+        Resources used by the function, None until recorded
+
+        Contains the wall time, user and system CPU times (in seconds), and
+        peak resident set size (maxrss, in bytes) where available
+        """
+        return self._registry.get_usage(self._idx)
+
+    @property
+    def attempt(self) -> int:
+        """
+        Attempt number of this runner, starting at 1 and increased by each retry
+        """
+        return self._registry.get_attempt(self._idx)
+
+    @property
+    def jobs(self) -> List[str]:
+        """
+        Scheduler job ids (or PIDs) of this runner's latest submission, and of
+        any copy of it
+        """
+        return self._registry.get_jobs(self._idx)
+
+    def cancel(self, verbose: Union[Verbosity, None] = None) -> bool:
+        """
+        Stop this runner, see `ProcessHandler.cancel`
+
+        Returns True if it was cancelled, False if it had already finished
+        """
+        return len(self.parent.cancel([self], verbose=verbose)) > 0
+
+    @property
+    def history(self) -> List[State]:
+        """
+        Every state this runner has passed through, in order
+        """
+        return self._registry.history(self._idx)
+
     def read_local_files(self) -> None:
-        if not self.state >= State("COMPLETED"):
+        if not self.state >= COMPLETED:
             return
 
         if self.files.result.exists_local:
-            if self.files.result.local_mtime < self.state.timestamp:
+            # the result is written while RUNNING, an older copy is stale
+            started = self._registry.get_started(self._idx)
+            if os.path.getmtime(self.files.result.local) < started - mtime_resolution:
                 return
 
             with open(self.files.result.local, "r") as o:
@@ -357,16 +720,81 @@ def generate_format_fn(manifest_filename: str) -> str:
     logwrite_fn = f"""\
 enable_redirect() {{
 
-  local timestr="$(date -u +'{repo.date_format}')"
+  local timestr="$(date -u +'{repo.bash_date_format}')"
   local file="$sourcedir/{manifest_filename}"
 
-  exec > >(while IFS= read -r line; do echo "$timestr [$r_uuid] [stdout] $line" >> "$file"; done)
-  exec 2> >(while IFS= read -r line; do echo "$timestr [$r_uuid] [stderr] $line" >> "$file"; done)
+  # the readers release the caller's stdout/stderr, so the master exits on submission
+  exec > >(exec >/dev/null 2>&1; while IFS= read -r line; do echo "$timestr [$r_uuid] [stdout] $line" >> "$file"; done)
+  exec 2> >(exec >/dev/null 2>&1; while IFS= read -r line; do echo "$timestr [$r_uuid] [stderr] $line" >> "$file"; done)
 }}
 """
     return logwrite_fn
 
 
+def generate_launcher(repository_filename: str) -> str:
+    """
+    Generates the script which runs a runner from the repository
+
+    The repository is imported as a module (rather than run as a script), so
+    that its bytecode is read from `__pycache__` instead of being recompiled by
+    every runner. Runners never write bytecode themselves, only the hash based
+    bytecode of `generate_compile_cmd` is trusted
+    """
+    return f"""\
+import importlib.util
+import os
+import sys
+
+sys.dont_write_bytecode = True
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "{repository_filename}")
+spec = importlib.util.spec_from_file_location("repository", path)
+repository = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = repository
+spec.loader.exec_module(repository)
+repository.launch(sys.argv[1:])
+"""
+
+
+def generate_compile_cmd(python: str, repository_filename: str) -> str:
+    """
+    Generates the command which writes the bytecode of the repository
+
+    Hash based bytecode is used, so that it is never mistaken for that of an
+    earlier repository written within the same second. Runners using another
+    interpreter version ignore it, and compile the repository themselves
+    """
+    mode = "invalidation_mode=c.PycInvalidationMode.CHECKED_HASH"
+    return (
+        f'{python} -c "import py_compile as c; '
+        f"c.compile('{repository_filename}', {mode})\""
+    )
+
+
+def is_direct(submitter: str) -> bool:
+    """
+    True if `submitter` runs the jobscript itself, rather than queueing it
+    """
+    return os.path.basename(submitter.split(" ", maxsplit=1)[0]) in shells
+
+
+def cancel_command(submitter: str, jobs: Sequence[str]) -> str:
+    """
+    Returns the command which cancels `jobs`, submitted with `submitter`
+
+    Direct jobs are killed by PID, along with the runner they started. Queued
+    jobs are cancelled by job id. Jobs which have already ended are ignored
+    """
+    ids = " ".join(jobs)
+    if is_direct(submitter):
+        return f"{{ pkill -P {','.join(jobs)}; kill {ids}; }} >/dev/null 2>&1"
+
+    cmd = os.path.basename(submitter.split(" ", maxsplit=1)[0])
+    try:
+        return f"{cancel_commands[cmd]} {ids} >/dev/null 2>&1"
+    except KeyError:
+        raise ValueError(f"Can not cancel jobs submitted with '{cmd}'") from None
+
+
 def generate_submit_fn(
     submitter: str,
     manifest_filename: str,
@@ -391,7 +819,7 @@ def generate_submit_fn(
     """
     template = f"""{{docstring}}
 submit_job_{{submitter_cmd}} () {{
-    local timestr="$(date -u +'{repo.date_format}')"
+    local timestr="$(date -u +'{repo.bash_date_format}')"
     local file="$sourcedir/{manifest_filename}"
     # compare the hash of the transferred file with generated
     computed_hash=$(md5sum "$2" | awk '{{print $1}}')
@@ -404,8 +832,22 @@ submit_job_{{submitter_cmd}} () {{
     echo "$timestr [$1] [state] submitted" >> "$file"
     {{submission_section}}}}"""
 
-    submission_normal = """{submitter} $2 ||  # submission line
-    echo "$timestr [$1] [state] failed" >> "$file"
+    # the PID of a direct job, or the job id printed by a scheduler, is
+    # recorded so that the job can be cancelled. The id is the first number
+    # printed, as in "Submitted batch job <id>" (sbatch), "<id>.server" (PBS
+    # qsub), "Your job <id> (...)" (SGE qsub) and "Job <<id>> is ..." (bsub)
+    submission_normal = """{submitter} $2 &  # submission line
+    local pid=$!
+    echo "$timestr [$1] [job] $pid" >> "$file"
+    wait $pid || echo "$timestr [$1] [state] failed" >> "$file"
+"""
+    submission_queued = """if output=$({submitter} $2); then  # submission line
+        if [[ $output =~ [0-9]+ ]]; then
+            echo "$timestr [$1] [job] ${BASH_REMATCH[0]}" >> "$file"
+        fi
+    else
+        echo "$timestr [$1] [state] failed" >> "$file"
+    fi
 """
     submission_script = """if {submitter} $2 ; then  # submission line
         echo "$timestr [$1] [state] completed" >> "$file"
@@ -415,8 +857,10 @@ submit_job_{{submitter_cmd}} () {{
 
     if script_run:
         template = template.replace("{submission_section}", submission_script)
-    else:
+    elif is_direct(submitter):
         template = template.replace("{submission_section}", submission_normal)
+    else:
+        template = template.replace("{submission_section}", submission_queued)
     template = template.replace("{manifest_filename}", manifest_filename)
     template = template.replace("{submitter}", submitter)
 
@@ -12,8 +12,15 @@ valid_states = {
     "RUNNING": 4,
     "COMPLETED": 5,
     "FAILED": 5,
+    "CANCELLED": 5,
 }
 
+# distinct integer code for each state, in progression order. Unlike the values
+# above, COMPLETED, FAILED and CANCELLED are distinguishable, so codes can be
+# stored in compact arrays and compared numerically (code >= 5 means finished)
+state_codes = {state: code for code, state in enumerate(valid_states)}
+state_names = tuple(valid_states)
+
 
 class State:
     __slots__ = ["state", "value", "_ts"]
@@ -30,9 +37,9 @@ class State:
         self.value = valid_states[state]
 
         if timestamp is not None:
-            self._ts = int(timestamp)
+            self._ts = float(timestamp)
         else:
-            self._ts = -1
+            self._ts = -1.0
 
     def __repr__(self) -> str:
         return f"State({self.state}, timestamp={self._ts})"
@@ -60,14 +67,35 @@ class State:
     def __ne__(self, value: object) -> bool:
         return super().__ne__(value)
 
+    @property
+    def code(self) -> int:
+        return state_codes[self.state]
+
     @property
     def failed(self) -> bool:
         return self.state == "FAILED"
 
     @property
-    def timestamp(self) -> int:
+    def cancelled(self) -> bool:
+        return self.state == "CANCELLED"
+
+    @property
+    def timestamp(self) -> float:
         return self._ts
 
     @property
     def time(self) -> str:
         return datetime.datetime.fromtimestamp(self.timestamp).strftime(date_format)
+
+
+# Interned, timestamp-free states. Use these for comparisons (and for setting
+# states that carry no timestamp) rather than allocating a new State each time.
+# They are shared, and must never be modified.
+CREATED = State("CREATED")
+STAGED = State("STAGED")
+TRANSFERRED = State("TRANSFERRED")
+SUBMITTED = State("SUBMITTED")
+RUNNING = State("RUNNING")
+COMPLETED = State("COMPLETED")
+FAILED = State("FAILED")
+CANCELLED = State("CANCELLED")
@@ -0,0 +1,320 @@
+"""
+Remote status summariser, copied alongside the repository and run when polling.
+
+Rather than shipping the whole manifest back, this reads only the records
+written since a cursor, and prints a compact JSON summary of them. Output is
+only included for the uuids that ask for it.
+
+Like the repository, it should stand by itself and only use the standard library.
+
+Usage:
+    python summary.py <manifest> [<cursor> [<uuid>,<uuid>,...]]
+
+where the uuids may be "-" for none.
+
+Several manifests may be summarised in one call by repeating the (manifest,
+cursor, uuids) triplet, in which case one summary is printed per line.
+
+    python summary.py --watch <timeout> <manifest> <cursor> <uuids> [...]
+
+Watch mode prints the initial summaries, then blocks until a manifest changes
+(using inotify where available, falling back to polling stat), printing a
+summary tagged with the manifest "index" for each change, until timeout.
+
+The cursor is the "inode:offset" string returned by the previous call, or "-"
+to read from the start. A cursor for a replaced manifest is ignored, and the
+summary is marked as a reset.
+"""
+
+import json
+import os
+import select
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+
+def parse_cursor(cursor: Union[str, None]) -> Union[Tuple[int, int], None]:
+    """
+    Split an "inode:offset" cursor, returning None for an empty cursor
+    """
+    if cursor is None or cursor in ("", "-"):
+        return None
+    inode, offset = cursor.split(":")
+    return int(inode), int(offset)
+
+
+def parse_uuids(uuids: str) -> List[str]:
+    """
+    Split a comma separated list of uuids, "-" (or "") for none
+    """
+    return [u for u in uuids.split(",") if u and u != "-"]
+
+
+def parse_line(line: str) -> Union[Tuple[str, str, str, str], None]:
+    """
+    Split a manifest line into (time, uuid, mode, text), None if malformed
+    """
+    time, sep, rest = line.partition(" [")
+    if not sep:
+        return None
+    uuid, sep, rest = rest.partition("] [")
+    if not sep:
+        return None
+    mode, sep, text = rest.partition("]")
+    if not sep:
+        return None
+    if text.startswith(" "):
+        text = text[1:]
+    return time.strip(), uuid, mode, text.rstrip()
+
+
+# summary entry of each kind of manifest record, see `repo.log_modes`
+summary_keys = {
+    "state": "states",
+    "stdout": "output",
+    "stderr": "output",
+    "usage": "usage",
+    "attempt": "attempts",
+    "job": "jobs",
+}
+
+
+def lines(data: bytes) -> Iterator[str]:
+    for line in data.decode("utf8", errors="replace").split("\n"):
+        if line.strip():
+            yield line.strip()
+
+
+def new_summary(output: Iterable[str] = ()) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {"cursor": None, "reset": False}
+    summary.update({key: {} for key in summary_keys.values()})
+    if output:
+        summary["stdout"] = {uuid: [] for uuid in output}
+        summary["stderr"] = {uuid: [] for uuid in output}
+    return summary
+
+
+def summarise(
+    path: str, cursor: Union[str, None] = None, output: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Summarise the manifest at `path`, from `cursor` onwards
+
+    Returns:
+        dict containing:
+            cursor: cursor to pass to the next call, None if there is no manifest
+            reset: True if the cursor was for a manifest that has been replaced
+            states: new [time, state] records for each uuid, from its latest attempt
+            output: number of new [stdout, stderr] records for each uuid
+            usage: latest resource usage recorded by each uuid
+            attempts: latest attempt number recorded by each retried uuid
+            jobs: new scheduler job ids (or PIDs) recorded by each uuid
+            stdout/stderr: full output of each uuid in `output`
+    """
+    output = set(output)
+    summary = new_summary(output)
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return summarise_records(summary, [], output)
+
+    start = 0
+    previous = parse_cursor(cursor)
+    if previous is not None:
+        inode, offset = previous
+        if inode == stat.st_ino and offset <= stat.st_size:
+            start = offset
+        else:
+            summary["reset"] = True
+
+    # only read up to the last complete record, the next call picks up the rest
+    with open(path, "rb") as o:
+        o.seek(start)
+        data = o.read(stat.st_size - start)
+    data = data[: data.rfind(b"\n") + 1]
+    summary["cursor"] = f"{stat.st_ino}:{start + len(data)}"
+
+    if output and start > 0:
+        # output is requested in full, so collect it from the older records too
+        with open(path, "rb") as o:
+            collect_output(summary, lines(o.read(start)), output)
+
+    return summarise_records(summary, list(lines(data)), output)
+
+
+def summarise_records(
+    summary: Dict[str, Any], records: List[str], output: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Add the manifest lines `records` to `summary`
+    """
+    for line in records:
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        time, uuid, mode, text = parsed
+        if mode == "state":
+            summary["states"].setdefault(uuid, []).append([time, text.strip()])
+        elif mode in ("stdout", "stderr"):
+            counts = summary["output"].setdefault(uuid, [0, 0])
+            counts[mode == "stderr"] += 1
+        elif mode == "usage":
+            try:
+                summary["usage"][uuid] = json.loads(text)
+            except ValueError:
+                continue
+        elif mode == "job":
+            summary["jobs"].setdefault(uuid, []).append(text.strip())
+        elif mode == "attempt":
+            try:
+                summary["attempts"][uuid] = int(text)
+            except ValueError:
+                continue
+            # the states of earlier attempts are superseded by the retry
+            summary["states"].pop(uuid, None)
+    collect_output(summary, records, output)
+
+    if output:
+        for mode in ("stdout", "stderr"):
+            summary[mode] = {u: "\n".join(t) for u, t in summary[mode].items()}
+
+    return summary
+
+
+def collect_output(
+    summary: Dict[str, Any], records: Iterable[str], output: Iterable[str]
+) -> None:
+    if not output:
+        return
+    for line in records:
+        parsed = parse_line(line)
+        if parsed is None:
+            continue
+        _, uuid, mode, text = parsed
+        if uuid in output and mode in ("stdout", "stderr"):
+            summary[mode][uuid].append(text)
+
+
+# inotify event masks, see `man inotify`
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+def inotify_waiter(paths: List[str]) -> Union[Callable[[float], None], None]:
+    """
+    Returns a function which blocks until one of `paths` changes (or a timeout)
+
+    The parent directories are watched, so that recreated files are seen.
+    Returns None if inotify is not available on this system.
+    """
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK)
+    except (OSError, AttributeError, TypeError):
+        return None
+    if fd < 0:
+        return None
+
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    for folder in {os.path.dirname(os.path.abspath(p)) for p in paths}:
+        if libc.inotify_add_watch(fd, folder.encode(), mask) < 0:
+            os.close(fd)
+            return None
+
+    def wait(timeout: float) -> None:
+        ready, _, _ = select.select([fd], [], [], max(timeout, 0))
+        if ready:
+            try:
+                while os.read(fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    return wait
+
+
+def stat_waiter(paths: List[str], interval: float = 0.05) -> Callable[[float], None]:
+    """
+    Fallback waiter, polls the stat of `paths` every `interval` seconds
+    """
+
+    def signature() -> List[Union[Tuple[int, int, int], None]]:
+        sig: List[Union[Tuple[int, int, int], None]] = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                sig.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                sig.append(None)
+        return sig
+
+    def wait(timeout: float) -> None:
+        initial = signature()
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            time.sleep(min(interval, max(deadline - time.time(), 0)))
+            if signature() != initial:
+                return
+
+    return wait
+
+
+def watch(triplets: List[List[str]], timeout: float) -> None:
+    """
+    Stream summaries of the manifests in `triplets` as they change
+    """
+    deadline = time.time() + timeout
+    paths = [t[0] for t in triplets]
+    wait = inotify_waiter(paths) or stat_waiter(paths)
+
+    cursors = [t[1] for t in triplets]
+    first = True
+    while first or time.time() < deadline:
+        for i, (path, _, output) in enumerate(triplets):
+            uuids = parse_uuids(output)
+            summary = summarise(path, cursors[i])
+            if not first and not (summary["states"] or summary["output"]):
+                continue
+            if first or any(u in summary["output"] for u in uuids):
+                # new output for a requested uuid, include it in full
+                summary = summarise(path, cursors[i], uuids)
+            cursors[i] = summary["cursor"] or cursors[i]
+            summary["index"] = i
+            print(json.dumps(summary), flush=True)
+        first = False
+
+        wait(deadline - time.time())
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) == 0:
+        raise ValueError("Summary must be called with the manifest path")
+
+    if args[0] == "--watch":
+        timeout = float(args[1])
+        args = args[2:]
+        if len(args) == 0 or len(args) % 3 != 0:
+            raise ValueError("Watch requires (path, cursor, uuids) for each manifest")
+        try:
+            watch([args[i : i + 3] for i in range(0, len(args), 3)], timeout)
+        except BrokenPipeError:
+            pass  # the reader has gone away
+        sys.exit(0)
+
+    if len(args) > 3 and len(args) % 3 != 0:
+        raise ValueError("Multiple manifests must be given as (path, cursor, uuids)")
+
+    # one JSON summary is printed per line, for each manifest in turn
+    for i in range(0, len(args), 3):
+        manifest = args[i]
+        cursor = args[i + 1] if len(args) > i + 1 else None
+        uuids = parse_uuids(args[i + 2]) if len(args) > i + 2 else []
+        print(json.dumps(summarise(manifest, cursor, uuids)))
@@ -0,0 +1,168 @@
+import json
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple, Union
+
+from remoref.engine.runnerstates import COMPLETED
+
+# TYPE_CHECKING is false at runtime, so does not cause a circular dependency
+if TYPE_CHECKING:
+    from remoref.engine.process import ProcessHandler
+
+
+Update = Tuple[Union["ProcessHandler", None], Union[Dict[str, Any], None]]
+
+
+class ManifestWatcher:
+    """
+    Streams manifest summaries for Processes sharing a connection
+
+    A single long-lived remote command runs the summary helper in watch mode,
+    which blocks until a manifest changes and then prints a summary of the new
+    records. Each line is read by a background thread and queued as a
+    (process, summary) update. A (None, None) update marks the end of the stream.
+
+    Args:
+        processes:
+            Processes to watch, which must share a connection
+        timeout:
+            time after which the remote helper exits
+        updates:
+            queue to place updates on, allows several watchers to share a queue
+    """
+
+    def __init__(
+        self,
+        processes: Sequence["ProcessHandler"],
+        timeout: float,
+        updates: "Union[queue.Queue[Update], None]" = None,
+    ) -> None:
+        self.processes = list(processes)
+        self.timeout = timeout
+        self.updates: "queue.Queue[Update]" = updates or queue.Queue()
+        self.received = 0
+
+        self._proc: Union[subprocess.Popen, None] = None  # type: ignore
+        self._thread: Union[threading.Thread, None] = None
+
+    def __enter__(self) -> "ManifestWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    @property
+    def command(self) -> str:
+        """
+        The full (ssh wrapped, if remote) command run by this watcher
+        """
+        url = self.processes[0].url
+        args: List[str] = []
+        for process in self.processes:
+            args += process.summary_args(watch=True)
+
+        cmd = (
+            f"{url.python} {self.processes[0].files.summary.remote} "
+            f"--watch {self.timeout} " + " ".join(args)
+        )
+        return url.cmd(cmd, dry_run=True).cmd
+
+    def start(self) -> None:
+        self._proc = subprocess.Popen(
+            self.command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            # own process group, so that stop() also ends the shell's children
+            start_new_session=True,
+        )
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    def _read(self) -> None:
+        assert self._proc is not None and self._proc.stdout is not None
+        for line in self._proc.stdout:
+            try:
+                summary = json.loads(line)
+                process = self.processes[summary["index"]]
+            except (ValueError, KeyError, IndexError):
+                continue
+            self.received += 1
+            self.updates.put((process, summary))
+        self.updates.put((None, None))
+
+    def stop(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            try:
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            self._proc.wait()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+
+def watch_until_finished(
+    processes: Sequence["ProcessHandler"], timeout: Union[int, float]
+) -> bool:
+    """
+    Apply streamed updates to `processes` until all of their runners finish
+
+    Processes are grouped by connection, with one watcher per group.
+
+    Returns:
+        bool: True once every Process has finished, False if the watch could not
+        be run (in which case the caller should fall back to polling)
+
+    Raises:
+        RuntimeError: if the timeout is reached
+    """
+    # imported here, as the Poller depends on the Process
+    from remoref.engine.poller import Poller
+
+    updates: "queue.Queue[Update]" = queue.Queue()
+    watchers = [
+        ManifestWatcher(group, timeout, updates)
+        for group in Poller(processes).groups.values()
+    ]
+
+    def finished() -> bool:
+        return all(p.runners.all_at_least(COMPLETED) for p in processes)
+
+    deadline = time.time() + timeout
+    running = len(watchers)
+    try:
+        for watcher in watchers:
+            watcher.start()
+
+        while running > 0:
+            try:
+                process, summary = updates.get(
+                    timeout=max(deadline - time.time(), 0.01)
+                )
+            except queue.Empty:
+                break
+            if process is None:
+                running -= 1
+                continue
+
+            process.apply_summary(summary)
+            process._check_finished()
+            if finished():
+                return True
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+
+    if any(w.received == 0 for w in watchers):
+        # at least one helper never produced output, it could not be run
+        return False
+    if finished():
+        return True
+    raise RuntimeError("Wait Timed out")
@@ -28,6 +28,7 @@ class BaseTestClass:
         """Clean up"""
 
         for process in self.processes:
+            process.close()
             try_remove(process.local_dir)
             try_remove(process.remote_dir)
 
@@ -0,0 +1,127 @@
+from remoref.engine.process import ProcessHandler
+from remoref.engine.runnerstates import State
+from remoref.engine.summary import new_summary
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestDatabase(BaseTestClass):
+    def test_runners_stored(self):
+        ps = self.create_process(basic, database="state.db")
+
+        for i in range(3):
+            ps.prepare(a=i)
+
+        assert ps.database is not None
+        stored = ps.database.runners()
+
+        assert [r[0] for r in stored] == [r.uuid for r in ps.runners]
+        assert [r[1] for r in stored] == [0, 1, 2]
+        assert [r[2] for r in stored] == [{"a": i} for i in range(3)]
+
+        assert ps.database.state_counts() == {"CREATED": 3}
+
+    def test_state_history(self):
+        ps = self.create_process(basic, database="state.db")
+        ps.prepare(a=1)
+
+        runner = ps.runners[0]
+        runner.state = State("STAGED", 10)
+        runner.state = State("STAGED", 10)  # duplicates are not recorded
+        runner.state = State("RUNNING", 20)
+        ps.commit()
+
+        assert ps.database is not None
+        assert ps.database.history(runner.uuid) == [State("STAGED"), State("RUNNING")]
+        assert ps.database.state_counts() == {"RUNNING": 1}
+
+        rows = ps.database.query(
+            "SELECT state FROM states WHERE uuid = ?", (runner.uuid,)
+        )
+        assert rows == [("STAGED",), ("RUNNING",)]
+
+    def test_reattach(self):
+        ps = self.create_process(basic, database="state.db")
+        for i in range(3):
+            ps.prepare(a=i, extra_arg=i)
+
+        ps.runners[1].state = State("COMPLETED", 10)
+        ps.commit()
+
+        new = ProcessHandler(
+            basic,
+            name=ps.name,
+            local_dir=ps.local_dir,
+            remote_dir=ps.remote_dir,
+            database="state.db",
+        )
+
+        assert [r.uuid for r in new.runners] == [r.uuid for r in ps.runners]
+        assert [r.call_args for r in new.runners] == [{"a": i} for i in range(3)]
+        assert new.runners[2].exec_args["extra_arg"] == 2
+
+        assert new.runners[0].state == State("CREATED")
+        assert new.runners[1].state == State("COMPLETED")
+        assert new.runners[1].state.timestamp == 10
+
+    def test_reattach_submissions(self):
+        ps = self.create_process(basic, database="state.db")
+        for i in range(3):
+            ps.prepare(a=i)
+
+        running, retried = ps.runners[0].short_uuid, ps.runners[1].short_uuid
+        summary = new_summary()
+        summary["cursor"] = "1:0"
+        summary["states"] = {running: [["2024-01-01 00:00:00", "running"]]}
+        summary["jobs"] = {running: ["1234"]}
+        summary["attempts"] = {retried: 2}
+        ps.apply_summary(summary)
+        ps.runners[2].state = State("CANCELLED", 10)
+        # not committed, but written when the Process is closed
+        ps.close()
+
+        new = ProcessHandler(
+            basic,
+            name=ps.name,
+            local_dir=ps.local_dir,
+            remote_dir=ps.remote_dir,
+            database="state.db",
+        )
+
+        assert [r.attempt for r in new.runners] == [1, 2, 1]
+        assert [r.jobs for r in new.runners] == [["1234"], [], []]
+        assert new.runners[0].state == State("RUNNING")
+        assert new.runners[2].state.cancelled
+
+    def test_reattach_timings(self):
+        ps = self.create_process(basic, database="state.db")
+        ps.prepare(a=1)
+        runner = ps.runners[0]
+        runner.state = State("SUBMITTED", 5)
+        runner.state = State("RUNNING", 10)
+        runner.state = State("COMPLETED", 20)
+        ps.commit()
+
+        rows = ps.database.query("SELECT result FROM runners")  # type: ignore
+        assert rows == [(runner.files.result.local,)]
+
+        new = ProcessHandler(
+            basic,
+            name=ps.name,
+            local_dir=ps.local_dir,
+            remote_dir=ps.remote_dir,
+            database="state.db",
+        )
+        assert new.runners.get_started(0) == 10
+        assert new.runners.timings() == ps.runners.timings()
+
+    def test_separate_processes(self):
+        ps = self.create_process(basic, database="state.db")
+        ps.prepare(a=1)
+
+        other = self.create_process(basic, database="state.db")
+
+        assert len(other.runners) == 0
@@ -0,0 +1,65 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+def main(a: int) -> int:
+    return -a
+
+
+class TestBytecode(BaseTestClass):
+    def test_compiled_once(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        assert self.run_ps() == [1]
+
+        cache = importlib.util.cache_from_source(ps.files.repo.remote)
+        with open(cache, "rb") as o:
+            header = o.read(8)
+        # flags: hash based, checked against the source
+        assert int.from_bytes(header[4:8], "little") == 0b11
+
+        # runners do not write bytecode of their own
+        assert os.listdir(os.path.dirname(cache)) == [os.path.basename(cache)]
+
+    def test_restaged(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        assert self.run_ps() == [1]
+
+        # the repository is rewritten within the same second
+        ps.prepare(a=2)
+        assert self.run_ps() == [1, 2]
+
+    def test_shadowed_name(self):
+        ps = self.create_process(main)
+        ps.prepare(a=1)
+        assert self.run_ps() == [-1]
+
+    def test_direct(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=3)
+        ps.stage()
+        runner = ps.runners[0]
+
+        # the repository can still be run as a script
+        subprocess.run(
+            [
+                sys.executable,
+                ps.files.repo.name,
+                runner.short_uuid,
+                ps.name,
+                runner.name,
+                ps.function.name,
+            ],
+            cwd=ps.local_dir,
+            check=True,
+        )
+        assert os.path.exists(runner.files.result.local)
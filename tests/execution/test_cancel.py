@@ -0,0 +1,155 @@
+import hashlib
+import os
+import subprocess
+import time
+
+import pytest
+
+from remoref.engine.runner import cancel_command, cancel_commands, generate_submit_fn
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def sleep(t: float) -> float:
+    import time
+
+    time.sleep(t)
+    return t
+
+
+def running(name: str) -> bool:
+    """
+    True if any process has `name` in its command line
+    """
+    for pid in os.listdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as o:
+                cmdline = o.read().decode().split("\0")
+        except (OSError, ValueError):
+            continue
+        if name in cmdline:
+            return True
+    return False
+
+
+class TestCancel(BaseTestClass):
+    def wait_for_jobs(self, *runners):
+        for _ in range(100):
+            self.ps.read_remote_manifest()
+            started = [r.jobs and r.state.state == "RUNNING" for r in runners]
+            if all(started):
+                return
+            time.sleep(0.05)
+        pytest.fail("runners were not started")
+
+    def test_cancel(self):
+        ps = self.create_process(sleep)
+        ps.prepare(t=30)
+        ps.prepare(t=31)
+        ps.run()
+        self.wait_for_jobs(*ps.runners)
+
+        assert ps.cancel() == list(ps.runners)
+        assert ps.cancelled == list(ps.runners)
+        ps.wait(0.1, 1)
+
+        with open(ps.files.manifest.remote, "r") as o:
+            manifest = o.read()
+        for runner in ps.runners:
+            assert f"[{runner.short_uuid}] [state] cancelled" in manifest
+
+        # the killed jobs report a failure, which does not replace the cancellation
+        time.sleep(0.5)
+        ps.read_remote_manifest()
+        assert all(runner.state.cancelled for runner in ps.runners)
+        assert not any(running(runner.name) for runner in ps.runners)
+
+    def test_runner(self):
+        ps = self.create_process(sleep)
+        ps.prepare(t=30)
+        ps.prepare(t=0)
+        ps.run()
+        self.wait_for_jobs(ps.runners[0])
+
+        assert ps.runners[0].cancel()
+        ps.wait(0.1, 5)
+        ps.fetch_results()
+        assert ps.results == [None, 0]
+        # already finished
+        assert not ps.runners[1].cancel()
+
+    def test_not_run(self):
+        ps = self.create_process(sleep)
+        ps.prepare(t=0)
+
+        assert ps.cancel() == [ps.runners[0]]
+        assert ps.runners[0].state.cancelled
+        assert not ps.run()
+
+    def test_local_pool(self):
+        ps = self.create_process(sleep, local_pool=True, local_workers=1)
+        ps.prepare(t=30)
+        ps.prepare(t=31)
+        ps.run()
+        self.wait_for_jobs(ps.runners[0])
+
+        # one runner is running, the other is still queued behind it
+        assert ps.cancel() == list(ps.runners)
+        ps.wait(0.1, 1)
+
+        # the worker survives, and runs the next runner
+        ps.prepare(t=0)
+        assert self.run_ps() == [None, None, 0]
+        assert all(runner.state.cancelled for runner in ps.runners[:2])
+
+    def test_local_pool_reused(self):
+        ps = self.create_process(sleep, local_pool=True, local_workers=1)
+        ps.prepare(t=30)
+        ps.run()
+        self.wait_for_jobs(ps.runners[0])
+        assert ps.runners[0].cancel()
+
+        # the same worker runs the next runner to completion
+        ps.prepare(t=0.5)
+        assert self.run_ps() == [None, 0.5]
+        assert ps.runners[1].jobs == ps.runners[0].jobs
+        assert ps.runners[1].usage is not None
+
+
+def test_cancel_command():
+    assert cancel_command("bash", ["1", "2"]).startswith("{ pkill -P 1,2; kill 1 2; }")
+    assert cancel_command("sbatch --foo", ["3"]).startswith("scancel 3")
+    with pytest.raises(ValueError):
+        cancel_command("mystery", ["4"])
+
+
+@pytest.mark.parametrize(
+    "submitter, output",
+    [
+        ("sbatch", "Submitted batch job 1234"),
+        ("qsub", "1234.pbs-server"),
+        ("qsub", 'Your job 1234 ("jobscript.sh") has been submitted'),
+        ("bsub", "Job <1234> is submitted to queue <normal>."),
+    ],
+)
+def test_submitted_job_id(tmp_path, submitter: str, output: str):
+    # a stand-in for the scheduler, which prints what the real one would
+    fake = tmp_path / submitter
+    fake.write_text(f"#!/bin/bash\necho '{output}'\n")
+    fake.chmod(0o755)
+    jobscript = tmp_path / "jobscript.sh"
+    jobscript.write_text("")
+    md5 = hashlib.md5(b"").hexdigest()
+
+    script = "\n".join(
+        [
+            f"export PATH={tmp_path}:$PATH",
+            f"export sourcedir={tmp_path}",
+            generate_submit_fn(submitter, "manifest.txt"),
+            f"submit_job_{submitter} abcd {jobscript} {md5}",
+        ]
+    )
+    subprocess.run(["bash", "-c", script], check=True)
+
+    with open(tmp_path / "manifest.txt", "r") as o:
+        assert o.read().splitlines()[-1].endswith("[abcd] [job] 1234")
+    assert submitter in cancel_commands
@@ -0,0 +1,85 @@
+import os
+import time
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int, t: float) -> int:
+    import time
+
+    time.sleep(t)
+    print(f"running {a}")
+    return a
+
+
+def fail(a: int) -> int:
+    raise ValueError(f"bad value {a}")
+
+
+class TestLocalPool(BaseTestClass):
+    def test_results(self):
+        ps = self.create_process(basic, local_pool=True)
+        for i in range(4):
+            ps.prepare(a=i, t=0)
+
+        assert self.run_ps() == [0, 1, 2, 3]
+        assert ps.local_pool
+
+        for i, runner in enumerate(ps.runners):
+            assert runner.stdout == f"running {i}"
+
+    def test_linked(self):
+        ps = self.create_process(basic, local_pool=True)
+        ps.prepare(a=1, t=0)
+
+        self.run_ps()
+
+        # files are hard linked in both directions, rather than copied
+        assert os.path.samefile(ps.files.repo.local, ps.files.repo.remote)
+        result = ps.runners[0].files.result
+        assert os.path.samefile(result.local, result.remote)
+
+    def test_failure(self):
+        ps = self.create_process(fail, local_pool=True)
+        ps.prepare(a=3)
+
+        results = self.run_ps()
+
+        assert isinstance(results[0], RunnerFailedError)
+        assert "ValueError: bad value 3" in str(results[0])
+        assert ps.failed == [ps.runners[0]]
+
+    def test_async(self):
+        ps = self.create_process(basic, local_pool=True, local_workers=4)
+        for i in range(4):
+            ps.prepare(a=i, t=0.5)
+
+        t0 = time.perf_counter()
+        assert self.run_ps() == [0, 1, 2, 3]
+
+        assert time.perf_counter() - t0 < 1.5
+
+    def test_sequential(self):
+        ps = self.create_process(basic, local_pool=True, local_workers=4)
+        for i in range(3):
+            ps.prepare(a=i, t=0.3, asynchronous=False)
+
+        t0 = time.perf_counter()
+        ps.run()
+        # non-asynchronous runners are complete by the time run returns
+        assert time.perf_counter() - t0 > 0.9
+
+        ps.wait(0.1, 2)
+        ps.fetch_results()
+        assert ps.results == [0, 1, 2]
+
+    def test_close(self):
+        with self.create_process(basic, local_pool=True, local_workers=2) as ps:
+            ps.prepare(a=1, t=0)
+            assert self.run_ps() == [1]
+            workers = list(ps.pool._processes.values())  # type: ignore
+            assert workers
+
+        assert ps._pool is None
+        assert not any(worker.is_alive() for worker in workers)
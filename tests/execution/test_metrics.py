@@ -0,0 +1,72 @@
+import os
+import urllib.request
+
+from remoref import MetricsExporter
+from remoref.engine.metrics import content_type
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+def value(text: str, sample: str) -> float:
+    for line in text.split("\n"):
+        if line.startswith(sample + " "):
+            return float(line.split(" ")[-1])
+    raise KeyError(sample)
+
+
+class TestMetrics(BaseTestClass):
+    def test_render(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        ps.prepare(a=2)
+
+        text = MetricsExporter([ps]).render()
+        label = f'process="{ps.name}"'
+        assert "# TYPE remoref_runners gauge" in text
+        assert value(text, f'remoref_runners{{{label},state="CREATED"}}') == 2
+        assert value(text, f'remoref_manifest_bytes{{{label}}}') == 0
+
+        assert self.run_ps() == [1, 2]
+
+        text = MetricsExporter([ps]).render()
+        assert value(text, f'remoref_runners{{{label},state="COMPLETED"}}') == 2
+        assert value(text, f'remoref_runners{{{label},state="CREATED"}}') == 0
+        sent = f'remoref_transferred_bytes_total{{{label},direction="sent"}}'
+        received = f'remoref_transferred_bytes_total{{{label},direction="received"}}'
+        assert value(text, sent) == ps.transferred["sent"] > 0
+        assert value(text, received) == ps.transferred["received"] > 0
+        assert value(text, f'remoref_manifest_bytes{{{label}}}') > 0
+        polls = f'remoref_phase_calls_total{{{label},phase="read_remote_manifest"}}'
+        assert value(text, polls) >= 1
+
+    def test_file(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        path = f"{ps.local_dir}.prom"
+        self.files.append(path)
+        staged = f'remoref_runners{{process="{ps.name}",state="STAGED"}}'
+
+        with MetricsExporter([ps], path=path, interval=60):
+            with open(path, "r") as o:
+                assert value(o.read(), staged) == 0
+            ps.stage()
+        # a final write is made on stopping
+        with open(path, "r") as o:
+            assert value(o.read(), staged) == 1
+        assert not os.path.exists(f"{path}.tmp")
+
+    def test_http(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+
+        with MetricsExporter([ps], port=0) as exporter:
+            host, port = exporter.address
+            url = f"http://{host}:{port}/metrics"
+            with urllib.request.urlopen(url) as response:
+                assert response.headers["Content-Type"] == content_type
+                text = response.read().decode()
+        assert exporter.address is None
+        assert "remoref_runners" in text
@@ -0,0 +1,68 @@
+import json
+import os
+
+from remoref.engine.profile import Profile
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestProfile(BaseTestClass):
+    def test_phase(self):
+        profile = Profile()
+
+        with profile.phase("stage"):
+            pass
+        profile.add("stage", 2.0)
+        profile.add("stage.write", 0.5)
+
+        data = profile.to_dict()
+        assert data["stage"]["count"] == 2
+        assert data["stage"]["max"] == 2.0
+        assert 2.0 <= data["stage"]["total"] < 2.1
+        assert data["stage.write"]["mean"] == 0.5
+        assert profile.total("missing") == 0.0
+
+    def test_lifecycle(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        ps.prepare(a=2)
+
+        self.run_ps()
+
+        for phase in (
+            "stage",
+            "stage.template",
+            "stage.hash",
+            "stage.write",
+            "transfer",
+            "transfer.transport",
+            "run",
+            "run.transport",
+            "run.acknowledge",
+            "read_remote_manifest",
+            "apply_summary",
+            "fetch_results",
+            "read_local_files",
+        ):
+            assert phase in ps.profile, phase
+
+        # each runner writes and hashes its jobscript, then the repo and master
+        data = ps.profile.to_dict()
+        assert data["stage.hash"]["count"] == 3
+        assert data["stage"]["total"] >= data["stage.write"]["total"]
+
+    def test_json(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        self.run_ps()
+
+        path = "profile.json"
+        self.files.append(path)
+        content = ps.profile.to_json(path)
+
+        with open(path) as o:
+            assert json.load(o) == json.loads(content) == ps.profile.to_dict()
+        assert os.path.getsize(path) > 0
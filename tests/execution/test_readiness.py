@@ -0,0 +1,64 @@
+import time
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.engine.runnerstates import FAILED
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def stamp(t: float) -> float:
+    import time
+
+    time.sleep(t)
+    return time.time()
+
+
+def fail(t: float) -> float:
+    raise ValueError("no result")
+
+
+class TestReadiness(BaseTestClass):
+    def test_run_returns_on_submission(self):
+        ps = self.create_process(stamp)
+        ps.prepare(t=3)
+
+        t0 = time.perf_counter()
+        assert ps.run()
+        # the master acknowledges submission without waiting for the runner
+        assert time.perf_counter() - t0 < 3
+
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+        assert ps.results[0] is not None
+
+    def test_rerun_is_fresh(self):
+        ps = self.create_process(stamp)
+        ps.prepare(t=0)
+
+        previous = self.run_ps()[0]
+        for _ in range(3):
+            # quick reruns land within the same manifest second
+            result = self.run_ps(force=True)[0]
+            assert result > previous
+            previous = result
+
+    def test_run_direct_appends(self):
+        ps = self.create_process(stamp)
+        ps.prepare(t=0)
+        self.run_ps()
+
+        # only the new runner is run, the first must not be left RUNNING
+        results = ps.run_direct(interval=0.1, timeout=5, t=0.01)
+
+        assert len(results) == 2 and all(r is not None for r in results)
+
+    def test_traceback_before_failed(self):
+        ps = self.create_process(fail)
+        ps.prepare(t=0)
+        ps.run()
+
+        ps.wait(0.05, 5)
+        assert ps.runners[0].state == FAILED
+
+        ps.fetch_results()
+        assert isinstance(ps.results[0], RunnerFailedError)
+        assert "ValueError: no result" in str(ps.results[0])
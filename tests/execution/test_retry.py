@@ -0,0 +1,173 @@
+import pytest
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.engine.retry import RetryPolicy
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def flaky(a: int) -> int:
+    import os
+
+    # odd values fail on their first attempt
+    marker = f"attempted_{a}"
+    if a % 2 and not os.path.exists(marker):
+        open(marker, "w").close()
+        raise RuntimeError(f"node failure for {a}")
+    return a
+
+
+def slow_or_flaky(a: int) -> int:
+    import os
+    import time
+
+    # 0 outlasts the retry of 1, which fails on its first attempt
+    if a == 0:
+        time.sleep(5)
+    elif not os.path.exists("attempted"):
+        open("attempted", "w").close()
+        raise RuntimeError("node failure")
+    return a
+
+
+def fail(a: int) -> int:
+    raise ValueError(f"bad value {a}")
+
+
+class TestRetry(BaseTestClass):
+    def test_retried(self):
+        ps = self.create_process(flaky, retry=RetryPolicy(max_attempts=2))
+        for i in range(4):
+            ps.prepare(a=i)
+
+        assert self.run_ps() == [0, 1, 2, 3]
+        assert [r.attempt for r in ps.runners] == [1, 2, 1, 2]
+
+        # only the failed runners were run again
+        staged = [[s.state for s in r.history].count("STAGED") for r in ps.runners]
+        assert staged == [1, 2, 1, 2]
+
+        with open(ps.files.manifest.remote, "r") as o:
+            manifest = o.read()
+        assert f"[{ps.runners[1].short_uuid}] [attempt] 2" in manifest
+        assert f"[{ps.runners[0].short_uuid}] [attempt]" not in manifest
+
+    def test_local_pool(self):
+        policy = RetryPolicy(max_attempts=2)
+        ps = self.create_process(flaky, retry=policy, local_pool=True)
+        ps.prepare(a=1)
+
+        assert self.run_ps() == [1]
+        assert ps.runners[0].attempt == 2
+
+    @pytest.mark.parametrize("local_pool", [False, True])
+    def test_no_replay(self, local_pool: bool):
+        # the retry appends to the manifest while the slow runner is active,
+        # and the failure recorded before it must not be read again
+        policy = RetryPolicy(max_attempts=5)
+        ps = self.create_process(
+            slow_or_flaky, retry=policy, local_pool=local_pool, local_workers=1
+        )
+        ps.prepare(a=1)
+        ps.prepare(a=0)
+
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+        assert ps.results == [1, 0]
+        assert ps.runners[0].attempt == 2
+
+        with open(ps.files.manifest.remote, "r") as o:
+            assert o.read().count("[attempt]") == 1
+        history = [s.state for s in ps.runners[0].history]
+        assert history.count("COMPLETED") == 1
+
+    def test_while_running(self):
+        ps = self.create_process(slow_or_flaky, retry=RetryPolicy(max_attempts=2))
+        ps.prepare(a=0)
+        ps.prepare(a=1)
+
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+        assert ps.results == [0, 1]
+        slow, retried = ps.runners
+        assert retried.attempt == 2
+        # retried without waiting for the slow runner, whose records are kept
+        assert retried.state.timestamp < slow.state.timestamp
+        assert [s.state for s in slow.history].count("COMPLETED") == 1
+
+        with open(ps.files.manifest.remote, "r") as o:
+            manifest = o.read()
+        assert manifest.count(f"[{ps.short_uuid}] [state] submitted") == 2
+        assert f"[{slow.short_uuid}] [state] running" in manifest
+
+    def test_while_running_local_pool(self):
+        policy = RetryPolicy(max_attempts=2)
+        ps = self.create_process(
+            slow_or_flaky, retry=policy, local_pool=True, local_workers=2
+        )
+        ps.prepare(a=0)
+        ps.prepare(a=1)
+
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+        assert ps.results == [0, 1]
+        slow, retried = ps.runners
+        assert retried.attempt == 2
+        assert retried.state.timestamp < slow.state.timestamp
+
+    def test_max_attempts(self):
+        ps = self.create_process(fail, retry=RetryPolicy(max_attempts=3))
+        ps.prepare(a=1)
+
+        results = self.run_ps()
+        assert isinstance(results[0], RunnerFailedError)
+        assert "bad value 1" in str(results[0])
+        assert ps.runners[0].attempt == 3
+        assert ps.retryable() == []
+
+    def test_pattern(self):
+        policy = RetryPolicy(patterns=["node failure"])
+        ps = self.create_process(fail, retry=policy)
+        ps.prepare(a=1)
+
+        assert isinstance(self.run_ps()[0], RunnerFailedError)
+        assert ps.runners[0].attempt == 1
+
+    def test_backoff(self):
+        ps = self.create_process(flaky, retry=RetryPolicy(backoff=60))
+        ps.prepare(a=1)
+        ps.run()
+        with pytest.raises(RuntimeError, match="Wait Timed out"):
+            ps.wait(0.1, 1)
+
+        # failed, but not yet due a retry
+        assert ps.retryable() == [ps.runners[0]]
+        assert ps.retry_failed() == []
+
+        ps.retry.backoff = 0
+        assert ps.retry_failed() == [ps.runners[0]]
+        ps.wait(0.1, 2)
+        ps.fetch_results()
+        assert ps.results == [1]
+
+
+class TestRetryPolicy:
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, factor=3, max_backoff=5)
+        assert [policy.delay(n) for n in range(1, 5)] == [1, 3, 5, 5]
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=2, patterns=["timed out", r"exit \d+"])
+        assert policy.should_retry(1, "job timed out")
+        assert policy.should_retry(1, "exit 137")
+        assert not policy.should_retry(1, "ValueError")
+        assert not policy.should_retry(1, None)
+        assert not policy.should_retry(2, "job timed out")
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with pytest.raises(ValueError):
+            RetryPolicy(backoff=-1)
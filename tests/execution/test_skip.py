@@ -37,5 +37,7 @@ class TestSkip(BaseTestClass):
         time.sleep(1)
 
         assert ps.run(force=True)
+        # run returns once the master acknowledges submission
+        ps.wait(0.1, 2)
 
         assert os.path.getmtime(ps.runners[0].files.result.remote) > result_mtime
@@ -0,0 +1,99 @@
+import os
+import time
+
+import pytest
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def straggle(a: int, stall: float) -> int:
+    import os
+    import time
+
+    # the first run of a=0 stalls, as if it landed on a slow node
+    marker = f"started_{a}"
+    if a == 0 and not os.path.exists(marker):
+        open(marker, "w").close()
+        time.sleep(stall)
+    return a
+
+
+def unserialisable(a: int) -> set:
+    return {a}
+
+
+def running(*args: str) -> bool:
+    """
+    True if any process has all of `args` in its command line
+    """
+    for pid in os.listdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as o:
+                cmdline = o.read().decode().split("\0")
+        except (OSError, ValueError):
+            continue
+        if all(arg in cmdline for arg in args):
+            return True
+    return False
+
+
+class TestSpeculate(BaseTestClass):
+    def test_straggler_copied(self):
+        ps = self.create_process(straggle, speculate=2)
+        for i in range(4):
+            ps.prepare(a=i, stall=30)
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+
+        assert ps.results == [0, 1, 2, 3]
+        straggler = ps.runners[0]
+        assert os.path.exists(straggler.files.claim.remote)
+
+        with open(ps.files.manifest.remote, "r") as o:
+            manifest = o.read()
+        # only the winning copy records an outcome
+        assert manifest.count(f"[{straggler.short_uuid}] [state] completed") == 1
+        assert f"[{straggler.copy_uuid}] [state] submitted" in manifest
+
+        # the stalled original notices the claim, and exits
+        for _ in range(20):
+            if not running(straggler.name, "speculative"):
+                break
+            time.sleep(0.1)
+        else:
+            pytest.fail("stalled runner was not cancelled")
+
+    def test_local_pool(self):
+        ps = self.create_process(
+            straggle, speculate=2, local_pool=True, local_workers=4
+        )
+        for i in range(4):
+            ps.prepare(a=i, stall=5)
+
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+        assert ps.results == [0, 1, 2, 3]
+        assert 0 in ps._speculated
+
+    def test_unserialisable(self):
+        # the outcome is claimed before the result fails to be written
+        ps = self.create_process(unserialisable, speculate=2)
+        ps.prepare(a=1)
+        ps.run()
+        ps.wait(0.1, 10)
+        ps.fetch_results()
+
+        assert isinstance(ps.results[0], RunnerFailedError)
+        assert "not JSON serializable" in str(ps.results[0])
+        assert os.path.exists(ps.runners[0].files.claim.remote)
+
+    def test_no_samples(self):
+        ps = self.create_process(straggle, speculate=2)
+        ps.prepare(a=1, stall=0)
+        assert ps.stragglers() == []
+
+        with pytest.raises(ValueError):
+            self.create_process(straggle, speculate=0.5)
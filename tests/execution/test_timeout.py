@@ -0,0 +1,88 @@
+import time
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.engine.repo import timeout_grace
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def sleep(t: float) -> float:
+    import time
+
+    time.sleep(t)
+    return t
+
+
+def blocked(t: float) -> float:
+    import signal
+    import time
+
+    # as if stuck outside the interpreter, where the alarm can not reach
+    signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+    time.sleep(t)
+    return t
+
+
+class TestTimeout(BaseTestClass):
+    def test_timeout(self):
+        ps = self.create_process(sleep, runner_timeout=1)
+        ps.prepare(t=30)
+        ps.prepare(t=0)
+
+        t0 = time.time()
+        results = self.run_ps_until(10)
+        assert time.time() - t0 < 10
+
+        assert isinstance(results[0], RunnerFailedError)
+        assert "exceeded its runner_timeout of 1 seconds" in str(results[0])
+        assert results[1] == 0
+
+    def test_runner_arg(self):
+        ps = self.create_process(sleep)
+        ps.prepare(t=30, runner_timeout=0.5)
+        ps.prepare(t=1)
+
+        results = self.run_ps_until(10)
+        assert isinstance(results[0], RunnerFailedError)
+        assert results[1] == 1
+
+    def test_local_pool(self):
+        ps = self.create_process(sleep, runner_timeout=1, local_pool=True)
+        ps.prepare(t=30)
+
+        results = self.run_ps_until(10)
+        assert "RunnerTimeoutError" in str(results[0])
+
+        # the worker is reused
+        ps.prepare(t=0)
+        assert self.run_ps_until(10)[1] == 0
+
+    def test_cancelled_local_pool(self):
+        ps = self.create_process(sleep, local_pool=True, local_workers=1)
+        ps.prepare(t=30, runner_timeout=2)
+        ps.run()
+        for _ in range(100):
+            ps.read_remote_manifest()
+            if ps.runners[0].jobs:
+                break
+            time.sleep(0.05)
+        assert ps.cancel() == [ps.runners[0]]
+
+        # the next runner in the same worker has no timeout, and outlasts the
+        # alarm of the cancelled one
+        ps.prepare(t=3)
+        assert self.run_ps_until(10)[1] == 3
+        assert ps.runners[1].jobs == ps.runners[0].jobs
+
+    def test_blocked(self):
+        ps = self.create_process(blocked, runner_timeout=0.5)
+        ps.prepare(t=30)
+
+        results = self.run_ps_until(timeout_grace + 10)
+        assert isinstance(results[0], RunnerFailedError)
+        assert "and was stopped" in str(results[0])
+
+    def run_ps_until(self, timeout: float):
+        self.ps.run()
+        self.ps.wait(0.1, timeout)
+        self.ps.fetch_results()
+        return self.ps.results
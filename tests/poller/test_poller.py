@@ -0,0 +1,91 @@
+import pytest
+
+from remoref.engine.exceptions import SubmissionError
+from remoref.engine.poller import Poller
+from remoref.engine.runnerstates import State
+from remoref.utils.basetestclass import BaseTestClass
+from remotemanager import URL
+
+
+def add(a: int, b: int = 0) -> int:
+    return a + b
+
+
+def mul(a: int, b: int = 1) -> int:
+    return a * b
+
+
+class TestPoller(BaseTestClass):
+    def create_many(self, url: URL, n: int = 3):
+        processes = []
+        for i in range(n):
+            ps = self.create_process(add if i % 2 == 0 else mul, url=url)
+            ps.prepare(a=i, b=2)
+            ps.prepare(a=i, b=3)
+            processes.append(ps)
+        return processes
+
+    def test_grouped(self):
+        url = URL()
+        processes = self.create_many(url)
+        for ps in processes:
+            ps.run()
+
+        poller = Poller(processes)
+
+        assert len(poller.groups) == 1
+
+        poller.wait(0.1, 5)
+        # a single remote command covers every Process
+        assert poller.poll() == 1
+
+        for i, ps in enumerate(processes):
+            ps.fetch_results()
+            if i % 2 == 0:
+                assert ps.results == [i + 2, i + 3]
+            else:
+                assert ps.results == [i * 2, i * 3]
+
+    def test_add_remove(self):
+        processes = self.create_many(URL(), 2)
+
+        poller = Poller()
+        for ps in processes:
+            poller.add(ps)
+        poller.add(processes[0])
+
+        assert len(poller) == 2
+
+        poller.remove(processes[0])
+        assert poller.processes == [processes[1]]
+
+    def test_separate_connections(self):
+        processes = self.create_many(URL(), 2)
+        processes += self.create_many(URL(python="python"), 1)
+
+        poller = Poller(processes)
+
+        assert len(poller.groups) == 2
+
+    def test_not_transferred(self):
+        processes = self.create_many(URL(), 2)
+
+        poller = Poller(processes)
+        # no helper on the remote yet, so each Process is polled individually
+        assert poller.poll() == 3
+        assert not poller.all_finished
+
+    def test_errors_deferred(self):
+        processes = self.create_many(URL(), 2)
+        for ps in processes:
+            ps.run()
+
+        poller = Poller(processes)
+        poller.wait(0.1, 5)
+
+        processes[0].state = State("FAILED", 0)
+
+        with pytest.raises(SubmissionError):
+            poller.poll()
+        # the second Process is still updated
+        assert processes[1].runners.all_at_least("COMPLETED")
@@ -0,0 +1,66 @@
+import time
+
+from remoref.engine.exceptions import RunnerFailedError
+from remoref.engine.poller import Poller
+from remoref.engine.watcher import ManifestWatcher
+from remoref.utils.basetestclass import BaseTestClass
+from remotemanager import URL
+
+
+def nap(a: int, t: float) -> int:
+    import time
+
+    time.sleep(t)
+    return a
+
+
+class TestWatch(BaseTestClass):
+    def test_watch(self):
+        ps = self.create_process(nap)
+        ps.prepare(a=1, t=0.5)
+        ps.prepare(a=2, t=0.5)
+        ps.run()
+
+        t0 = time.perf_counter()
+        # with polling, the interval would hold this for at least 5s
+        ps.wait(interval=5, timeout=10, watch=True)
+        assert time.perf_counter() - t0 < 4
+
+        ps.fetch_results()
+        assert ps.results == [1, 2]
+
+    def test_poller_watch(self):
+        url = URL()
+        processes = []
+        for i in range(3):
+            ps = self.create_process(nap, url=url)
+            ps.prepare(a=i, t=0.1)
+            ps.run()
+            processes.append(ps)
+
+        Poller(processes).wait(interval=5, timeout=10, watch=True)
+
+        for i, ps in enumerate(processes):
+            ps.fetch_results()
+            assert ps.results == [i]
+
+    def test_stream(self):
+        ps = self.create_process(nap)
+        ps.prepare(a=1, t=0.1)
+        ps.run()
+
+        with ManifestWatcher([ps], timeout=5) as watcher:
+            process, summary = watcher.updates.get(timeout=5)
+
+        assert process is ps
+        assert summary is not None and summary["index"] == 0
+
+    def test_fallback(self):
+        ps = self.create_process(nap, url=URL(python="foo"))
+        ps.prepare(a=1, t=0)
+        ps.run()
+
+        ps.wait(interval=0.1, timeout=5, watch=True)
+        ps.fetch_results()
+
+        assert isinstance(ps.results[0], RunnerFailedError)
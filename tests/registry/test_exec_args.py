@@ -0,0 +1,55 @@
+import pytest
+
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestExecArgs(BaseTestClass):
+    def test_layering(self):
+        ps = self.create_process(basic, skip=False)
+        ps.prepare(a=1, force=True)
+        ps.prepare(a=2)
+
+        assert ps.runners[0].exec_args["force"] is True
+        assert ps.runners[0].exec_args["skip"] is False
+        assert "force" not in ps.runners[1].exec_args
+
+        runner = ps.runners[1]
+        runner._temp_exec_args = {"skip": True}
+        assert runner.exec_args["skip"] is True
+
+    def test_shared(self):
+        ps = self.create_process(basic)
+        ps.prepare_many({"a": range(10)}, force=True)
+
+        first = ps.runners[0].exec_args
+        assert all(r.exec_args is first for r in ps.runners)
+        # cached between accesses
+        assert ps.runners[3].exec_args is first
+
+    def test_read_only(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+
+        with pytest.raises(TypeError):
+            ps.runners[0].exec_args["force"] = True  # type: ignore
+
+        with pytest.raises(TypeError):
+            ps.exec_args["force"] = True  # type: ignore
+
+    def test_invalidation(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+
+        version = ps.exec_version
+        first = ps.runners[0].exec_args
+        assert ps.exec_version == version
+
+        ps._temp_exec_args = {"force": True}
+
+        assert ps.exec_version == version + 1
+        assert ps.runners[0].exec_args is not first
+        assert ps.runners[0].exec_args["force"] is True
@@ -0,0 +1,127 @@
+import gc
+import os
+
+from remoref.engine.registry import Column
+from remoref.engine.runnerstates import State
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int, b: int = 0) -> int:
+    return a + b
+
+
+class TestLazyRunners(BaseTestClass):
+    def test_not_materialized(self):
+        ps = self.create_process(basic)
+
+        ps.prepare_many({"a": range(100)})
+
+        assert len(ps.runners) == 100
+        assert ps.runners.materialized == 0
+
+        for runner in ps.runners:
+            assert runner.call_args["a"] == runner.idx
+        del runner
+        gc.collect()
+
+        assert ps.runners.materialized == 0
+
+    def test_state_persists(self):
+        ps = self.create_process(basic)
+        ps.prepare_many({"a": range(10)})
+
+        ps.runners[3].state = State("STAGED", 10)
+        ps.runners[3].stdout = "foo"
+        ps.runners[3]._result = 4
+        gc.collect()
+
+        runner = ps.runners[3]
+        assert runner.state == State("STAGED")
+        assert runner.stdout == "foo"
+        assert runner.result == 4
+
+        assert ps.runners[2].state == State("CREATED")
+        assert ps.runners[2].result is None
+
+    def test_identity(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+
+        runner = ps.runners[0]
+        assert ps.runners[0] is runner
+        assert ps.get_runner(runner.short_uuid) is runner
+
+    def test_extra_files(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1, extra_files_send=["foo.txt"], extra_files_recv=["bar.txt"])
+
+        for _ in range(2):
+            runner = ps.runners[0]
+            assert [f.name for f in runner.files.extra_send] == ["foo.txt"]
+            assert [f.name for f in runner.files.extra_recv] == ["bar.txt"]
+            assert "extra_files_send" not in runner.exec_args
+            del runner
+            gc.collect()
+
+    def test_added_extra_files(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1, extra_files_send=["foo.txt"])
+        with open("added.txt", "w+") as o:
+            o.write("added")
+
+        runner = ps.runners[0]
+        runner.add_extra_send("added.txt")
+        runner.add_extra_recv("bar.txt")
+        del runner
+        gc.collect()
+        assert ps.runners.materialized == 0
+
+        with open("foo.txt", "w+") as o:
+            o.write("foo")
+        ps.stage()
+        ps.transfer()
+
+        runner = ps.runners[0]
+        assert [f.name for f in runner.files.extra_send] == ["foo.txt", "added.txt"]
+        assert [f.name for f in runner.files.extra_recv] == ["bar.txt"]
+        assert os.path.exists(os.path.join(ps.remote_dir, "added.txt"))
+
+    def test_chunks(self):
+        ps = self.create_process(basic)
+        ps.prepare_many({"a": range(10)})
+
+        chunks = [[r.idx for r in chunk] for chunk in ps.runners.chunks(4)]
+
+        assert chunks == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+class TestColumn:
+    def test_int(self):
+        column = Column()
+        for i in range(3):
+            column.append(i)
+
+        assert [column[i] for i in range(3)] == [0, 1, 2]
+        assert not isinstance(column._data, list)
+
+    def test_fallback(self):
+        values = [1, 2.5, True, "a", 2**70, None]
+        column = Column()
+        for value in values:
+            column.append(value)
+
+        assert [column[i] for i in range(len(values))] == values
+        assert [type(column[i]) for i in range(len(values))] == [
+            type(v) for v in values
+        ]
+
+
+class TestSlotted(BaseTestClass):
+    def test_no_dict(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+
+        runner = ps.runners[0]
+
+        assert not hasattr(runner, "__dict__")
+        assert not hasattr(runner.files, "__dict__")
@@ -0,0 +1,75 @@
+import pytest
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int, b: int = 0) -> int:
+    return a + b
+
+
+class TestPrepareMany(BaseTestClass):
+    def test_rows(self):
+        ps = self.create_process(basic)
+
+        added = ps.prepare_many([{"a": i, "b": 1} for i in range(5)])
+
+        assert added == 5
+        assert [r.call_args for r in ps.runners] == [{"a": i, "b": 1} for i in range(5)]
+
+    def test_columns(self):
+        ps = self.create_process(basic)
+
+        ps.prepare_many({"a": [1, 2, 3], "b": [4, 5, 6]})
+
+        assert [r.call_args for r in ps.runners] == [
+            {"a": 1, "b": 4},
+            {"a": 2, "b": 5},
+            {"a": 3, "b": 6},
+        ]
+
+    def test_columns_mismatch(self):
+        ps = self.create_process(basic)
+
+        with pytest.raises(ValueError, match="equal length"):
+            ps.prepare_many({"a": [1, 2, 3], "b": [4, 5]})
+
+    def test_generator(self):
+        ps = self.create_process(basic)
+
+        ps.prepare_many({"a": i} for i in range(3))
+
+        assert [r.call_args for r in ps.runners] == [
+            {"a": i, "b": None} for i in range(3)
+        ]
+
+    def test_matches_prepare(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1, b=2)
+
+        # duplicate of an existing runner and within the batch
+        added = ps.prepare_many([{"a": 1, "b": 2}, {"a": 3}, {"a": 3}])
+
+        assert added == 1
+        assert len(ps.runners) == 2
+        assert [r.idx for r in ps.runners] == [0, 1]
+
+        other = self.create_process(basic)
+        other.prepare(a=3)
+        assert other.runners[0].uuid == ps.runners[1].uuid
+
+    def test_exec_args(self):
+        ps = self.create_process(basic)
+
+        ps.prepare_many([{"a": 1}, {"a": 2, "force": True}], skip=False)
+
+        assert ps.runners[0].exec_args["skip"] is False
+        assert "force" not in ps.runners[0].exec_args
+        assert ps.runners[1].exec_args["force"] is True
+        assert ps.runners[1].exec_args["skip"] is False
+
+    def test_database(self):
+        ps = self.create_process(basic, database="state.db")
+
+        ps.prepare_many({"a": [1, 2, 3]})
+
+        assert ps.database is not None
+        assert [r[0] for r in ps.database.runners()] == list(ps.runners.uuids())
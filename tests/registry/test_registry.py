@@ -0,0 +1,44 @@
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestRegistry(BaseTestClass):
+    def test_idx(self):
+        ps = self.create_process(basic)
+
+        for i in range(5):
+            ps.prepare(a=i)
+        # duplicates should not consume an idx
+        ps.prepare(a=0)
+        ps.prepare(a=5)
+
+        assert len(ps.runners) == 6
+        assert [r.idx for r in ps.runners] == list(range(6))
+
+    def test_view(self):
+        ps = self.create_process(basic)
+
+        runners = ps.runners
+        ps.prepare(a=1)
+
+        assert runners is ps.runners
+        assert len(runners) == 1
+
+    def test_lookup(self):
+        ps = self.create_process(basic)
+
+        for i in range(5):
+            ps.prepare(a=i)
+
+        runner = ps.runners[3]
+
+        assert ps.get_runner(runner.uuid) is runner
+        assert ps.get_runner(runner.short_uuid) is runner
+        assert ps.get_runner("missing") is None
+
+        assert runner.uuid in ps.runners
+        assert runner in ps.runners
+        assert list(ps.runners.uuids()) == [r.uuid for r in ps.runners]
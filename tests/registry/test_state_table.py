@@ -0,0 +1,82 @@
+import pytest
+
+from remoref.engine.runnerstates import State
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestStateTable(BaseTestClass):
+    def create(self, n: int = 10):
+        ps = self.create_process(basic)
+        ps.prepare_many({"a": range(n)})
+        return ps
+
+    def test_counts(self):
+        ps = self.create()
+
+        for idx in range(4):
+            ps.runners[idx].state = State("RUNNING", 100)
+        ps.runners[5].state = State("FAILED", 110)
+
+        assert ps.state_counts == {"CREATED": 5, "RUNNING": 4, "FAILED": 1}
+
+    def test_failed(self):
+        ps = self.create()
+
+        ps.runners[2].state = State("FAILED", 100)
+        ps.runners[7].state = State("FAILED", 100)
+        ps.runners[8].state = State("COMPLETED", 100)
+
+        assert [r.idx for r in ps.failed] == [2, 7]
+        assert ps.runners.where("completed") == [8]
+
+    def test_finished(self):
+        ps = self.create(3)
+
+        assert not ps.runners.any_at_least(State("RUNNING"))
+
+        ps.runners[0].state = State("COMPLETED", 100)
+        ps.runners[1].state = State("FAILED", 100)
+
+        assert ps.runners.finished() == [True, True, False]
+        assert ps.runners.any_at_least("RUNNING")
+        assert not ps.runners.all_at_least("COMPLETED")
+
+        ps.runners[2].state = State("COMPLETED", 100)
+        assert ps.runners.all_at_least("COMPLETED")
+
+    def test_states_view(self):
+        ps = self.create(3)
+
+        ps.runners[1].state = State("STAGED", 100)
+
+        states = ps.states
+        assert states[1] == State("STAGED")
+        assert states[1].timestamp == 100
+        assert ps.runners[1].state.timestamp == 100
+
+    def test_runtimes(self):
+        ps = self.create(5)
+
+        for idx in range(5):
+            ps.runners[idx].state = State("RUNNING", 100)
+        for idx in range(4):
+            ps.runners[idx].state = State("COMPLETED", 100 + 10 * (idx + 1))
+
+        assert sorted(ps.runners.runtimes()) == [10, 20, 30, 40]
+
+        percentiles = ps.runtime_percentiles()
+        assert percentiles[50] == 25
+        assert percentiles[100] == 40
+        assert ps.runtime_percentiles(0)[0] == 10
+
+    def test_runtimes_empty(self):
+        ps = self.create(2)
+
+        assert ps.runtime_percentiles(50) == {50: None}
+
+        with pytest.raises(ValueError):
+            ps.runtime_percentiles(101)
@@ -0,0 +1,94 @@
+import pytest
+
+from remoref.engine.runnerstates import State
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def basic(a: int) -> int:
+    return a
+
+
+class TestTimings(BaseTestClass):
+    def create(self, n: int = 4):
+        ps = self.create_process(basic)
+        ps.prepare_many({"a": range(n)})
+        return ps
+
+    def advance(self, runner, submitted, running, finished, state="COMPLETED"):
+        runner.state = State("SUBMITTED", submitted)
+        runner.state = State("RUNNING", running)
+        runner.state = State(state, finished)
+
+    def test_history(self):
+        ps = self.create(2)
+        runner = ps.runners[1]
+        self.advance(runner, 100.5, 102.25, 110.0)
+        # reapplying the current state is not a change
+        runner.state = State("COMPLETED", 110.0)
+
+        assert [(s.state, s.timestamp) for s in runner.history] == [
+            ("SUBMITTED", 100.5),
+            ("RUNNING", 102.25),
+            ("COMPLETED", 110.0),
+        ]
+        assert ps.runners[0].history == []
+
+    def test_replayed(self):
+        ps = self.create(1)
+        runner = ps.runners[0]
+        self.advance(runner, 100, 101, 111, state="FAILED")
+        # records of the current state read again, or written twice (such as
+        # the failure logged by both the runner and its submission), are not
+        # new states
+        runner.state = State("FAILED", 111)
+        runner.state = State("FAILED", 100)
+        ps.runners.set_state(0, State("FAILED", 105))
+
+        assert [s.state for s in runner.history] == ["SUBMITTED", "RUNNING", "FAILED"]
+        assert runner.state.timestamp == 111
+        assert ps.timing_percentiles(100)["execution"] == {100: 10}
+
+    def test_percentiles(self):
+        ps = self.create()
+        self.advance(ps.runners[0], 100, 101, 111)
+        self.advance(ps.runners[1], 100, 103, 104, state="FAILED")
+        # never seen finishing, only contributes a queue wait
+        ps.runners[2].state = State("SUBMITTED", 100)
+        ps.runners[2].state = State("RUNNING", 105)
+
+        timings = ps.timing_percentiles(50, 100)
+        assert timings["queue_wait"] == {50: 3, 100: 5}
+        assert timings["execution"] == {50: 5.5, 100: 10}
+        assert timings["turnaround"] == {50: 7.5, 100: 11}
+
+        assert ps.timing_percentiles(50)["execution"] == ps.runtime_percentiles(50)
+
+    def test_timeline(self):
+        ps = self.create()
+        self.advance(ps.runners[0], 100, 101, 102)
+        self.advance(ps.runners[1], 130, 140, 150)
+        self.advance(ps.runners[2], 250, 250, 260)
+
+        timeline = ps.timeline(60)
+        assert [row["start"] for row in timeline] == [100, 160, 220]
+        assert [row["submitted"] for row in timeline] == [2, 0, 1]
+        assert timeline[0]["queue_wait"] == 5.5
+        assert timeline[1]["turnaround"] is None
+        assert timeline[2]["execution"] == 10
+
+        with pytest.raises(ValueError):
+            ps.timeline(0)
+
+    def test_executed(self):
+        ps = self.create_process(basic)
+        ps.prepare(a=1)
+        ps.prepare(a=2)
+
+        assert self.run_ps() == [1, 2]
+
+        for runner in ps.runners:
+            states = [state.state for state in runner.history]
+            for state in ("SUBMITTED", "RUNNING", "COMPLETED"):
+                assert state in states
+        timings = ps.timing_percentiles(100)
+        assert all(timings[name][100] >= 0 for name in timings)
@@ -0,0 +1,58 @@
+from remoref.engine.repo import Usage
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def allocate(mb: int) -> int:
+    data = bytearray(mb * 1024 * 1024)
+    total = 0
+    for i in range(200000):
+        total += i
+    return len(data) // (1024 * 1024)
+
+
+class TestUsage(BaseTestClass):
+    def test_measure(self):
+        usage = Usage()
+        sum(range(100000))
+        measured = usage.stop()
+
+        assert measured["wall"] > 0
+        assert measured["utime"] + measured["stime"] > 0
+        assert measured["maxrss"] > 0
+        # further calls do not extend the measurement
+        assert usage.stop() is measured
+
+    def test_table(self):
+        ps = self.create_process(allocate)
+        ps.prepare_many({"mb": range(5)})
+
+        assert ps.runners[0].usage is None
+
+        for idx in range(4):
+            ps._runners.set_usage(idx, {"wall": idx, "utime": 1, "stime": idx})
+        ps._runners.set_usage(4, {"wall": 4})
+
+        assert ps.runners[1].usage == {"wall": 1, "utime": 1, "stime": 1}
+        # runners without a CPU record are omitted
+        assert ps._runners.usage("cpu") == [1, 2, 3, 4]
+        assert ps._runners.usage("maxrss") == []
+
+        summary = ps.usage_summary()
+        assert summary["wall"] == {50: 2, 95: 3.8, 100: 4}
+        assert summary["maxrss"] == {50: None, 95: None, 100: None}
+
+    def test_recorded(self):
+        ps = self.create_process(allocate)
+        ps.prepare(mb=1)
+        ps.prepare(mb=64)
+
+        assert self.run_ps() == [1, 64]
+
+        small, large = (runner.usage for runner in ps.runners)
+        assert set(large) == {"wall", "utime", "stime", "maxrss"}
+        assert large["maxrss"] >= 64 * 1024 * 1024
+        assert large["maxrss"] > small["maxrss"]
+        assert large["utime"] > 0
+
+        summary = ps.usage_summary(100)
+        assert summary["maxrss"][100] == large["maxrss"]
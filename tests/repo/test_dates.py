@@ -1,8 +1,35 @@
-from remoref.engine.repo import Manifest, date_format
+from remoref.engine.repo import Manifest, bash_date_format, date_format
 import datetime
+import subprocess
+import time
 
 
 def test_utc():
     repo = Manifest(manifest_path="foo")
 
-    assert repo.now() == datetime.datetime.strftime(datetime.datetime.now(datetime.timezone.utc), date_format)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    assert abs(repo.to_timestamp(repo.now()) - now.timestamp()) < 1
+    assert repo.now() >= datetime.datetime.strftime(now, date_format)
+
+
+def test_subsecond():
+    repo = Manifest(manifest_path="foo")
+
+    assert repo.to_timestamp("2024-01-01 00:00:00.250000") == 1704067200.25
+    assert repo.to_timestamp("2024-01-01 00:00:00.5") == 1704067200.5
+
+
+def test_seconds_compatible():
+    repo = Manifest(manifest_path="foo")
+
+    # older manifests, and `date` without %N support
+    assert repo.to_timestamp("2024-01-01 00:00:00") == 1704067200
+    assert repo.to_timestamp("2024-01-01 00:00:00.6N") == 1704067200
+
+
+def test_bash_date():
+    repo = Manifest(manifest_path="foo")
+
+    stamp = subprocess.check_output(["date", "-u", f"+{bash_date_format}"], text=True)
+
+    assert abs(repo.to_timestamp(stamp.strip()) - time.time()) < 1
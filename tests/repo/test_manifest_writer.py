@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import time
+
+from remoref.engine.repo import Manifest, ManifestWriter
+
+
+def read(path: str) -> str:
+    with open(path, "r") as o:
+        return o.read()
+
+
+def spam(path: str, tag: str, n: int) -> None:
+    writer = ManifestWriter(path, interval=0, max_buffer=256)
+    for i in range(n):
+        writer.write(f"{tag} {i} " + "x" * 64)
+    writer.close()
+
+
+class TestManifestWriter:
+    def test_buffered(self):
+        writer = ManifestWriter("manifest.txt", interval=60)
+
+        writer.write("foo")
+        writer.write("bar")
+
+        assert writer.pending == 2
+        assert not os.path.exists("manifest.txt")
+
+        writer.flush()
+
+        assert writer.pending == 0
+        assert read("manifest.txt") == "foo\nbar\n"
+        writer.close()
+
+    def test_forced_flush(self):
+        writer = ManifestWriter("manifest.txt", interval=60)
+
+        writer.write("foo")
+        writer.write("bar", flush=True)
+
+        assert read("manifest.txt") == "foo\nbar\n"
+        writer.close()
+
+    def test_size_flush(self):
+        writer = ManifestWriter("manifest.txt", interval=60, max_buffer=8)
+
+        writer.write("foo")
+        assert writer.pending == 1
+
+        writer.write("foobar")
+        assert writer.pending == 0
+        writer.close()
+
+    def test_interval_flush(self):
+        writer = ManifestWriter("manifest.txt", interval=0.05)
+
+        writer.write("foo")
+        time.sleep(0.5)
+
+        assert read("manifest.txt") == "foo\n"
+        writer.close()
+
+    def test_close(self):
+        writer = ManifestWriter("manifest.txt", interval=60)
+
+        writer.write("foo")
+        writer.close()
+
+        assert read("manifest.txt") == "foo\n"
+
+    def test_concurrent_writers(self):
+        n = 200
+        procs = [
+            multiprocessing.Process(target=spam, args=("manifest.txt", tag, n))
+            for tag in "abcd"
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+
+        lines = read("manifest.txt").splitlines()
+        assert len(lines) == 4 * n
+        for line in lines:
+            tag, idx, payload = line.split(" ")
+            assert tag in "abcd"
+            assert 0 <= int(idx) < n
+            assert payload == "x" * 64
+
+
+class TestManifestLog:
+    def test_state_flushed(self):
+        manifest = Manifest("manifest.txt", uuid="abc", flush_interval=60)
+
+        manifest.log("running")
+
+        assert [s for _, s in manifest.states] == ["RUNNING"]
+
+    def test_output_buffered(self):
+        manifest = Manifest("manifest.txt", uuid="abc", flush_interval=60)
+
+        manifest.log("foo", mode="stdout")
+        assert not os.path.exists("manifest.txt")
+
+        manifest.log("completed")
+        assert manifest.stdout == "foo"
+        assert [s for _, s in manifest.states] == ["COMPLETED"]
+
+    def test_no_path(self):
+        manifest = Manifest(content="", uuid="abc")
+
+        manifest.log("running")
+
+        assert manifest.writer is None
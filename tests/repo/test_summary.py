@@ -0,0 +1,180 @@
+import os
+
+from remoref.engine.repo import Manifest, log_modes
+from remoref.engine.summary import new_summary, parse_line, summarise, summary_keys
+from remoref.utils.basetestclass import BaseTestClass
+
+
+def write(path: str, *lines: str, mode: str = "a") -> None:
+    with open(path, mode) as o:
+        o.write("".join(lines))
+
+
+def printer(a: int) -> int:
+    print(f"value is {a}")
+    return a
+
+
+class TestSummarise:
+    path = "summary-manifest.txt"
+
+    def setup_method(self):
+        write(
+            self.path,
+            "2024-01-01 00:00:00 [aaaa] [state] submitted\n",
+            "2024-01-01 00:00:01 [bbbb] [state] running\n",
+            "2024-01-01 00:00:01 [bbbb] [stdout] hello\n",
+            mode="w",
+        )
+
+    def teardown_method(self):
+        os.remove(self.path)
+
+    def test_parse_line(self):
+        assert parse_line("2024-01-01 00:00:00 [aaaa] [stdout]  two spaces") == (
+            "2024-01-01 00:00:00",
+            "aaaa",
+            "stdout",
+            " two spaces",
+        )
+        assert parse_line("garbage") is None
+
+    def test_missing(self):
+        summary = summarise("not-a-manifest.txt")
+
+        assert summary["cursor"] is None
+        assert summary["states"] == {}
+
+    def test_cursor(self):
+        first = summarise(self.path)
+
+        assert first["states"] == {
+            "aaaa": [["2024-01-01 00:00:00", "submitted"]],
+            "bbbb": [["2024-01-01 00:00:01", "running"]],
+        }
+        assert first["output"] == {"bbbb": [1, 0]}
+        assert "stdout" not in first
+
+        write(self.path, "2024-01-01 00:00:02 [bbbb] [state] completed\n")
+
+        second = summarise(self.path, first["cursor"])
+
+        assert not second["reset"]
+        assert second["states"] == {"bbbb": [["2024-01-01 00:00:02", "completed"]]}
+        assert second["output"] == {}
+
+        assert summarise(self.path, second["cursor"])["states"] == {}
+
+    def test_partial_record(self):
+        write(self.path, "2024-01-01 00:00:02 [bbbb] [sta")
+
+        first = summarise(self.path)
+        assert "completed" not in str(first["states"])
+
+        write(self.path, "te] completed\n")
+
+        second = summarise(self.path, first["cursor"])
+        assert second["states"] == {"bbbb": [["2024-01-01 00:00:02", "completed"]]}
+
+    def test_reset(self):
+        cursor = summarise(self.path)["cursor"]
+
+        os.remove(self.path)
+        write(self.path, "2024-01-01 00:00:05 [aaaa] [state] submitted\n")
+
+        summary = summarise(self.path, cursor)
+
+        assert summary["reset"]
+        assert summary["states"] == {"aaaa": [["2024-01-01 00:00:05", "submitted"]]}
+
+    def test_output(self):
+        cursor = summarise(self.path)["cursor"]
+        write(self.path, "2024-01-01 00:00:02 [bbbb] [stderr] oops\n")
+
+        summary = summarise(self.path, cursor, output=["bbbb", "aaaa"])
+
+        # output is returned in full, regardless of the cursor
+        assert summary["stdout"] == {"bbbb": "hello", "aaaa": ""}
+        assert summary["stderr"] == {"bbbb": "oops", "aaaa": ""}
+        assert summary["output"] == {"bbbb": [0, 1]}
+
+    def test_usage(self):
+        write(
+            self.path,
+            '2024-01-01 00:00:02 [bbbb] [usage] {"wall":0.5,"maxrss":1024}\n',
+            "2024-01-01 00:00:02 [bbbb] [usage] not json\n",
+        )
+        summary = summarise(self.path)
+
+        assert summary["usage"] == {"bbbb": {"wall": 0.5, "maxrss": 1024}}
+
+    def test_attempt(self):
+        write(
+            self.path,
+            "2024-01-01 00:00:02 [bbbb] [state] failed\n",
+            "2024-01-01 00:00:03 [bbbb] [attempt] 2\n",
+            "2024-01-01 00:00:03 [bbbb] [state] submitted\n",
+        )
+        summary = summarise(self.path)
+
+        # the records of the first attempt are superseded by the retry
+        assert summary["states"]["bbbb"] == [["2024-01-01 00:00:03", "submitted"]]
+        assert summary["attempts"] == {"bbbb": 2}
+
+    def test_modes(self):
+        # the helper can not import the repository, so keeps its own mapping
+        assert set(summary_keys) == set(log_modes)
+        assert set(summary_keys.values()) < set(new_summary())
+
+    def test_manifest_data(self):
+        write(
+            self.path,
+            "2024-01-01 00:00:02 [bbbb] [stdout] reading stderr.txt\n",
+            "2024-01-01 00:00:02 [bbbb] [stderr] nothing on stdout\n",
+            "2024-01-01 00:00:02 [bbbb] [job] 1234\n",
+            "2024-01-01 00:00:03 [bbbb] [state] completed\n",
+        )
+        data = Manifest(self.path, uuid="bbbb").data
+
+        assert set(data) == set(log_modes)
+        assert [line.split("] ", 2)[-1] for line in data["stdout"]] == [
+            "hello",
+            "reading stderr.txt",
+        ]
+        assert len(data["stderr"]) == 1
+        assert len(data["job"]) == 1
+        assert len(data["usage"]) == 0
+        assert Manifest(self.path, uuid="bbbb").state_list == ["running", "completed"]
+
+
+class TestSummaryPolling(BaseTestClass):
+    def test_output_on_demand(self):
+        ps = self.create_process(printer)
+        ps.prepare(a=1)
+        ps.prepare(a=2)
+
+        self.run_ps()
+
+        assert ps._manifest_cursor is not None
+        assert ps.runners.output_pending(1)
+
+        assert ps.runners[1].stdout == "value is 2"
+        assert not ps.runners.output_pending(1)
+        assert ps.results == [1, 2]
+
+    def test_process_output(self):
+        ps = self.create_process(printer)
+        ps.prepare(a=1)
+        self.run_ps()
+
+        # once polled, the full output of the Process is no longer requested
+        assert ps.summary_args()[2] == "-"
+        assert ps.short_uuid in ps.summary_args(watch=True)[2]
+
+        # but is read once it has new output
+        write(
+            ps.files.manifest.remote,
+            f"2024-01-01 00:00:00 [{ps.short_uuid}] [stderr] submission error\n",
+        )
+        ps.read_remote_manifest()
+        assert ps.stderr == "submission error"
@@ -1,4 +1,5 @@
 import pytest
+from remoref.engine import runnerstates
 from remoref.engine.runnerstates import State
 
 # Define a list of tuples where each tuple contains (first, second) states to compare
@@ -66,3 +67,31 @@ comparison_tests_le = [
 @pytest.mark.parametrize("first_state, second_state", comparison_tests_le)
 def test_state_less_equal(first_state, second_state):
     assert first_state <= second_state
+
+
+interned = [
+    (runnerstates.CREATED, "CREATED"),
+    (runnerstates.STAGED, "STAGED"),
+    (runnerstates.TRANSFERRED, "TRANSFERRED"),
+    (runnerstates.SUBMITTED, "SUBMITTED"),
+    (runnerstates.RUNNING, "RUNNING"),
+    (runnerstates.COMPLETED, "COMPLETED"),
+    (runnerstates.FAILED, "FAILED"),
+    (runnerstates.CANCELLED, "CANCELLED"),
+]
+@pytest.mark.parametrize("state, name", interned)
+def test_interned(state, name):
+    assert state == State(name)
+    assert state.state == name
+    assert state.code == runnerstates.state_codes[name]
+    assert state.timestamp == -1
+
+
+def test_cancelled_order():
+    cancelled = runnerstates.CANCELLED
+    # a finished state, after (and distinct from) COMPLETED and FAILED
+    assert cancelled.code > runnerstates.FAILED.code > runnerstates.COMPLETED.code
+    assert cancelled > runnerstates.RUNNING
+    assert cancelled >= runnerstates.COMPLETED
+    assert cancelled.cancelled
+    assert not cancelled.failed
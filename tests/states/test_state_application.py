@@ -8,6 +8,13 @@ def basic(a: int, fail: bool = False) -> int:
     return a
 
 
+def sleep(t: float) -> float:
+    import time
+
+    time.sleep(t)
+    return t
+
+
 class TestBasic(BaseTestClass):
     def test_run(self):
         ps = self.create_process(basic)
@@ -38,3 +45,16 @@ class TestBasic(BaseTestClass):
             pass
 
         assert ps.runners[0].state == State("FAILED")
+
+    def test_subsecond_runtime(self):
+        ps = self.create_process(sleep)
+
+        ps.prepare(t=0.2)
+        ps.prepare(t=0.4)
+        self.run_ps()
+
+        # timestamps are to the microsecond, so short runtimes can be measured
+        runtimes = sorted(ps.runners.runtimes())
+        assert 0.2 <= runtimes[0] < 0.4
+        assert 0.4 <= runtimes[1] < 0.6
+        assert ps.runners[0].state.timestamp % 1 != 0
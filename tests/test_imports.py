@@ -0,0 +1,56 @@
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+import remoref
+from remoref.engine import repo
+
+
+def loaded_after(statement: str, *modules: str) -> List[str]:
+    """
+    Returns which of `modules` are loaded after running `statement` in a fresh
+    interpreter
+    """
+    check = (
+        f"import json, sys; {statement}; "
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+    return json.loads(output.stdout)
+
+
+def test_lazy_package():
+    engine = ("remoref.engine.process", "remotemanager")
+    assert loaded_after("import remoref", *engine) == []
+    assert loaded_after("import remoref; remoref.__version__", *engine) == []
+    assert loaded_after("from remoref import Poller", *engine) == list(engine)
+
+
+def test_lazy_attributes():
+    from remoref.engine.process import Process
+
+    assert remoref.Process is Process
+    assert "Poller" in dir(remoref)
+    with pytest.raises(AttributeError):
+        remoref.Missing
+
+
+def test_repository_imports():
+    statement = (
+        "import importlib.util; "
+        f"spec = importlib.util.spec_from_file_location('repo', {repo.__file__!r}); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    )
+    assert loaded_after(statement, "datetime", "traceback") == []
+
+
+def test_now_format():
+    manifest = repo.Manifest(content="")
+    stamp = manifest.now()
+    assert abs(manifest.to_timestamp(stamp) - manifest.dtnow().timestamp()) < 1
+    assert len(stamp.split(".")[-1]) == 6